@@ -0,0 +1,203 @@
+"""
+Recursos expostos pela API v1.
+
+Cada recurso declara os campos que sabe serializar e, para cada campo, as
+colunas que ele precisa. Com ?fields= a consulta carrega só essas colunas
+(only/select_related/prefetch_related), além de updated_at e das colunas
+de ordenação, usadas no ETag e no cursor.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db.models import Prefetch
+
+from orders.models import Order, OrderItem
+from products.models import Category, Product
+from reviews.models import Review
+
+from .responses import ApiError
+
+
+@dataclass(frozen=True)
+class Field:
+    value: Callable
+    only: tuple = ()
+    select_related: tuple = ()
+    prefetch: tuple = ()
+
+
+def attribute(name):
+    return Field(value=lambda obj: getattr(obj, name), only=(name,))
+
+
+def decimal(name):
+    return Field(value=lambda obj: str(getattr(obj, name)), only=(name,))
+
+
+class Resource:
+    model = None
+    ordering = ('-created_at', '-id')
+    lookup_field = 'pk'
+    fields = {}
+    private = False
+
+    def get_queryset(self, request):
+        return self.model.objects.all()
+
+    def filter_queryset(self, request, queryset):
+        return queryset
+
+    def field_names(self, request):
+        """Campos pedidos em ?fields=a,b (todos se ausente)"""
+        raw = request.GET.get('fields')
+        if not raw:
+            return list(self.fields)
+        names = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise ApiError(400, f"Campos inválidos: {', '.join(unknown) or raw}")
+        return names
+
+    def select(self, queryset, names):
+        only = {'updated_at', *(name.lstrip('-') for name in self.ordering)}
+        related = set()
+        prefetch = []
+        for name in names:
+            field = self.fields[name]
+            only.update(field.only)
+            related.update(field.select_related)
+            prefetch.extend(field.prefetch)
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only(*sorted(only))
+
+    def serialize(self, obj, names):
+        return {name: self.fields[name].value(obj) for name in names}
+
+
+class ProductResource(Resource):
+    model = Product
+    fields = {
+        'id': attribute('id'),
+        'name': attribute('name'),
+        'description': attribute('description'),
+        'price': decimal('price'),
+        'stock': attribute('stock'),
+        'status': attribute('status'),
+        'image': Field(value=lambda p: p.image.url if p.image else None, only=('image',)),
+        'category': Field(
+            value=lambda p: {'id': p.category.id, 'slug': p.category.slug, 'name': p.category.name},
+            only=('category', 'category__slug', 'category__name'),
+            select_related=('category',),
+        ),
+        'created_at': attribute('created_at'),
+        'updated_at': attribute('updated_at'),
+    }
+
+    def get_queryset(self, request):
+        return Product.objects.filter(is_active=True)
+
+    def filter_queryset(self, request, queryset):
+        category = request.GET.get('category')
+        if category:
+            queryset = queryset.filter(category__slug=category)
+        return queryset
+
+
+class CategoryResource(Resource):
+    model = Category
+    ordering = ('name', 'id')
+    lookup_field = 'slug'
+    fields = {
+        'id': attribute('id'),
+        'name': attribute('name'),
+        'slug': attribute('slug'),
+        'created_at': attribute('created_at'),
+        'updated_at': attribute('updated_at'),
+    }
+
+
+class ReviewResource(Resource):
+    model = Review
+    fields = {
+        'id': attribute('id'),
+        'title': attribute('title'),
+        'content': attribute('content'),
+        'rating': attribute('rating'),
+        'product_name': attribute('product_name'),
+        'pros': attribute('pros'),
+        'cons': attribute('cons'),
+        'would_recommend': attribute('would_recommend'),
+        # Valores gravados; incrementos ainda no buffer (reviews.counters) não entram
+        'help_count': attribute('help_count'),
+        'views_count': attribute('views_count'),
+        'author': Field(
+            value=lambda r: r.author.full_name,
+            only=('author', 'author__full_name'),
+            select_related=('author',),
+        ),
+        'category': Field(
+            value=lambda r: r.category.slug if r.category_id else None,
+            only=('category', 'category__slug'),
+            select_related=('category',),
+        ),
+        'created_at': attribute('created_at'),
+        'updated_at': attribute('updated_at'),
+    }
+
+    def get_queryset(self, request):
+        return Review.objects.filter(status='approved')
+
+    def filter_queryset(self, request, queryset):
+        product = request.GET.get('product')
+        if product:
+            queryset = queryset.filter(product_name=product)
+        return queryset
+
+
+def order_items(order):
+    return [
+        {
+            'product': item.product_id,
+            'quantity': item.quantity,
+            'unit_price': str(item.unit_price),
+            'subtotal': str(item.subtotal),
+        }
+        for item in order.items.all()
+    ]
+
+
+class OrderResource(Resource):
+    model = Order
+    private = True
+    fields = {
+        'id': attribute('id'),
+        'status': attribute('status'),
+        'total': decimal('total'),
+        'order_data': attribute('order_data'),
+        'shipping_address': attribute('shipping_address'),
+        'payment_method': attribute('payment_method'),
+        'items': Field(
+            value=order_items,
+            prefetch=(
+                Prefetch(
+                    'items',
+                    queryset=OrderItem.objects.order_by('created_at', 'id')
+                    .only('order_id', 'product_id', 'quantity', 'unit_price'),
+                ),
+            ),
+        ),
+        'created_at': attribute('created_at'),
+        'updated_at': attribute('updated_at'),
+    }
+
+    def get_queryset(self, request):
+        if not request.user.is_authenticated:
+            raise ApiError(401, "Autenticação necessária")
+        orders = Order.objects.all()
+        if not request.user.is_staff:
+            orders = orders.filter(user=request.user)
+        return orders
+
@@ -0,0 +1,106 @@
+"""
+Respostas JSON da API: erros, ETag e compressão.
+
+O ETag é o hash do JSON serializado (mais a codificação), não de
+updated_at: o corpo inclui campos de outras tabelas (categoria do produto)
+e colunas gravadas com UPDATE direto (estoque, contadores), que não mexem
+em updated_at. A codificação (br, gzip ou nenhuma) entra no ETag, então
+cada representação tem o seu ETag forte e um 304 vale para a mesma
+codificação que o cliente já tem em cache; o 304 economiza a compressão e
+a transferência. Brotli é opcional:
+sem o pacote `brotli` instalado a API responde com gzip.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+BROTLI_QUALITY = 5
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        self.status = status
+        self.message = message
+        super().__init__(message)
+
+
+def error_response(status, message):
+    return HttpResponse(
+        json.dumps({'error': message}),
+        status=status,
+        content_type='application/json',
+    )
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(request):
+    """Melhor codificação aceita pelo cliente (Accept-Encoding), ou None"""
+    accepted = {}
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def render(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def make_etag(content, *parts):
+    """ETag forte de `content` (bytes) na representação descrita por `parts`"""
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode())
+    digest.update(b'|')
+    digest.update(content)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return compress_string(content)
+    return content
+
+
+def not_modified(request, etag):
+    """HttpResponseNotModified se o If-None-Match do cliente bate com `etag`"""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def json_response(content, etag, encoding, private=False):
+    """Resposta com o JSON já serializado por render()"""
+    content = compress(content, encoding)
+    response = HttpResponse(content, content_type='application/json')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
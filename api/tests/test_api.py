@@ -0,0 +1,164 @@
+import gzip
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from orders.models import Order, OrderStatus, PaymentMethod
+from products import inventory
+from products.models import Category, Product
+from reviews.models import Review
+
+User = get_user_model()
+
+
+class ApiTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='api@example.com', full_name='Cliente API', password='password123',
+        )
+        cls.category = Category.objects.create(name='Camas')
+        cls.products = [
+            Product.objects.create(
+                name=f'Cama {i}', description='Macia', price=Decimal('50.00') + i,
+                stock=i, category=cls.category,
+            )
+            for i in range(5)
+        ]
+
+    def get_json(self, url, **kwargs):
+        response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, json.loads(response.content)
+
+
+class ProductApiTest(ApiTestCase):
+    def test_cursor_pagination_visits_every_product_once(self):
+        url = reverse('api:products')
+        seen = []
+        params = {'limit': 2}
+        while url:
+            _, data = self.get_json(url, data=params)
+            seen += [item['id'] for item in data['results']]
+            url, params = data['next'], None
+        self.assertEqual(sorted(seen), sorted(p.id for p in self.products))
+
+    def test_sparse_fieldset(self):
+        _, data = self.get_json(reverse('api:products'), data={'fields': 'name,price'})
+        self.assertEqual(set(data['results'][0]), {'name', 'price'})
+
+        response = self.client.get(reverse('api:products'), {'fields': 'name,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', json.loads(response.content)['error'])
+
+    def test_category_field_uses_join(self):
+        with self.assertNumQueries(1):
+            _, data = self.get_json(reverse('api:products'), data={'fields': 'id,category'})
+        self.assertEqual(data['results'][0]['category']['slug'], 'camas')
+
+    def test_conditional_get_returns_304_until_product_changes(self):
+        url = reverse('api:product_detail', kwargs={'lookup': self.products[0].pk})
+        response, data = self.get_json(url)
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertEqual(data['price'], '50.00')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        product = self.products[0]
+        product.price = Decimal('45.00')
+        product.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_follows_changes_outside_updated_at(self):
+        url = reverse('api:products')
+        etag = self.get_json(url)[0]['ETag']
+
+        # UPDATE direto do estoque e nome da categoria, que vem por join
+        inventory.reserve({self.products[4].pk: 1})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.category.name = 'Camas e almofadas'
+        self.category.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Camas e almofadas')
+
+    def test_list_etag(self):
+        response, _ = self.get_json(reverse('api:products'))
+        response = self.client.get(reverse('api:products'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_gzip_response(self):
+        response = self.client.get(reverse('api:products'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(data['results']), 5)
+
+        plain = self.client.get(reverse('api:products'))
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertNotEqual(plain['ETag'], response['ETag'])
+
+    def test_missing_product_is_json_404(self):
+        response = self.client.get(reverse('api:product_detail', kwargs={'lookup': 999999}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+
+class CategoryAndReviewApiTest(ApiTestCase):
+    def test_category_by_slug(self):
+        _, data = self.get_json(reverse('api:category_detail', kwargs={'lookup': 'camas'}))
+        self.assertEqual(data['name'], 'Camas')
+
+    def test_only_approved_reviews(self):
+        for status in ('approved', 'pending'):
+            Review.objects.create(
+                title=status, content='Texto', rating=4, author=self.user,
+                category=self.category, product_name='Cama 1', status=status,
+            )
+        _, data = self.get_json(reverse('api:reviews'), data={'product': 'Cama 1'})
+        self.assertEqual([r['title'] for r in data['results']], ['approved'])
+        self.assertEqual(data['results'][0]['author'], 'Cliente API')
+
+
+class OrderApiTest(ApiTestCase):
+    def create_order(self, user):
+        order = Order.objects.create(
+            user=user,
+            status=OrderStatus.PENDENTE,
+            total=Decimal('0.01'),
+            shipping_address='Rua API, 1',
+            payment_method=PaymentMethod.PIX,
+        )
+        order.add_items([(self.products[1], 2)])
+        return order
+
+    def test_requires_authentication(self):
+        response = self.client.get(reverse('api:orders'))
+        self.assertEqual(response.status_code, 401)
+
+    def test_lists_only_own_orders_with_items(self):
+        other = User.objects.create_user(
+            email='outro@example.com', full_name='Outro', password='password123',
+        )
+        mine = self.create_order(self.user)
+        self.create_order(other)
+        self.client.force_login(self.user)
+
+        response, data = self.get_json(reverse('api:orders'))
+        self.assertEqual([o['id'] for o in data['results']], [str(mine.id)])
+        self.assertEqual(data['results'][0]['items'][0]['subtotal'], '102.00')
+        self.assertIn('private', response['Cache-Control'])
+
+        response = self.client.get(reverse('api:order_detail', kwargs={'lookup': mine.id}))
+        self.assertEqual(response.status_code, 200)
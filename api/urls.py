@@ -0,0 +1,16 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('v1/products/', views.products, name='products'),
+    path('v1/products/<int:lookup>/', views.product_detail, name='product_detail'),
+    path('v1/categories/', views.categories, name='categories'),
+    path('v1/categories/<slug:lookup>/', views.category_detail, name='category_detail'),
+    path('v1/reviews/', views.reviews, name='reviews'),
+    path('v1/reviews/<uuid:lookup>/', views.review_detail, name='review_detail'),
+    path('v1/orders/', views.orders, name='orders'),
+    path('v1/orders/<uuid:lookup>/', views.order_detail, name='order_detail'),
+]
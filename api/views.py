@@ -0,0 +1,102 @@
+from functools import wraps
+
+from django.http import Http404
+from django.views.decorators.http import require_GET
+
+from products.pagination import InvalidCursor, keyset_paginate
+
+from . import responses
+from .resources import CategoryResource, OrderResource, ProductResource, ReviewResource
+from .responses import ApiError
+
+API_VERSION = 'v1'
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def api_view(view):
+    """Erros da API viram JSON em vez das páginas HTML padrão"""
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as exc:
+            return responses.error_response(exc.status, exc.message)
+        except Http404:
+            return responses.error_response(404, "Não encontrado")
+    return wrapper
+
+
+def _page_size(request):
+    try:
+        size = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ApiError(400, "limit deve ser um inteiro")
+    if not 1 <= size <= MAX_PAGE_SIZE:
+        raise ApiError(400, f"limit deve estar entre 1 e {MAX_PAGE_SIZE}")
+    return size
+
+
+def _next_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return f'{request.path}?{query.urlencode()}'
+
+
+def _respond(request, resource, data):
+    # O ETag vem do corpo serializado: muda sempre que o que o cliente vê muda
+    content = responses.render(data)
+    encoding = responses.negotiate_encoding(request)
+    etag = responses.make_etag(content, API_VERSION, encoding)
+    not_modified = responses.not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    return responses.json_response(content, etag, encoding, private=resource.private)
+
+
+def list_view(resource):
+    @api_view
+    def view(request):
+        names = resource.field_names(request)
+        queryset = resource.filter_queryset(request, resource.get_queryset(request))
+        try:
+            page = keyset_paginate(
+                resource.select(queryset, names),
+                resource.ordering,
+                cursor=request.GET.get('cursor'),
+                page_size=_page_size(request),
+            )
+        except InvalidCursor:
+            raise ApiError(400, "Cursor de paginação inválido")
+
+        data = {
+            'results': [resource.serialize(obj, names) for obj in page.items],
+            'next': _next_url(request, page.next_cursor),
+        }
+        return _respond(request, resource, data)
+    return view
+
+
+def detail_view(resource):
+    @api_view
+    def view(request, lookup):
+        names = resource.field_names(request)
+        queryset = resource.get_queryset(request).filter(**{resource.lookup_field: lookup})
+        obj = resource.select(queryset, names).first()
+        if obj is None:
+            raise Http404
+        return _respond(request, resource, resource.serialize(obj, names))
+    return view
+
+
+products = list_view(ProductResource())
+product_detail = detail_view(ProductResource())
+categories = list_view(CategoryResource())
+category_detail = detail_view(CategoryResource())
+reviews = list_view(ReviewResource())
+review_detail = detail_view(ReviewResource())
+orders = list_view(OrderResource())
+order_detail = detail_view(OrderResource())
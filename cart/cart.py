@@ -0,0 +1,202 @@
+"""
+Carrinho de compras guardado no cache.
+
+O visitante anônimo é identificado por um cookie assinado com um id
+aleatório; o usuário logado, pelo pk. Nenhum dos dois cria linhas de
+sessão no banco. Cada item guarda a quantidade e o preço no momento em
+que foi adicionado. Preço e estoque atuais vêm de um mapa em cache
+(product_snapshots), lido com um get_many e completado com no máximo uma
+consulta a Product por requisição.
+"""
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from products.models import Product
+
+COOKIE_NAME = 'cart_id'
+COOKIE_SALT = 'cart.cookie'
+CART_TIMEOUT = 60 * 60 * 24 * 30
+SNAPSHOT_TIMEOUT = 60
+MAX_QUANTITY = 99
+
+
+def cart_key(owner):
+    return f'cart:{owner}'
+
+
+def snapshot_key(product_id):
+    return f'cart:product:{product_id}'
+
+
+@dataclass(frozen=True)
+class ProductSnapshot:
+    price: Decimal
+    stock: int
+    name: str
+
+
+def product_snapshots(product_ids):
+    """
+    {product_id: ProductSnapshot} dos produtos ativos. Um get_many no cache
+    e, para os que faltarem, uma única consulta.
+    """
+    product_ids = set(product_ids)
+    if not product_ids:
+        return {}
+    keys = {snapshot_key(pk): pk for pk in product_ids}
+    cached = cache.get_many(list(keys))
+    snapshots = {keys[key]: value for key, value in cached.items()}
+    missing = product_ids - set(snapshots)
+    if missing:
+        rows = Product.objects.filter(pk__in=missing, is_active=True).values_list('pk', 'price', 'stock', 'name')
+        fresh = {pk: ProductSnapshot(price, stock, name) for pk, price, stock, name in rows}
+        # Produtos inativos ou inexistentes também ficam em cache (como None)
+        cache.set_many(
+            {snapshot_key(pk): fresh.get(pk) for pk in missing},
+            SNAPSHOT_TIMEOUT,
+        )
+        snapshots.update(fresh)
+    return {pk: snapshot for pk, snapshot in snapshots.items() if snapshot is not None}
+
+
+def invalidate_snapshots(product_ids):
+    cache.delete_many([snapshot_key(pk) for pk in product_ids])
+
+
+@dataclass
+class CartLine:
+    product_id: int
+    quantity: int
+    price: Decimal
+    snapshot: ProductSnapshot = None
+
+    @property
+    def available(self):
+        return self.snapshot is not None and self.snapshot.stock >= self.quantity
+
+    @property
+    def price_changed(self):
+        return self.snapshot is not None and self.snapshot.price != self.price
+
+    @property
+    def subtotal(self):
+        return self.price * self.quantity
+
+
+class Cart:
+    def __init__(self, request):
+        self.request = request
+        self._new_cookie = None
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            self.owner = f'user:{user.pk}'
+        else:
+            self.owner = f'anon:{self._anonymous_id()}'
+        self.items = cache.get(cart_key(self.owner)) or {}
+        self._snapshots = {}
+        self._loaded = set()
+
+    def _anonymous_id(self):
+        cart_id = anonymous_cart_id(self.request)
+        if cart_id is None:
+            cart_id = self._new_cookie = uuid.uuid4().hex
+        return cart_id
+
+    def __len__(self):
+        return sum(item['quantity'] for item in self.items.values())
+
+    def quantities(self):
+        return {int(pk): item['quantity'] for pk, item in self.items.items()}
+
+    def add(self, product_id, quantity=1):
+        """Soma `quantity` ao item, gravando o preço atual do produto"""
+        current = self.items.get(str(product_id), {}).get('quantity', 0)
+        return self.set(product_id, current + quantity)
+
+    def set(self, product_id, quantity):
+        if not isinstance(quantity, int) or quantity < 0 or quantity > MAX_QUANTITY:
+            raise ValidationError(f"Quantidade inválida: {quantity}")
+        if quantity == 0:
+            return self.remove(product_id)
+        snapshot = self.snapshots([product_id]).get(product_id)
+        if snapshot is None:
+            raise ValidationError(f"Produto indisponível: {product_id}")
+        self.items[str(product_id)] = {'quantity': quantity, 'price': str(snapshot.price)}
+        self.save()
+
+    def remove(self, product_id):
+        if self.items.pop(str(product_id), None) is not None:
+            self.save()
+
+    def clear(self):
+        self.items = {}
+        cache.delete(cart_key(self.owner))
+
+    def save(self):
+        cache.set(cart_key(self.owner), self.items, CART_TIMEOUT)
+
+    def snapshots(self, extra=()):
+        """
+        Mapa de preço/estoque dos itens do carrinho (e de `extra`). Lido uma
+        vez por requisição: set() já traz os itens junto com o produto novo
+        e lines() reaproveita o mapa para montar a resposta.
+        """
+        wanted = {int(pk) for pk in self.items} | set(extra)
+        missing = wanted - self._loaded
+        if missing:
+            self._snapshots.update(product_snapshots(missing))
+            self._loaded |= missing
+        return self._snapshots
+
+    def lines(self):
+        """Itens revalidados contra o mapa de preço/estoque atual"""
+        snapshots = self.snapshots()
+        return [
+            CartLine(
+                product_id=int(pk),
+                quantity=item['quantity'],
+                price=Decimal(item['price']),
+                snapshot=snapshots.get(int(pk)),
+            )
+            for pk, item in self.items.items()
+        ]
+
+    def set_cookie(self, response):
+        """Grava o cookie do carrinho anônimo recém-criado, se houver"""
+        if self._new_cookie:
+            response.set_signed_cookie(
+                COOKIE_NAME,
+                self._new_cookie,
+                salt=COOKIE_SALT,
+                max_age=CART_TIMEOUT,
+                httponly=True,
+                samesite='Lax',
+                secure=not settings.DEBUG,
+            )
+        return response
+
+
+def anonymous_cart_id(request):
+    return request.get_signed_cookie(COOKIE_NAME, default=None, salt=COOKIE_SALT)
+
+
+def merge_anonymous_cart(request, user):
+    """Junta o carrinho anônimo do cookie ao carrinho do usuário (ao logar)"""
+    cart_id = anonymous_cart_id(request)
+    if cart_id is None:
+        return
+    anonymous = cache.get(cart_key(f'anon:{cart_id}'))
+    if not anonymous:
+        return
+    user_key = cart_key(f'user:{user.pk}')
+    items = cache.get(user_key) or {}
+    for pk, item in anonymous.items():
+        quantity = items.get(pk, {}).get('quantity', 0) + item['quantity']
+        items[pk] = {'quantity': min(quantity, MAX_QUANTITY), 'price': item['price']}
+    cache.set(user_key, items, CART_TIMEOUT)
+    cache.delete(cart_key(f'anon:{cart_id}'))
@@ -0,0 +1,25 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from products.inventory import stock_changed
+from products.models import Product
+
+from .cart import invalidate_snapshots, merge_anonymous_cart
+
+
+@receiver(user_logged_in)
+def merge_cart_on_login(sender, request, user, **kwargs):
+    if request is not None:
+        merge_anonymous_cart(request, user)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_snapshot(sender, instance, **kwargs):
+    invalidate_snapshots([instance.pk])
+
+
+@receiver(stock_changed)
+def invalidate_stock_snapshots(sender, product_ids, **kwargs):
+    invalidate_snapshots(product_ids)
@@ -0,0 +1,140 @@
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from cart.cart import invalidate_snapshots
+from invoices.models import Payment
+from orders.models import PaymentMethod
+from products.models import Category, Product
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'cart-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CartTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='cart@example.com', full_name='Carrinho', password='password123',
+        )
+        category = Category.objects.create(name='Coleiras')
+        cls.collar = Product.objects.create(
+            name='Coleira', description='', price=Decimal('20.00'), stock=3, category=category,
+        )
+        cls.leash = Product.objects.create(
+            name='Guia', description='', price=Decimal('35.00'), stock=10, category=category,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def add(self, product, quantity=1):
+        return self.client.post(
+            reverse('cart_add'),
+            json.dumps({'product': product.pk, 'quantity': quantity}),
+            content_type='application/json',
+        )
+
+    def cart(self):
+        return json.loads(self.client.get(reverse('cart_detail')).content)
+
+    def test_add_creates_signed_cookie_and_no_session_rows(self):
+        response = self.add(self.collar, 2)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('cart_id', response.cookies)
+        self.assertNotIn('sessionid', response.cookies)
+
+        data = self.cart()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['total'], '40.00')
+
+    def test_add_reads_products_at_most_once(self):
+        with self.assertNumQueries(1):
+            self.add(self.collar)
+        with self.assertNumQueries(0):
+            self.add(self.collar)
+
+    def test_add_to_cart_with_expired_snapshots_reads_products_once(self):
+        self.add(self.collar)
+        self.add(self.leash)
+        invalidate_snapshots([self.collar.pk, self.leash.pk])
+
+        with self.assertNumQueries(1):
+            response = self.add(self.leash)
+        items = {item['product']: item for item in json.loads(response.content)['items']}
+        self.assertEqual(items[self.leash.pk]['quantity'], 2)
+        self.assertTrue(items[self.collar.pk]['available'])
+
+    def test_price_change_is_flagged_but_snapshot_kept(self):
+        self.add(self.collar)
+        self.collar.price = Decimal('25.00')
+        self.collar.save()
+
+        item = self.cart()['items'][0]
+        self.assertEqual(item['price'], '20.00')
+        self.assertEqual(item['current_price'], '25.00')
+        self.assertTrue(item['price_changed'])
+
+    def test_quantity_above_stock_is_unavailable(self):
+        self.add(self.collar, 4)
+        self.assertFalse(self.cart()['items'][0]['available'])
+
+    def test_update_to_zero_removes_item(self):
+        self.add(self.collar)
+        response = self.client.post(reverse('cart_update'), {'product': self.collar.pk, 'quantity': 0})
+        self.assertEqual(json.loads(response.content)['items'], [])
+
+    def test_unknown_product_is_rejected(self):
+        response = self.client.post(reverse('cart_add'), {'product': 999999})
+        self.assertEqual(response.status_code, 400)
+
+    def test_anonymous_cart_merges_on_login(self):
+        self.client.force_login(self.user)
+        self.add(self.leash)
+        self.client.logout()
+
+        self.add(self.collar, 2)
+        self.add(self.leash, 1)
+        # Como a view de login faria: o sinal recebe a requisição com o cookie
+        request = RequestFactory().get('/')
+        request.COOKIES = {name: morsel.value for name, morsel in self.client.cookies.items()}
+        user_logged_in.send(sender=User, request=request, user=self.user)
+        self.client.force_login(self.user)
+
+        items = {item['product']: item['quantity'] for item in self.cart()['items']}
+        self.assertEqual(items, {self.collar.pk: 2, self.leash.pk: 2})
+
+    def test_checkout_creates_order_and_clears_cart(self):
+        self.client.force_login(self.user)
+        self.add(self.collar, 2)
+        response = self.client.post(reverse('cart_checkout'), {
+            'shipping_address': 'Rua Carrinho, 1',
+            'payment_method': PaymentMethod.PIX,
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.content)['total'], '40.00')
+        self.assertTrue(Payment.objects.exists())
+        self.assertEqual(self.cart()['items'], [])
+
+    def test_checkout_without_stock_keeps_cart(self):
+        self.client.force_login(self.user)
+        self.add(self.collar, 4)
+        response = self.client.post(reverse('cart_checkout'), {
+            'shipping_address': 'Rua Carrinho, 1',
+            'payment_method': PaymentMethod.PIX,
+        })
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(json.loads(response.content)['products'], [self.collar.pk])
+        self.assertEqual(len(self.cart()['items']), 1)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('', views.cart_detail, name='cart_detail'),
+    path('add/', views.add_to_cart, name='cart_add'),
+    path('update/', views.update_cart, name='cart_update'),
+    path('checkout/', views.checkout, name='cart_checkout'),
+]
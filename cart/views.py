@@ -0,0 +1,105 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET, require_POST
+
+from orders.services import checkout as create_order
+from products.inventory import InsufficientStock
+
+from .cart import Cart
+
+
+def _payload(request):
+    """Dados do POST em JSON ou formulário"""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            raise ValidationError("JSON inválido")
+        if not isinstance(data, dict):
+            raise ValidationError("JSON inválido")
+        return data
+    return request.POST
+
+
+def _int(data, name, default=None):
+    value = data.get(name, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"{name} deve ser um inteiro")
+
+
+def _cart_response(cart, status=200):
+    lines = cart.lines()
+    data = {
+        'items': [
+            {
+                'product': line.product_id,
+                'name': line.snapshot.name if line.snapshot else None,
+                'quantity': line.quantity,
+                'price': str(line.price),
+                'current_price': str(line.snapshot.price) if line.snapshot else None,
+                'subtotal': str(line.subtotal),
+                'available': line.available,
+                'price_changed': line.price_changed,
+            }
+            for line in lines
+        ],
+        'count': len(cart),
+        'total': str(sum((line.subtotal for line in lines), 0)),
+    }
+    return cart.set_cookie(JsonResponse(data, status=status))
+
+
+def _error(message, status=400, **extra):
+    return JsonResponse({'error': message, **extra}, status=status)
+
+
+@require_GET
+def cart_detail(request):
+    return _cart_response(Cart(request))
+
+
+@require_POST
+def add_to_cart(request):
+    cart = Cart(request)
+    try:
+        data = _payload(request)
+        cart.add(_int(data, 'product'), _int(data, 'quantity', 1))
+    except ValidationError as exc:
+        return cart.set_cookie(_error(exc.messages[0]))
+    return _cart_response(cart)
+
+
+@require_POST
+def update_cart(request):
+    cart = Cart(request)
+    try:
+        data = _payload(request)
+        cart.set(_int(data, 'product'), _int(data, 'quantity'))
+    except ValidationError as exc:
+        return cart.set_cookie(_error(exc.messages[0]))
+    return _cart_response(cart)
+
+
+@require_POST
+def checkout(request):
+    if not request.user.is_authenticated:
+        return _error("Autenticação necessária", status=401)
+    cart = Cart(request)
+    try:
+        data = _payload(request)
+        order = create_order(
+            request.user,
+            cart.quantities(),
+            data.get('shipping_address', ''),
+            data.get('payment_method', ''),
+        )
+    except InsufficientStock as exc:
+        return _error("Estoque insuficiente", status=409, products=exc.product_ids)
+    except ValidationError as exc:
+        return _error(exc.messages[0])
+    cart.clear()
+    return JsonResponse({'order': str(order.pk), 'total': str(order.total)}, status=201)
@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+# category.Category duplicava products.Category, que é a usada pelos
+# produtos, reviews e pela página de categoria. As linhas que existirem aqui
+# são copiadas para products (como raízes da árvore) e a tabela é removida.
+SEGMENT = '{:08x}/'
+
+
+def copy_categories(apps, schema_editor):
+    Old = apps.get_model('category', 'Category')
+    New = apps.get_model('products', 'Category')
+    names = set(New.objects.values_list('name', flat=True))
+    slugs = set(New.objects.values_list('slug', flat=True))
+    for old in Old.objects.order_by('pk'):
+        if old.name in names or old.slug in slugs:
+            continue
+        category = New.objects.create(name=old.name, slug=old.slug or slugify(old.name))
+        category.path = SEGMENT.format(category.pk)
+        category.save(update_fields=['path'])
+        names.add(category.name)
+        slugs.add(category.slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+        ('products', '0009_category_tree'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_categories, migrations.RunPython.noop),
+        migrations.DeleteModel(name='Category'),
+    ]
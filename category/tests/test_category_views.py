@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from products.models import Category, Product
+
+
+class CategoryDetailViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Brinquedos')
+        other = Category.objects.create(name='Rações')
+        Product.objects.create(
+            name='Bolinha', description='', price=Decimal('9.90'), stock=4, category=cls.category,
+        )
+        Product.objects.create(
+            name='Corda', description='', price=Decimal('14.90'), stock=0,
+            category=cls.category, is_active=False,
+        )
+        Product.objects.create(
+            name='Ração premium', description='', price=Decimal('99.90'), stock=2, category=other,
+        )
+
+    def test_lists_active_products_of_category(self):
+        response = self.client.get(reverse('category_detail', kwargs={'slug': 'brinquedos'}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Bolinha')
+        self.assertNotContains(response, 'Corda')
+        self.assertNotContains(response, 'Ração premium')
+
+    def test_unknown_slug_returns_404(self):
+        response = self.client.get(reverse('category_detail', kwargs={'slug': 'nada'}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_cursor_returns_400(self):
+        url = reverse('category_detail', kwargs={'slug': 'brinquedos'})
+        response = self.client.get(url, {'cursor': 'invalido'})
+        self.assertEqual(response.status_code, 400)
@@ -1,6 +1,8 @@
 from django.urls import path
+
+from petstore.routers import replica_reads
 from . import views
 
 urlpatterns = [
-    path('<slug:slug>/', views.CategoryDetailView.as_view(), name='category_detail'),
+    path('<slug:slug>/', replica_reads(views.CategoryDetailView.as_view()), name='category_detail'),
 ]
@@ -1,9 +1,70 @@
-from django.shortcuts import render
-from django.views.generic import DateDetailView
-from .models import Category
+from django.core.cache import cache
+from django.core.exceptions import BadRequest
+from django.http import HttpResponse
+from django.shortcuts import aget_object_or_404
+from django.views import View
 
+from products import cache as catalog_cache
+from products.models import Category, Product
+from products.pagination import InvalidCursor, akeyset_paginate
+from products.tree import abreadcrumbs
+from products.views import LIST_ORDERING, PRODUCTS_PER_PAGE, arender
 
-class CategoryDetailView(DateDetailView):
-    model = Category
-    template_name = 'Category/detail.html'
-    context_object_name = 'category'
+
+class CategoryDetailView(View):
+    """
+    Página da categoria (pelo slug) com os produtos ativos dela e de todas
+    as subcategorias, paginados por cursor. A subárvore é um intervalo de
+    path, então os produtos saem de uma única consulta indexada.
+
+    A página fica em cache por categoria: a chave combina um token da
+    categoria (trocado quando um produto da subárvore muda, ver
+    products.tree.invalidate_subtree_pages) e o token da árvore (trocado
+    quando qualquer categoria muda). Uma página em cache não consulta o banco.
+    """
+
+    template_name = 'category/detail.html'
+
+    async def get(self, request, slug):
+        cursor = request.GET.get('cursor')
+        # Os tokens são lidos antes do banco: se um produto mudar durante a
+        # renderização, a página fica gravada sob um token já descartado
+        page_key = catalog_cache.category_page_key(
+            slug,
+            await catalog_cache.acategory_version(slug),
+            await catalog_cache.acategory_tree_version(),
+            cursor,
+        )
+        content = await cache.aget(page_key)
+        await catalog_cache.arecord_hit(content is not None)
+        if content is not None:
+            return HttpResponse(content)
+
+        category = await aget_object_or_404(Category, slug=slug)
+        products = (
+            Product.objects.filter(category.subtree_q(prefix='category__'), is_active=True)
+            .select_related('category')
+            .only('name', 'price', 'stock', 'image', 'created_at', 'category__name', 'category__slug')
+        )
+        try:
+            page = await akeyset_paginate(
+                products,
+                LIST_ORDERING,
+                cursor=cursor,
+                page_size=PRODUCTS_PER_PAGE,
+            )
+        except InvalidCursor:
+            raise BadRequest("Cursor de paginação inválido")
+        children = [
+            child async for child in category.children.only('name', 'slug').order_by('name')
+        ]
+        response = await arender(request, self.template_name, {
+            'category': category,
+            'breadcrumbs': await abreadcrumbs(category),
+            'children': children,
+            'products': page.items,
+            'page': page,
+        })
+
+        await cache.aset(page_key, response.content, catalog_cache.cache_timeout())
+        return response
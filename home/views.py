@@ -1,7 +1,6 @@
 from django.shortcuts import render
-from django.http import HttpResponse
 
 
-def home(request):
+async def home(request):
+    # Página estática: renderizar não toca no banco, então roda no event loop
     return render(request, 'home/home.html')
-    
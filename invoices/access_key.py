@@ -0,0 +1,56 @@
+"""
+Chave de acesso da NF-e (44 dígitos).
+
+cUF (2) + AAMM da emissão (4) + CNPJ do emitente (14) + modelo (2) +
+série (3) + número (9) + tipo de emissão (1) + código numérico (8) +
+dígito verificador (1), calculado pelo módulo 11 com pesos 2 a 9 da
+direita para a esquerda.
+"""
+import secrets
+
+NFE_MODEL = 55
+EMISSION_NORMAL = 1
+ACCESS_KEY_LENGTH = 44
+MAX_NUMBER = 999_999_999
+
+
+def check_digit(digits):
+    """Dígito verificador (módulo 11) dos 43 primeiros dígitos da chave"""
+    total = sum(
+        int(digit) * (2 + index % 8)
+        for index, digit in enumerate(reversed(digits))
+    )
+    remainder = total % 11
+    return 0 if remainder < 2 else 11 - remainder
+
+
+def random_code(number):
+    """Código numérico da chave; o leiaute exige que seja diferente do número"""
+    while True:
+        code = secrets.randbelow(10 ** 8)
+        if code != number:
+            return code
+
+
+def build_access_key(*, uf, issued_at, cnpj, series, number, code=None,
+                     model=NFE_MODEL, emission_type=EMISSION_NORMAL):
+    if not 1 <= number <= MAX_NUMBER:
+        raise ValueError(f"Número de nota fora do intervalo: {number}")
+    if code is None:
+        code = random_code(number)
+    cnpj = ''.join(ch for ch in str(cnpj) if ch.isdigit())
+    if len(cnpj) != 14:
+        raise ValueError(f"CNPJ inválido: {cnpj}")
+    digits = (
+        f'{int(uf):02d}{issued_at:%y%m}{cnpj}{model:02d}'
+        f'{series:03d}{number:09d}{emission_type:d}{code:08d}'
+    )
+    return f'{digits}{check_digit(digits)}'
+
+
+def is_valid_access_key(key):
+    return (
+        len(key) == ACCESS_KEY_LENGTH
+        and key.isdigit()
+        and check_digit(key[:-1]) == int(key[-1])
+    )
@@ -0,0 +1,183 @@
+"""
+Emissão de notas em lote (fechamento do mês).
+
+Os pedidos sem nota são processados em blocos. Para cada bloco: uma
+consulta traz pedidos e clientes, outra traz todos os itens já com o
+subtotal, a numeração vem de um único lease_block() do tamanho exato do
+bloco (fechado ao final) e as chaves de acesso são calculadas em memória.
+O XML de cada nota é serializado num pool de processos a partir de
+InvoiceDocument (dados simples, sem ORM), gravado no storage, e as notas
+do bloco entram com um bulk_create.
+
+bulk_create não dispara post_save, então as notas emitidas aqui não
+agendam generate_invoice_xml: o XML já vai junto.
+
+Só uma emissão pode rodar por vez, garantido por um cache.add() em
+LOCK_KEY. A trava vale entre processos apenas com um cache compartilhado
+(Redis, com REDIS_URL definido). Com o LocMemCache padrão ela só protege
+o próprio processo: rodar issue_invoices em dois processos ao mesmo
+tempo fatura os mesmos pedidos duas vezes.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.base import ContentFile
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from orders.models import SUBTOTAL_EXPRESSION, Order, OrderItem, OrderStatus
+
+from . import numbering
+from .access_key import build_access_key
+from .models import Invoid
+from .xml import InvoiceDocument, render_invoice_xml
+
+ISSUE_CHUNK_SIZE = 500
+INVOICEABLE_STATUSES = [OrderStatus.PROCESSANDO, OrderStatus.ENVIADO, OrderStatus.ENTREGUE]
+LOCK_KEY = 'invoices:issuance-lock'
+LOCK_TTL = 60 * 30
+
+
+class IssuanceRunning(Exception):
+    pass
+
+
+@dataclass
+class IssueResult:
+    issued: int = 0
+    chunks: int = 0
+    first_number: int = None
+    last_number: int = None
+
+
+def orders_to_invoice():
+    """Pedidos faturáveis sem nota válida (notas canceladas não contam)"""
+    invoiced = Invoid.objects.filter(order=OuterRef('pk')).exclude(status='canceled')
+    return Order.objects.filter(status__in=INVOICEABLE_STATUSES).filter(~Exists(invoiced))
+
+
+def lock_is_shared():
+    """Se a trava da emissão vale entre processos (cache fora do processo)"""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+class InvoiceIssuer:
+    def __init__(self, chunk_size=ISSUE_CHUNK_SIZE, workers=None, series=None, storage=None):
+        self.chunk_size = chunk_size
+        self.workers = os.cpu_count() if workers is None else workers
+        self.series = settings.NFE_SERIES if series is None else series
+        self.field = Invoid._meta.get_field('xml_file')
+        self.storage = storage or self.field.storage
+        self.result = IssueResult()
+
+    def run(self, orders=None, limit=None):
+        """
+        Emite as notas de `orders` (padrão: orders_to_invoice()). Só uma
+        emissão por vez: duas rodando juntas faturariam o mesmo pedido. A
+        trava só é global com cache compartilhado; ver lock_is_shared().
+        """
+        if not cache.add(LOCK_KEY, 1, LOCK_TTL):
+            raise IssuanceRunning("Já existe uma emissão em andamento")
+        try:
+            orders = orders_to_invoice() if orders is None else orders
+            order_ids = list(orders.order_by('created_at', 'pk').values_list('pk', flat=True)[:limit])
+            chunks = [
+                order_ids[start:start + self.chunk_size]
+                for start in range(0, len(order_ids), self.chunk_size)
+            ]
+            if self.workers and len(order_ids) > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    for chunk in chunks:
+                        self.issue_chunk(chunk, pool.map)
+            else:
+                for chunk in chunks:
+                    self.issue_chunk(chunk, map)
+            return self.result
+        finally:
+            cache.delete(LOCK_KEY)
+
+    def issue_chunk(self, order_ids, map_func=map):
+        orders = list(
+            Order.objects.filter(pk__in=order_ids)
+            .select_related('user')
+            .only('pk', 'created_at', 'shipping_address', 'user', 'user__full_name', 'user__email')
+            .order_by('created_at', 'pk')
+        )
+        if not orders:
+            return
+        items = (
+            OrderItem.objects.filter(order_id__in=order_ids)
+            .order_by('order_id', 'created_at', 'id')
+            .annotate(subtotal=SUBTOTAL_EXPRESSION)
+            .values_list('order_id', 'product_id', 'product__name', 'quantity', 'unit_price', 'subtotal')
+        )
+        items_by_order = {
+            order_id: [row[1:] for row in rows]
+            for order_id, rows in groupby(items, key=itemgetter(0))
+        }
+
+        lease = numbering.lease_block(self.series, len(orders))
+        numbers = lease.numbers
+        now = timezone.now()
+        invoices = []
+        documents = []
+        for order, number in zip(orders, numbers):
+            invoice = Invoid(
+                order=order,
+                access_key=build_access_key(
+                    uf=settings.NFE_UF,
+                    issued_at=now,
+                    cnpj=settings.NFE_CNPJ,
+                    series=self.series,
+                    number=number,
+                ),
+                series=self.series,
+                number=number,
+                issue_at=now,
+            )
+            invoices.append(invoice)
+            documents.append(InvoiceDocument(
+                access_key=invoice.access_key,
+                number=number,
+                issue_at=now,
+                name=order.user.full_name,
+                email=order.user.email,
+                address=order.shipping_address,
+                items=items_by_order.get(order.pk, []),
+            ))
+
+        saved = []
+        try:
+            rendered = self._map(map_func, documents)
+            for invoice, content in zip(invoices, rendered):
+                name = self.field.generate_filename(invoice, f'{invoice.access_key}.xml')
+                invoice.xml_file = self.storage.save(name, ContentFile(content))
+                saved.append(invoice.xml_file.name)
+            Invoid.objects.bulk_create(invoices)
+        except Exception:
+            for name in saved:
+                self.storage.delete(name)
+            raise
+        finally:
+            # Se o bloco falhou, os números dele aparecem em find_gaps()
+            numbering.close_lease(lease)
+
+        self.result.issued += len(invoices)
+        self.result.chunks += 1
+        if self.result.first_number is None:
+            self.result.first_number = numbers[0]
+        self.result.last_number = numbers[-1]
+
+    def _map(self, map_func, documents):
+        if map_func is map:
+            return map(render_invoice_xml, documents)
+        # Vários documentos por mensagem: o custo do pickle fica diluído
+        chunksize = max(1, len(documents) // (self.workers * 4))
+        return map_func(render_invoice_xml, documents, chunksize=chunksize)
@@ -0,0 +1,112 @@
+import tempfile
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from invoices.issuance import ISSUE_CHUNK_SIZE, InvoiceIssuer
+from orders.models import Order, OrderItem, OrderStatus, PaymentMethod
+from products.models import Category, Product
+
+ITEMS_PER_ORDER = 3
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Mede a emissão em lote no banco configurado (SQLite ou PostgreSQL):
+    cria os pedidos, emite as notas sem pool e com o pool de processos e
+    desfaz tudo ao final. Os XML vão para um diretório temporário.
+    """
+
+    help = "Benchmark da emissão de notas em lote (sem pool x pool de processos)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help="Pedidos a faturar")
+        parser.add_argument('--chunk-size', type=int, default=ISSUE_CHUNK_SIZE)
+        parser.add_argument(
+            '--workers',
+            nargs='+',
+            type=int,
+            default=[0, 4],
+            help="Tamanhos de pool a comparar (0 = sem pool)",
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        if count < 1 or options['chunk_size'] < 1:
+            raise CommandError("--count e --chunk-size devem ser positivos")
+
+        self.stdout.write(f"{'workers':>8} {'notas':>8} {'tempo (s)':>10} {'notas/s':>10}")
+        with tempfile.TemporaryDirectory() as location:
+            try:
+                with transaction.atomic():
+                    self._create_orders(count)
+                    for workers in options['workers']:
+                        issued, elapsed = self._run(
+                            workers, options['chunk_size'], FileSystemStorage(location=location),
+                        )
+                        self.stdout.write(
+                            f"{workers:>8} {issued:>8} {elapsed:>10.2f} {issued / elapsed:>10.1f}"
+                        )
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _create_orders(self, count):
+        user = get_user_model().objects.create_user(
+            email='benchmark-nfe@example.com',
+            full_name='Benchmark NF-e',
+        )
+        category = Category.objects.create(name='Benchmark NF-e')
+        products = Product.objects.bulk_create(
+            Product(
+                name=f'Benchmark NF-e {i}',
+                description='',
+                price=Decimal('19.90'),
+                stock=10,
+                category=category,
+            )
+            for i in range(ITEMS_PER_ORDER)
+        )
+        orders = Order.objects.bulk_create(
+            (
+                Order(
+                    user=user,
+                    status=OrderStatus.ENTREGUE,
+                    total=Decimal('59.70'),
+                    shipping_address=f'Rua Benchmark, {i}',
+                    payment_method=PaymentMethod.PIX,
+                )
+                for i in range(count)
+            ),
+            batch_size=1000,
+        )
+        OrderItem.objects.bulk_create(
+            (
+                OrderItem(order=order, product=product, quantity=1, unit_price=product.price)
+                for order in orders
+                for product in products
+            ),
+            batch_size=1000,
+        )
+        return orders
+
+    def _run(self, workers, chunk_size, storage):
+        # Cada rodada emite para os mesmos pedidos e é desfeita em seguida
+        try:
+            with transaction.atomic():
+                issuer = InvoiceIssuer(chunk_size=chunk_size, workers=workers, storage=storage)
+                start = time.perf_counter()
+                result = issuer.run()
+                elapsed = time.perf_counter() - start
+                raise _Rollback
+        except _Rollback:
+            pass
+        return result.issued, elapsed
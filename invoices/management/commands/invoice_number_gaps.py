@@ -0,0 +1,36 @@
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+
+from invoices.numbering import find_gaps
+
+
+def ranges(numbers):
+    """Agrupa números consecutivos em (primeiro, último)"""
+    for _, group in groupby(enumerate(numbers), key=lambda pair: pair[1] - pair[0]):
+        group = [number for _, number in group]
+        yield group[0], group[-1]
+
+
+class Command(BaseCommand):
+    """
+    Lista os números reservados e não usados (lacunas) por série, para a
+    inutilização junto à SEFAZ. Blocos ainda em uso não entram na conta.
+    """
+
+    help = "Relatório de lacunas na numeração das notas fiscais"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--series', type=int)
+
+    def handle(self, *args, **options):
+        total = 0
+        for series, rows in groupby(find_gaps(series=options['series']), key=lambda row: row[0]):
+            for first, last in ranges(number for _, number in rows):
+                total += last - first + 1
+                label = f"{first}" if first == last else f"{first} a {last}"
+                self.stdout.write(f"Série {series}: {label}")
+        if total:
+            self.stdout.write(self.style.WARNING(f"{total} número(s) sem nota"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Nenhuma lacuna na numeração"))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from invoices.issuance import ISSUE_CHUNK_SIZE, InvoiceIssuer, IssuanceRunning, lock_is_shared
+
+
+class Command(BaseCommand):
+    """
+    Emite as notas de todos os pedidos faturáveis ainda sem nota, em
+    blocos, com o XML gerado num pool de processos.
+    """
+
+    help = (
+        "Emite em lote as notas fiscais dos pedidos pendentes de faturamento. "
+        "A trava contra emissões simultâneas só vale entre processos com cache "
+        "compartilhado (Redis, REDIS_URL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=ISSUE_CHUNK_SIZE)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help="Processos para gerar o XML (padrão: número de CPUs; 0 desliga o pool)",
+        )
+        parser.add_argument('--series', type=int, help="Série das notas (padrão: NFE_SERIES)")
+        parser.add_argument('--limit', type=int, help="Máximo de notas a emitir")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size deve ser positivo")
+        if not lock_is_shared():
+            self.stderr.write(self.style.WARNING(
+                "Cache local: a trava da emissão só vale neste processo. "
+                "Não rode outra emissão ao mesmo tempo (ou configure REDIS_URL)."
+            ))
+        issuer = InvoiceIssuer(
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            series=options['series'],
+        )
+        try:
+            result = issuer.run(limit=options['limit'])
+        except IssuanceRunning as exc:
+            raise CommandError(str(exc))
+
+        if not result.issued:
+            self.stdout.write("Nenhum pedido a faturar")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.issued} nota(s) emitida(s) em {result.chunks} bloco(s), "
+            f"números {result.first_number} a {result.last_number}"
+        ))
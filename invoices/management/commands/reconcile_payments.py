@@ -0,0 +1,68 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from invoices.reconciliation import (
+    AMOUNT_MISMATCH,
+    INVALID_ROW,
+    MISSING_SETTLEMENT,
+    RECONCILE_CHUNK_SIZE,
+    UNKNOWN_TRANSACTION,
+    PaymentReconciler,
+    read_settlement,
+)
+
+
+class Command(BaseCommand):
+    """
+    Concilia o arquivo de liquidação do gateway (CSV com transaction_id,
+    status, amount e payment_date) com os pagamentos, em blocos.
+
+    Status e data de pagamento são atualizados; valores divergentes só são
+    reportados, a menos que --update-amounts seja passado.
+    """
+
+    help = "Concilia pagamentos com o arquivo de liquidação do gateway"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Arquivo .csv de liquidação")
+        parser.add_argument('--chunk-size', type=int, default=RECONCILE_CHUNK_SIZE)
+        parser.add_argument(
+            '--update-amounts',
+            action='store_true',
+            help="Grava o valor liquidado quando divergir do registrado",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Só reporta, sem gravar")
+        parser.add_argument('--report', help="Grava as divergências neste CSV")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size deve ser positivo")
+        reconciler = PaymentReconciler(
+            chunk_size=options['chunk_size'],
+            update_amounts=options['update_amounts'],
+            dry_run=options['dry_run'],
+        )
+        try:
+            result = reconciler.run(read_settlement(options['path']))
+        except FileNotFoundError:
+            raise CommandError(f"Arquivo não encontrado: {options['path']}")
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8', newline='') as output:
+                writer = csv.writer(output)
+                writer.writerow(['kind', 'transaction_id', 'detail'])
+                writer.writerows(result.mismatches)
+
+        for kind, transaction_id, detail in result.mismatches[:20]:
+            self.stdout.write(self.style.WARNING(f"{kind} {transaction_id} {detail}".rstrip()))
+        if len(result.mismatches) > 20:
+            self.stdout.write(self.style.WARNING(f"... e mais {len(result.mismatches) - 20}"))
+        verb = "a atualizar" if options['dry_run'] else "atualizado(s)"
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.processed} linha(s), {result.updated} pagamento(s) {verb}; "
+            f"{result.count(AMOUNT_MISMATCH)} valor(es) divergente(s), "
+            f"{result.count(UNKNOWN_TRANSACTION)} transação(ões) desconhecida(s), "
+            f"{result.count(MISSING_SETTLEMENT)} sem liquidação, "
+            f"{result.count(INVALID_ROW)} linha(s) inválida(s)"
+        ))
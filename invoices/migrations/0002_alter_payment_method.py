@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='method',
+            field=models.CharField(choices=[('credit_card', 'Cartão de Crédito'), ('debit_card', 'Cartão de Débito'), ('boleto', 'Boleto'), ('pix', 'Pix'), ('cash', 'Dinheiro')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0002_alter_payment_method'),
+        ('orders', '0002_order_stock_reserved_alter_orderitem_quantity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('series', models.PositiveSmallIntegerField(unique=True)),
+                ('next_number', models.PositiveIntegerField(default=1)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='invoid',
+            name='series',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddConstraint(
+            model_name='invoid',
+            constraint=models.UniqueConstraint(fields=('series', 'number'), name='invoice_unique_series_number'),
+        ),
+    ]
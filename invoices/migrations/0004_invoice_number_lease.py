@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0003_invoice_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceNumberLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('series', models.PositiveSmallIntegerField()),
+                ('first_number', models.PositiveIntegerField()),
+                ('last_number', models.PositiveIntegerField()),
+                ('leased_at', models.DateTimeField(auto_now_add=True)),
+                ('closed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['series', 'first_number'], name='invoices_in_series_5a72f0_idx')],
+            },
+        ),
+    ]
@@ -10,8 +10,10 @@ class Payment(models.Model):
     
     METHOD_CHOICES = [
         ('credit_card', 'Cartão de Crédito'),
+        ('debit_card', 'Cartão de Débito'),
         ('boleto', 'Boleto'),
         ('pix', 'Pix'),
+        ('cash', 'Dinheiro'),
     ]
     
     order = models.ForeignKey(
@@ -42,11 +44,54 @@ class Invoid(models.Model):
         related_name="invoices"
     )
     access_key = models.CharField(max_length=44, unique=True) # Chace de acesso da NFe
+    series = models.PositiveSmallIntegerField(default=1)
     number = models.PositiveIntegerField()
     status = models.CharField(max_length=20, choices=NFE_STATUS_CHOICES, default='authorized')
     xml_file = models.FileField(upload_to="invoices/", null=True, blank=True)
     issue_at = models.DateTimeField()
     authorized_at = models.DateTimeField(null=True, blank=True)
     
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'number'], name='invoice_unique_series_number'),
+        ]
+
     def __str__(self):
         return f"Nota fiscal {self.number}  - {self.status}"
+
+
+class InvoiceSequence(models.Model):
+    """Próximo número livre de cada série (ver invoices.numbering)"""
+    series = models.PositiveSmallIntegerField(unique=True)
+    next_number = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f"Série {self.series} - próximo {self.next_number}"
+
+
+class InvoiceNumberLease(models.Model):
+    """
+    Bloco de números entregue a um emissor. Números do bloco sem nota
+    depois que ele é fechado são lacunas a inutilizar (ver invoices.numbering)
+    """
+    series = models.PositiveSmallIntegerField()
+    first_number = models.PositiveIntegerField()
+    last_number = models.PositiveIntegerField()
+    leased_at = models.DateTimeField(auto_now_add=True)
+    closed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['series', 'first_number']),
+        ]
+
+    def __str__(self):
+        return f"Série {self.series}: {self.first_number}-{self.last_number}"
+
+    @property
+    def size(self):
+        return self.last_number - self.first_number + 1
+
+    @property
+    def numbers(self):
+        return range(self.first_number, self.last_number + 1)
@@ -0,0 +1,143 @@
+"""
+Numeração das notas por série.
+
+Cada série tem uma linha em InvoiceSequence com o próximo número livre.
+lease_block() reserva um bloco inteiro numa transação curta: o UPDATE de
+F() trava a linha (também no SQLite, onde select_for_update não existe) e
+o bloco é registrado em InvoiceNumberLease. Quem emite milhares de notas
+faz uma ida ao banco por bloco, não por nota, e emissores diferentes só
+disputam a linha da série durante essa transação.
+
+NumberAllocator entrega os números de um bloco a partir da memória e pede
+outro quando ele acaba. Números reservados e nunca usados (emissão que
+falhou, processo que morreu, sobra do último bloco) são lacunas na
+numeração fiscal; find_gaps() as encontra comparando os blocos fechados
+ou abandonados com as notas gravadas.
+"""
+import threading
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .access_key import MAX_NUMBER
+from .models import InvoiceNumberLease, InvoiceSequence, Invoid
+
+DEFAULT_BLOCK_SIZE = 100
+# Bloco aberto há mais tempo que isso é considerado abandonado
+LEASE_STALE_AFTER = timedelta(hours=6)
+
+
+def lease_block(series, size):
+    """Reserva `size` números consecutivos da série e devolve o bloco"""
+    if size < 1:
+        raise ValueError("O bloco precisa ter ao menos um número")
+    sequence = InvoiceSequence.objects.filter(series=series)
+    with transaction.atomic():
+        if not sequence.update(next_number=F('next_number') + size):
+            _create_sequence(series)
+            sequence.update(next_number=F('next_number') + size)
+        next_number = sequence.values_list('next_number', flat=True).get()
+        if next_number - 1 > MAX_NUMBER:
+            raise ValueError(f"Série {series} esgotada")
+        return InvoiceNumberLease.objects.create(
+            series=series,
+            first_number=next_number - size,
+            last_number=next_number - 1,
+        )
+
+
+def _create_sequence(series):
+    try:
+        with transaction.atomic():
+            InvoiceSequence.objects.create(series=series)
+    except IntegrityError:
+        # Outro processo criou a série ao mesmo tempo
+        pass
+
+
+def close_lease(lease):
+    """A partir daqui os números sem nota do bloco contam como lacunas"""
+    InvoiceNumberLease.objects.filter(pk=lease.pk, closed_at__isnull=True).update(closed_at=timezone.now())
+
+
+class NumberAllocator:
+    """
+    Entrega números de uma série a partir de blocos reservados. Seguro
+    entre threads; cada processo deve ter o seu. Use como context manager
+    ou chame close() para que a sobra do bloco entre na conta de lacunas.
+    """
+
+    def __init__(self, series, block_size=DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("O bloco precisa ter ao menos um número")
+        self.series = series
+        self.block_size = block_size
+        self.leases = 0
+        self._lock = threading.Lock()
+        self._lease = None
+        self._next = None
+
+    def allocate(self):
+        with self._lock:
+            if self._lease is None or self._next > self._lease.last_number:
+                # Fecha antes de reservar: se a reserva falhar, tentar de novo
+                # não deixa um bloco novo para trás (close_lease é idempotente)
+                if self._lease is not None:
+                    close_lease(self._lease)
+                self._lease = lease_block(self.series, self.block_size)
+                self._next = self._lease.first_number
+                self.leases += 1
+            number = self._next
+            self._next += 1
+            return number
+
+    def close(self):
+        with self._lock:
+            if self._lease is not None:
+                close_lease(self._lease)
+                self._lease = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def find_gaps(series=None, stale_after=LEASE_STALE_AFTER):
+    """
+    Gera (série, número) dos números reservados sem nota, em blocos
+    fechados ou abandonados. Só os blocos incompletos têm as notas lidas.
+    """
+    used = (
+        Invoid.objects.filter(
+            series=OuterRef('series'),
+            number__gte=OuterRef('first_number'),
+            number__lte=OuterRef('last_number'),
+        )
+        .order_by()
+        .values('series')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    leases = (
+        InvoiceNumberLease.objects.filter(
+            Q(closed_at__isnull=False) | Q(leased_at__lt=timezone.now() - stale_after)
+        )
+        .annotate(used=Coalesce(Subquery(used), Value(0), output_field=IntegerField()))
+        .filter(used__lt=F('last_number') - F('first_number') + 1)
+        .order_by('series', 'first_number')
+    )
+    if series is not None:
+        leases = leases.filter(series=series)
+    for lease in leases.iterator():
+        taken = set(
+            Invoid.objects.filter(series=lease.series, number__range=(lease.first_number, lease.last_number))
+            .values_list('number', flat=True)
+        )
+        for number in lease.numbers:
+            if number not in taken:
+                yield lease.series, number
@@ -0,0 +1,189 @@
+"""
+Conciliação dos pagamentos com o arquivo de liquidação do gateway.
+
+O arquivo (CSV: transaction_id, status, amount, payment_date) é lido em
+streaming e processado em blocos. Cada bloco busca os pagamentos com um
+único in_bulk(field_name='transaction_id') e grava status e data de
+pagamento com um bulk_update. Valor diferente do registrado é divergência:
+só é gravado quando pedido (update_amounts).
+
+Os transaction_id vistos no arquivo ficam num set (tamanho do arquivo, não
+da tabela). No fim, os pagamentos aprovados no período do arquivo que não
+apareceram nele são percorridos com iterator() e reportados como sem
+liquidação.
+"""
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Payment
+
+RECONCILE_CHUNK_SIZE = 1000
+UPDATE_FIELDS = ['status', 'payment_date']
+# Métodos liquidados pelo gateway; dinheiro não aparece no arquivo
+GATEWAY_METHODS = ['credit_card', 'debit_card', 'boleto', 'pix']
+
+UNKNOWN_TRANSACTION = 'unknown_transaction'
+AMOUNT_MISMATCH = 'amount_mismatch'
+MISSING_SETTLEMENT = 'missing_settlement'
+INVALID_ROW = 'invalid_row'
+
+
+class RowError(ValueError):
+    pass
+
+
+@dataclass
+class ReconcileResult:
+    processed: int = 0
+    updated: int = 0
+    mismatches: list = field(default_factory=list)
+    first_date: datetime = None
+    last_date: datetime = None
+
+    def count(self, kind):
+        return sum(1 for mismatch in self.mismatches if mismatch[0] == kind)
+
+
+def read_settlement(path):
+    """Gera (número da linha, dict) a partir do CSV de liquidação"""
+    with open(path, encoding='utf-8', newline='') as source:
+        for number, row in enumerate(csv.DictReader(source), start=1):
+            yield number, row
+
+
+def parse_payment_date(value):
+    value = str(value or '').strip()
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise RowError("data inválida")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def clean_row(row):
+    transaction_id = str(row.get('transaction_id') or '').strip()
+    if not transaction_id:
+        raise RowError("transaction_id obrigatório")
+    status = str(row.get('status') or '').strip().lower()
+    if status not in dict(Payment.STATUS_CHOICES):
+        raise RowError("status inválido")
+    try:
+        amount = Decimal(str(row.get('amount', '')).replace(',', '.'))
+    except InvalidOperation:
+        raise RowError("valor inválido")
+    if not amount.is_finite():
+        raise RowError("valor inválido")
+    return {
+        'transaction_id': transaction_id,
+        'status': status,
+        'amount': amount.quantize(Decimal('0.01')),
+        'payment_date': parse_payment_date(row.get('payment_date')),
+    }
+
+
+class PaymentReconciler:
+    def __init__(self, chunk_size=RECONCILE_CHUNK_SIZE, update_amounts=False, dry_run=False):
+        self.chunk_size = chunk_size
+        self.update_amounts = update_amounts
+        self.dry_run = dry_run
+        self.fields = UPDATE_FIELDS + ['amount'] if update_amounts else UPDATE_FIELDS
+        self.seen = set()
+        self.result = ReconcileResult()
+
+    def run(self, rows):
+        chunk = []
+        for number, row in rows:
+            chunk.append((number, row))
+            if len(chunk) >= self.chunk_size:
+                self.reconcile_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.reconcile_chunk(chunk)
+        self.report_missing()
+        return self.result
+
+    def mismatch(self, kind, transaction_id, detail=''):
+        self.result.mismatches.append((kind, transaction_id, detail))
+
+    def reconcile_chunk(self, chunk):
+        settled = {}
+        for number, row in chunk:
+            try:
+                data = clean_row(row)
+            except RowError as exc:
+                self.mismatch(INVALID_ROW, row.get('transaction_id') or '', f"linha {number}: {exc}")
+                continue
+            # A mesma transação duas vezes no arquivo: vale a última linha
+            settled[data['transaction_id']] = data
+        self.result.processed += len(chunk)
+        self.seen.update(settled)
+
+        payments = (
+            Payment.objects.only('pk', 'transaction_id', 'status', 'amount', 'payment_date')
+            .in_bulk(list(settled), field_name='transaction_id')
+        )
+        changed = []
+        for transaction_id, data in settled.items():
+            self.track_period(data['payment_date'])
+            payment = payments.get(transaction_id)
+            if payment is None:
+                self.mismatch(UNKNOWN_TRANSACTION, transaction_id)
+                continue
+            dirty = False
+            if payment.amount != data['amount']:
+                self.mismatch(
+                    AMOUNT_MISMATCH, transaction_id, f"registrado {payment.amount}, liquidado {data['amount']}",
+                )
+                if self.update_amounts:
+                    payment.amount = data['amount']
+                    dirty = True
+            if payment.status != data['status']:
+                payment.status = data['status']
+                dirty = True
+            if data['payment_date'] and payment.payment_date != data['payment_date']:
+                payment.payment_date = data['payment_date']
+                dirty = True
+            if dirty:
+                changed.append(payment)
+
+        if changed and not self.dry_run:
+            with transaction.atomic():
+                Payment.objects.bulk_update(changed, self.fields)
+        self.result.updated += len(changed)
+
+    def track_period(self, payment_date):
+        if payment_date is None:
+            return
+        if self.result.first_date is None or payment_date < self.result.first_date:
+            self.result.first_date = payment_date
+        if self.result.last_date is None or payment_date > self.result.last_date:
+            self.result.last_date = payment_date
+
+    def report_missing(self):
+        """Aprovados no período do arquivo que o gateway não liquidou"""
+        if self.result.first_date is None:
+            return
+        candidates = (
+            Payment.objects.filter(
+                status='approved',
+                method__in=GATEWAY_METHODS,
+                payment_date__range=(self.result.first_date, self.result.last_date),
+            )
+            .order_by('pk')
+            .values_list('transaction_id', flat=True)
+        )
+        for transaction_id in candidates.iterator(chunk_size=self.chunk_size):
+            if transaction_id not in self.seen:
+                self.mismatch(MISSING_SETTLEMENT, transaction_id)
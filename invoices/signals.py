@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Invoid
+from .tasks import generate_invoice_xml
+
+
+@receiver(post_save, sender=Invoid)
+def schedule_invoice_xml(sender, instance, created, **kwargs):
+    if created and not instance.xml_file:
+        transaction.on_commit(lambda: generate_invoice_xml.delay(instance.pk))
@@ -0,0 +1,30 @@
+import tempfile
+
+from celery import shared_task
+from django.core.files import File
+from django.db import OperationalError
+
+from .models import Invoid
+from .xml import write_invoice_xml
+
+
+@shared_task(autoretry_for=(OperationalError,), retry_backoff=True, max_retries=5)
+def generate_invoice_xml(invoice_id, force=False):
+    """
+    Gera e anexa o XML da nota. Idempotente: notas que já têm XML são
+    mantidas, a menos que `force` seja passado.
+    """
+    invoice = Invoid.objects.select_related('order__user').filter(pk=invoice_id).first()
+    if invoice is None or (invoice.xml_file and not force):
+        return None
+
+    previous = invoice.xml_file.name if invoice.xml_file else None
+    with tempfile.TemporaryFile() as out:
+        write_invoice_xml(invoice, out)
+        out.seek(0)
+        invoice.xml_file.save(f'{invoice.access_key}.xml', File(out), save=False)
+    # Só a coluna do arquivo: não sobrescreve status alterado em paralelo
+    Invoid.objects.filter(pk=invoice.pk).update(xml_file=invoice.xml_file.name)
+    if previous and previous != invoice.xml_file.name:
+        invoice.xml_file.storage.delete(previous)
+    return invoice.xml_file.name
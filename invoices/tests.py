@@ -1,3 +1,340 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from io import StringIO
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError, close_old_connections, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from invoices.access_key import build_access_key, check_digit, is_valid_access_key
+from invoices.issuance import InvoiceIssuer
+from invoices.models import InvoiceNumberLease, InvoiceSequence, Invoid, Payment
+from invoices.numbering import NumberAllocator, find_gaps, lease_block
+from invoices.tasks import generate_invoice_xml
+from invoices.xml import NFE_NAMESPACE
+from orders.models import Order, OrderStatus, PaymentMethod
+from products.models import Category, Product
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+NS = {'nfe': NFE_NAMESPACE}
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class InvoiceXMLTaskTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='nota@example.com', full_name='Cliente Nota', password='password123',
+        )
+        category = Category.objects.create(name='Notas')
+        cls.order = Order.objects.create(
+            user=user,
+            status=OrderStatus.ENTREGUE,
+            total=Decimal('0.01'),
+            shipping_address='Rua Nota, 1',
+            payment_method=PaymentMethod.PIX,
+        )
+        cls.order.add_items([
+            (Product.objects.create(
+                name=f'Item {i}', description='', price=Decimal('12.50'), stock=5, category=category,
+            ), i + 1)
+            for i in range(3)
+        ])
+
+    def create_invoice(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Invoid.objects.create(
+                order=self.order,
+                access_key='3' * 44,
+                number=1,
+                issue_at=timezone.now(),
+            )
+
+    def test_xml_generated_after_commit(self):
+        invoice = self.create_invoice()
+        invoice.refresh_from_db()
+
+        with invoice.xml_file.open('rb') as xml:
+            root = ElementTree.parse(xml).getroot()
+        items = root.findall('nfe:infNFe/nfe:det', NS)
+        self.assertEqual(len(items), 3)
+        self.assertEqual(root.find('nfe:infNFe/nfe:total/nfe:vNF', NS).text, '75.00')
+        self.assertEqual(root.find('nfe:infNFe/nfe:dest/nfe:xNome', NS).text, 'Cliente Nota')
+
+    def test_task_is_idempotent(self):
+        invoice = self.create_invoice()
+        invoice.refresh_from_db()
+        name = invoice.xml_file.name
+
+        self.assertIsNone(generate_invoice_xml.delay(invoice.pk).get())
+        self.assertIsNone(generate_invoice_xml.delay(0).get())
+
+        regenerated = generate_invoice_xml.delay(invoice.pk, force=True).get()
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.xml_file.name, regenerated)
+        self.assertTrue(invoice.xml_file.storage.exists(regenerated))
+        self.assertFalse(invoice.xml_file.storage.exists(name))
+
+
+class AccessKeyTest(TestCase):
+    def test_check_digit_matches_layout_example(self):
+        # Exemplo do Manual de Orientação do Contribuinte
+        self.assertEqual(check_digit('5206043300991100250655012000000780026730161'), 5)
+
+    def test_build_access_key(self):
+        key = build_access_key(
+            uf=52,
+            issued_at=timezone.datetime(2006, 4, 1),
+            cnpj='33.009.911/0025-06',
+            series=12,
+            number=780,
+            emission_type=0,
+            code=26730161,
+        )
+        self.assertEqual(key, '52060433009911002506550120000007800267301615')
+        self.assertTrue(is_valid_access_key(key))
+        self.assertFalse(is_valid_access_key(key[:-1] + '4'))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class InvoiceIssuanceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='lote@example.com', full_name='Cliente Lote', password='password123',
+        )
+        category = Category.objects.create(name='Lote')
+        product = Product.objects.create(
+            name='Item lote', description='', price=Decimal('10.00'), stock=50, category=category,
+        )
+        cls.orders = []
+        for status in [OrderStatus.ENTREGUE] * 3 + [OrderStatus.PENDENTE]:
+            order = Order.objects.create(
+                user=user,
+                status=status,
+                total=Decimal('0.01'),
+                shipping_address='Rua Lote, 2',
+                payment_method=PaymentMethod.PIX,
+            )
+            order.add_items([(product, 2)])
+            cls.orders.append(order)
+        Invoid.objects.create(
+            order=cls.orders[0], access_key='1' * 44, number=900, issue_at=timezone.now(),
+            status='canceled', xml_file='invoices/cancelada.xml',
+        )
+
+    def test_issues_one_invoice_per_pending_order(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            result = InvoiceIssuer(chunk_size=2, workers=0).run()
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual((result.issued, result.chunks), (3, 2))
+        invoices = Invoid.objects.exclude(status='canceled').order_by('number')
+        self.assertEqual([i.number for i in invoices], [1, 2, 3])
+        self.assertEqual({i.order_id for i in invoices}, {o.pk for o in self.orders[:3]})
+        for invoice in invoices:
+            self.assertTrue(is_valid_access_key(invoice.access_key))
+            with invoice.xml_file.open('rb') as xml:
+                root = ElementTree.parse(xml).getroot()
+            self.assertEqual(root.find('nfe:infNFe/nfe:total/nfe:vNF', NS).text, '20.00')
+            self.assertEqual(root.find('nfe:infNFe/nfe:ide/nfe:nNF', NS).text, str(invoice.number))
+
+        self.assertEqual(InvoiceIssuer(workers=0).run().issued, 0)
+
+    def test_process_pool_renders_the_same_documents(self):
+        result = InvoiceIssuer(workers=2).run()
+        self.assertEqual(result.issued, 3)
+        self.assertEqual(InvoiceSequence.objects.get(series=1).next_number, 4)
+        invoice = Invoid.objects.get(number=2)
+        with invoice.xml_file.open('rb') as xml:
+            root = ElementTree.parse(xml).getroot()
+        self.assertEqual(len(root.findall('nfe:infNFe/nfe:det', NS)), 1)
+
+    def test_command_warns_when_the_lock_is_process_local(self):
+        err = StringIO()
+        call_command('issue_invoices', '--workers', '0', stdout=StringIO(), stderr=err)
+        self.assertIn('REDIS_URL', err.getvalue())
+        self.assertEqual(Invoid.objects.exclude(status='canceled').count(), 3)
+
+    def test_blocks_are_not_reused(self):
+        self.assertEqual(list(lease_block(1, 3).numbers), [1, 2, 3])
+        self.assertEqual(list(lease_block(1, 2).numbers), [4, 5])
+        self.assertEqual(list(lease_block(2, 1).numbers), [1])
+
+
+class NumberAllocatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='numeracao@example.com', full_name='Numeração', password='password123',
+        )
+        cls.order = Order.objects.create(
+            user=user,
+            status=OrderStatus.ENTREGUE,
+            total=Decimal('1.00'),
+            shipping_address='Rua Número, 3',
+            payment_method=PaymentMethod.PIX,
+        )
+
+    def invoice(self, number):
+        Invoid.objects.bulk_create([Invoid(
+            order=self.order, access_key=f'{number:044d}', number=number, issue_at=timezone.now(),
+        )])
+
+    def test_hands_out_numbers_from_memory(self):
+        with NumberAllocator(series=1, block_size=3) as allocator:
+            numbers = [allocator.allocate() for _ in range(5)]
+            # Ainda há um número no bloco atual: nenhuma consulta
+            with self.assertNumQueries(0):
+                self.assertEqual(allocator.allocate(), 6)
+        self.assertEqual(numbers, [1, 2, 3, 4, 5])
+        self.assertEqual(allocator.leases, 2)
+        self.assertFalse(InvoiceNumberLease.objects.filter(closed_at__isnull=True).exists())
+
+    def test_unused_numbers_are_reported_as_gaps(self):
+        with NumberAllocator(series=1, block_size=4) as allocator:
+            for _ in range(6):
+                number = allocator.allocate()
+                if number not in (3, 5):
+                    self.invoice(number)
+        # Bloco aberto de outro emissor: ainda não é lacuna
+        lease_block(1, 10)
+
+        self.assertEqual(list(find_gaps()), [(1, 3), (1, 5), (1, 7), (1, 8)])
+        out = StringIO()
+        call_command('invoice_number_gaps', stdout=out)
+        self.assertIn("Série 1: 7 a 8", out.getvalue())
+        self.assertIn("4 número(s) sem nota", out.getvalue())
+
+
+class NumberAllocatorStressTest(TransactionTestCase):
+    """Emissores concorrentes, cada um com seu alocador, nunca repetem números"""
+
+    WORKERS = 8
+    NUMBERS = 50
+    BLOCK_SIZE = 10
+
+    def allocate_with_retry(self, allocator):
+        # SQLite serializa escritas; "database is locked" só significa tentar de novo
+        while True:
+            try:
+                return allocator.allocate()
+            except OperationalError:
+                time.sleep(0.001)
+
+    def test_numbers_are_unique_across_workers(self):
+        numbers = []
+        lock = threading.Lock()
+        start = threading.Barrier(self.WORKERS)
+
+        def worker():
+            allocator = NumberAllocator(series=1, block_size=self.BLOCK_SIZE)
+            try:
+                start.wait()
+                taken = [self.allocate_with_retry(allocator) for _ in range(self.NUMBERS)]
+                with lock:
+                    numbers.extend(taken)
+            finally:
+                close_old_connections()
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.WORKERS)]
+        began = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+        total = self.WORKERS * self.NUMBERS
+        self.assertEqual(len(numbers), total)
+        self.assertEqual(sorted(numbers), list(range(1, total + 1)))
+        self.assertEqual(InvoiceNumberLease.objects.count(), total // self.BLOCK_SIZE)
+        self.assertEqual(InvoiceSequence.objects.get(series=1).next_number, total + 1)
+        self.assertGreater(total / elapsed, 0)
+
+
+class PaymentReconciliationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='conciliacao@example.com', full_name='Conciliação', password='password123',
+        )
+        order = Order.objects.create(
+            user=user,
+            status=OrderStatus.PROCESSANDO,
+            total=Decimal('50.00'),
+            shipping_address='Rua Gateway, 4',
+            payment_method=PaymentMethod.PIX,
+        )
+        paid_at = timezone.make_aware(timezone.datetime(2026, 9, 30, 12))
+        Payment.objects.bulk_create([
+            Payment(order=order, method='pix', amount=Decimal('50.00'), transaction_id='tx-pending'),
+            Payment(order=order, method='pix', amount=Decimal('20.00'), transaction_id='tx-amount'),
+            Payment(
+                order=order, method='credit_card', status='approved', amount=Decimal('10.00'),
+                payment_date=paid_at, transaction_id='tx-ok',
+            ),
+            Payment(
+                order=order, method='boleto', status='approved', amount=Decimal('5.00'),
+                payment_date=paid_at, transaction_id='tx-missing',
+            ),
+        ])
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'liquidacao.csv')
+        with open(self.path, 'w', encoding='utf-8') as output:
+            output.write(
+                "transaction_id,status,amount,payment_date\n"
+                "tx-pending,approved,50.00,2026-09-30T08:00:00\n"
+                "tx-amount,approved,\"19,90\",2026-09-30T09:00:00\n"
+                "tx-ok,approved,10.00,2026-09-30T12:00:00\n"
+                "tx-unknown,approved,1.00,2026-09-30T13:00:00\n"
+                "tx-bad,talvez,1.00,2026-09-30\n"
+            )
+
+    def test_reconciles_in_bulk_and_reports_mismatches(self):
+        report = os.path.join(self.tmpdir.name, 'divergencias.csv')
+        # 1º bloco: in_bulk + bulk_update (com savepoint); 2º bloco: só o
+        # in_bulk, nada mudou; e a busca dos aprovados sem liquidação
+        with self.assertNumQueries(6):
+            call_command(
+                'reconcile_payments', self.path, '--chunk-size', '3', '--report', report, stdout=StringIO(),
+            )
+
+        pending = Payment.objects.get(transaction_id='tx-pending')
+        self.assertEqual(pending.status, 'approved')
+        self.assertEqual(timezone.localtime(pending.payment_date).hour, 8)
+        amount = Payment.objects.get(transaction_id='tx-amount')
+        self.assertEqual((amount.status, amount.amount), ('approved', Decimal('20.00')))
+
+        with open(report, encoding='utf-8') as output:
+            rows = [line.split(',')[:2] for line in output.read().splitlines()[1:]]
+        self.assertEqual(sorted(rows), [
+            ['amount_mismatch', 'tx-amount'],
+            ['invalid_row', 'tx-bad'],
+            ['missing_settlement', 'tx-missing'],
+            ['unknown_transaction', 'tx-unknown'],
+        ])
+
+    def test_dry_run_and_amount_updates(self):
+        call_command('reconcile_payments', self.path, '--dry-run', stdout=StringIO())
+        self.assertEqual(Payment.objects.get(transaction_id='tx-pending').status, 'pending')
+
+        call_command('reconcile_payments', self.path, '--update-amounts', stdout=StringIO())
+        self.assertEqual(Payment.objects.get(transaction_id='tx-amount').amount, Decimal('19.90'))
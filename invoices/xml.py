@@ -0,0 +1,127 @@
+"""
+Escrita incremental do XML da nota fiscal.
+
+O documento é escrito elemento a elemento num arquivo (ou qualquer objeto
+com write), lendo os itens do pedido com iterator(). Pedidos grandes não
+montam a árvore inteira em memória.
+
+O escritor trabalha sobre InvoiceDocument, só com dados simples: a emissão
+em lote (invoices.issuance) monta os documentos no processo principal e
+os serializa num pool de processos com render_invoice_xml(), que não toca
+no ORM. Por isso este módulo não importa models no carregamento.
+"""
+import io
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+from xml.sax.saxutils import XMLGenerator
+
+NFE_NAMESPACE = 'http://www.portalfiscal.inf.br/nfe'
+ITEMS_CHUNK_SIZE = 500
+CENTS = Decimal('0.01')
+
+
+def money(value):
+    return str(Decimal(value).quantize(CENTS))
+
+
+@dataclass
+class InvoiceDocument:
+    access_key: str
+    number: int
+    issue_at: datetime
+    name: str
+    email: str
+    address: str
+    # (product_id, nome, quantidade, preço unitário, subtotal)
+    items: Iterable[tuple]
+
+
+class InvoiceXMLWriter:
+    def __init__(self, out, encoding='utf-8'):
+        self._xml = XMLGenerator(out, encoding=encoding, short_empty_elements=True)
+        self._encoding = encoding
+
+    def start(self, name, **attrs):
+        self._xml.startElement(name, attrs)
+
+    def end(self, name):
+        self._xml.endElement(name)
+
+    def field(self, name, value):
+        self._xml.startElement(name, {})
+        self._xml.characters('' if value is None else str(value))
+        self._xml.endElement(name)
+
+    def write(self, document):
+        self._xml.startDocument()
+        self.start('NFe', xmlns=NFE_NAMESPACE)
+        self.start('infNFe', Id=f'NFe{document.access_key}', versao='4.00')
+
+        self.start('ide')
+        self.field('nNF', document.number)
+        self.field('dhEmi', document.issue_at.isoformat())
+        self.end('ide')
+
+        self.start('dest')
+        self.field('xNome', document.name)
+        self.field('email', document.email)
+        self.field('xEnder', document.address)
+        self.end('dest')
+
+        total = Decimal('0')
+        for number, (product_id, name, quantity, unit_price, subtotal) in enumerate(
+            document.items, start=1
+        ):
+            self.start('det', nItem=str(number))
+            self.start('prod')
+            self.field('cProd', product_id)
+            self.field('xProd', name)
+            self.field('qCom', quantity)
+            self.field('vUnCom', money(unit_price))
+            self.field('vProd', money(subtotal))
+            self.end('prod')
+            self.end('det')
+            total += subtotal
+
+        self.start('total')
+        self.field('vNF', money(total))
+        self.end('total')
+
+        self.end('infNFe')
+        self.end('NFe')
+        self._xml.endDocument()
+
+
+def invoice_document(invoice):
+    """Documento de uma nota salva, com os itens lidos em streaming"""
+    from orders.models import SUBTOTAL_EXPRESSION
+
+    order = invoice.order
+    items = (
+        order.items.order_by('created_at', 'id')
+        .annotate(subtotal=SUBTOTAL_EXPRESSION)
+        .values_list('product_id', 'product__name', 'quantity', 'unit_price', 'subtotal')
+    )
+    return InvoiceDocument(
+        access_key=invoice.access_key,
+        number=invoice.number,
+        issue_at=invoice.issue_at,
+        name=order.user.full_name,
+        email=order.user.email,
+        address=order.shipping_address,
+        items=items.iterator(chunk_size=ITEMS_CHUNK_SIZE),
+    )
+
+
+def write_invoice_xml(invoice, out):
+    """Escreve o XML de `invoice` em `out` (arquivo binário)"""
+    InvoiceXMLWriter(out).write(invoice_document(invoice))
+
+
+def render_invoice_xml(document):
+    """XML de um InvoiceDocument, em bytes. Roda nos processos do pool"""
+    out = io.BytesIO()
+    InvoiceXMLWriter(out).write(document)
+    return out.getvalue()
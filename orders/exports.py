@@ -0,0 +1,152 @@
+"""
+Exportação de pedidos em CSV ou JSONL sem carregar o queryset inteiro.
+
+Os pedidos são lidos com .iterator(chunk_size=...), que no PostgreSQL usa
+um cursor do lado do servidor; itens, pagamentos e notas são buscados com
+prefetch_related a cada bloco. As linhas são geradas uma a uma, então a
+memória usada não depende do número de pedidos.
+"""
+import csv
+import json
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Order
+
+EXPORT_CHUNK_SIZE = 2000
+FORMATS = ('csv', 'jsonl')
+
+CSV_COLUMNS = [
+    'order_id',
+    'order_data',
+    'status',
+    'payment_method',
+    'total',
+    'user_email',
+    'item_id',
+    'product_id',
+    'quantity',
+    'unit_price',
+    'subtotal',
+    'payments',
+    'invoices',
+]
+
+
+class _Echo:
+    """Objeto com write() que só devolve o valor, para o csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def export_queryset(start=None, end=None, statuses=None):
+    """Pedidos no período/status pedidos; usa os índices de order_data e status"""
+    queryset = Order.objects.all()
+    if start:
+        queryset = queryset.filter(order_data__gte=start)
+    if end:
+        queryset = queryset.filter(order_data__lte=end)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+    return (
+        queryset.select_related('user')
+        .only(
+            'order_data', 'status', 'payment_method', 'total',
+            'shipping_address', 'created_at', 'user__email',
+        )
+        .prefetch_related('items', 'payments', 'invoices')
+        .order_by('order_data', 'id')
+    )
+
+
+def iter_orders(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def order_to_dict(order):
+    return {
+        'id': order.id,
+        'order_data': order.order_data,
+        'status': order.status,
+        'payment_method': order.payment_method,
+        'total': order.total,
+        'shipping_address': order.shipping_address,
+        'created_at': order.created_at,
+        'user_email': order.user.email,
+        'items': [
+            {
+                'id': item.id,
+                'product_id': item.product_id,
+                'quantity': item.quantity,
+                'unit_price': item.unit_price,
+                'subtotal': item.subtotal,
+            }
+            for item in order.items.all()
+        ],
+        'payments': [
+            {
+                'transaction_id': payment.transaction_id,
+                'method': payment.method,
+                'status': payment.status,
+                'amount': payment.amount,
+                'payment_date': payment.payment_date,
+            }
+            for payment in order.payments.all()
+        ],
+        'invoices': [
+            {
+                'number': invoice.number,
+                'access_key': invoice.access_key,
+                'status': invoice.status,
+                'issue_at': invoice.issue_at,
+            }
+            for invoice in order.invoices.all()
+        ],
+    }
+
+
+def jsonl_lines(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Um pedido por linha, com itens, pagamentos e notas aninhados"""
+    for order in iter_orders(queryset, chunk_size):
+        yield json.dumps(order_to_dict(order), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def csv_lines(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Uma linha por item de pedido; pagamentos e notas resumidos em colunas"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for order in iter_orders(queryset, chunk_size):
+        payments = ';'.join(
+            f'{payment.transaction_id}:{payment.status}:{payment.amount}'
+            for payment in order.payments.all()
+        )
+        invoices = ';'.join(str(invoice.number) for invoice in order.invoices.all())
+        head = [
+            order.id,
+            _isoformat(order.order_data),
+            order.status,
+            order.payment_method,
+            order.total,
+            order.user.email,
+        ]
+        items = order.items.all() or [None]
+        for item in items:
+            if item is None:
+                item_columns = ['', '', '', '', '']
+            else:
+                item_columns = [item.id, item.product_id, item.quantity, item.unit_price, item.subtotal]
+            yield writer.writerow(head + item_columns + [payments, invoices])
+
+
+def export_lines(export_format, queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    if export_format == 'csv':
+        return csv_lines(queryset, chunk_size)
+    if export_format == 'jsonl':
+        return jsonl_lines(queryset, chunk_size)
+    raise ValueError(f"Formato de exportação desconhecido: {export_format}")
+
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, date) else value
@@ -0,0 +1,97 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from orders.models import Order, OrderItem, OrderStatus, PaymentMethod
+from products.models import Category, Product
+
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Compara a montagem de pedidos item a item (OrderItem.save) com a
+    montagem em lote (Order.add_items), contando escritas e tempo.
+    Todos os dados são criados dentro de uma transação desfeita ao final.
+    """
+
+    help = "Benchmark de recálculo de total de pedidos (item a item x em lote)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            nargs='+',
+            type=int,
+            default=[1, 10, 100, 1000],
+            help="Quantidade de itens por pedido",
+        )
+
+    def handle(self, *args, **options):
+        sizes = options['sizes']
+        try:
+            with transaction.atomic():
+                products = self._create_products(max(sizes))
+                user = get_user_model().objects.create_user(
+                    email='benchmark@example.com',
+                    full_name='Benchmark',
+                )
+                self.stdout.write(
+                    f"{'itens':>6} {'modo':<10} {'queries':>8} {'escritas':>9} {'tempo (ms)':>11}"
+                )
+                for size in sizes:
+                    for mode in ('item_save', 'add_items'):
+                        queries, writes, elapsed = self._run(mode, user, products[:size])
+                        self.stdout.write(
+                            f"{size:>6} {mode:<10} {queries:>8} {writes:>9} {elapsed * 1000:>11.1f}"
+                        )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _create_products(self, count):
+        category = Category.objects.create(name='Benchmark')
+        return Product.objects.bulk_create(
+            Product(
+                name=f'Benchmark {i}',
+                description='',
+                price=Decimal('9.90'),
+                stock=10,
+                category=category,
+            )
+            for i in range(count)
+        )
+
+    def _run(self, mode, user, products):
+        order = Order.objects.create(
+            user=user,
+            status=OrderStatus.PENDENTE,
+            total=Decimal('0.01'),
+            shipping_address='Benchmark',
+            payment_method=PaymentMethod.PIX,
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            if mode == 'item_save':
+                for product in products:
+                    OrderItem.objects.create(
+                        order=order,
+                        product=product,
+                        quantity=1,
+                        unit_price=product.price,
+                    )
+            else:
+                order.add_items((product, 1) for product in products)
+            elapsed = time.perf_counter() - start
+        writes = sum(
+            1 for query in ctx.captured_queries
+            if query['sql'].lstrip().upper().startswith(WRITE_PREFIXES)
+        )
+        return len(ctx.captured_queries), writes, elapsed
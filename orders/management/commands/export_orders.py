@@ -0,0 +1,41 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.exports import EXPORT_CHUNK_SIZE, FORMATS, export_lines, export_queryset
+from orders.models import OrderStatus
+
+
+class Command(BaseCommand):
+    """
+    Exporta pedidos com itens, pagamentos e notas fiscais em CSV ou JSONL,
+    escrevendo linha a linha.
+    """
+
+    help = "Exporta pedidos para contabilidade (CSV ou JSONL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--start', type=date.fromisoformat, help="AAAA-MM-DD")
+        parser.add_argument('--end', type=date.fromisoformat, help="AAAA-MM-DD")
+        parser.add_argument(
+            '--status',
+            action='append',
+            choices=OrderStatus.values,
+            help="Pode ser repetido",
+        )
+        parser.add_argument('--output', help="Arquivo de saída (padrão: stdout)")
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['start'] and options['end'] and options['start'] > options['end']:
+            raise CommandError("--start deve ser anterior a --end")
+
+        queryset = export_queryset(options['start'], options['end'], options['status'])
+        lines = export_lines(options['format'], queryset, options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
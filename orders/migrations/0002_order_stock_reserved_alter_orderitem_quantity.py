@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:10
+
+import django.core.validators
+import orders.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='stock_reserved',
+            field=models.BooleanField(default=False, help_text='Indica se o estoque dos itens já foi reservado', verbose_name='Estoque reservado'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='quantity',
+            field=orders.models.StrictPositiveIntegerField(help_text='Quantidade de produto no pedido', validators=[django.core.validators.MinValueValidator(1)], verbose_name='Quantidade'),
+        ),
+    ]
@@ -1,14 +1,27 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from django.core.exceptions import ValidationError
 from numbers import Integral
-from django.db import models
+from django.db import models, transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from decimal import Decimal
 import uuid
 
+from products import inventory
 from products.models import Product
 
+# Pedidos cujo total está sendo recalculado em lote (ver Order.deferred_total)
+_deferred_orders = ContextVar('deferred_orders', default=frozenset())
+
+SUBTOTAL_EXPRESSION = ExpressionWrapper(
+    F('quantity') * F('unit_price'),
+    output_field=DecimalField(max_digits=12, decimal_places=2),
+)
+
 class OrderStatus(models.TextChoices):
     """Choices para status do pedido usando TextChoices (Django 3..+)"""
     PENDENTE = 'pendente', 'Pendente'
@@ -80,6 +93,13 @@ class Order(models.Model):
         help_text="Método de pagamento utilizado"
     )
     
+    # Estoque dos itens já baixado (products.inventory)
+    stock_reserved = models.BooleanField(
+        default=False,
+        verbose_name="Estoque reservado",
+        help_text="Indica se o estoque dos itens já foi reservado"
+    )
+    
     # Campos de auditoria
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -113,13 +133,155 @@ class Order(models.Model):
         return self.status in [OrderStatus.PENDENTE, OrderStatus.PROCESSANDO]
     
     def cancel(self):
-        """Cancela o pedido se possível"""
+        """Cancela o pedido se possível, devolvendo o estoque reservado"""
         if self.pode_cancelar:
-            self.status = OrderStatus.CANCELADO
-            self.save()
+            with transaction.atomic():
+                self.release_stock()
+                self.status = OrderStatus.CANCELADO
+                self.save()
+    
+    def reserve_stock(self):
+        """
+        Reserva o estoque de todos os itens com um único UPDATE condicional.
+        Idempotente; levanta products.inventory.InsufficientStock se faltar saldo.
+        """
+        with transaction.atomic():
+            claimed = Order.objects.filter(pk=self.pk, stock_reserved=False).update(stock_reserved=True)
+            if claimed:
+                inventory.reserve(self.items.values_list('product_id', 'quantity'))
+        self.stock_reserved = True
+    
+    def release_stock(self):
+        """Devolve o estoque reservado, se houver"""
+        with transaction.atomic():
+            released = Order.objects.filter(pk=self.pk, stock_reserved=True).update(stock_reserved=False)
+            if released:
+                inventory.release(self.items.values_list('product_id', 'quantity'))
+        self.stock_reserved = False
+
+    def _stock_is_reserved(self):
+        """
+        Lê a flag no banco, travando o pedido: o objeto em memória pode estar
+        desatualizado. Chamar dentro da transação que altera os itens.
+        """
+        reserved = (
+            Order.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values_list('stock_reserved', flat=True)
+            .first()
+        )
+        self.stock_reserved = bool(reserved)
+        return self.stock_reserved
             
     def calculate_total(self):
-        return sum(item.subtotal for item in self.items.all())
+        """Soma os subtotais dos itens com um único SUM no banco"""
+        return self.items.aggregate(
+            total=Coalesce(
+                Sum(SUBTOTAL_EXPRESSION),
+                Decimal('0.00'),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            )
+        )['total']
+
+    def recalculate_total(self):
+        """
+        Recalcula o total e grava apenas as colunas total/updated_at,
+        sem passar pelo save() completo do pedido.
+        """
+        if self.pk in _deferred_orders.get():
+            return self.total
+        self.total = self.calculate_total()
+        self.updated_at = timezone.now()
+        Order.objects.filter(pk=self.pk).update(
+            total=self.total,
+            updated_at=self.updated_at,
+        )
+        return self.total
+
+    @contextmanager
+    def deferred_total(self):
+        """
+        Adia o recálculo do total enquanto os itens são alterados.
+
+        Dentro do bloco, OrderItem.save() e OrderItem.delete() não tocam no
+        pedido; ao sair, o total é recalculado uma única vez.
+        """
+        deferred = _deferred_orders.get()
+        if self.pk in deferred:
+            yield self
+            return
+        with transaction.atomic():
+            token = _deferred_orders.set(deferred | {self.pk})
+            try:
+                yield self
+            finally:
+                _deferred_orders.reset(token)
+            self.recalculate_total()
+
+    def add_items(self, items):
+        """
+        Insere vários itens com um único bulk_create e recalcula o total uma vez.
+
+        `items` é um iterável de tuplas (product, quantity) ou
+        (product, quantity, unit_price). Sem unit_price, usa o preço atual
+        do produto.
+        """
+        order_items = []
+        for item in items:
+            product, quantity, *rest = item
+            unit_price = rest[0] if rest else product.price
+            order_items.append(
+                OrderItem(
+                    order=self,
+                    product=product,
+                    quantity=quantity,
+                    unit_price=unit_price,
+                )
+            )
+        with transaction.atomic():
+            if self._stock_is_reserved():
+                inventory.reserve((item.product_id, item.quantity) for item in order_items)
+            created = OrderItem.objects.bulk_create(order_items)
+            self.recalculate_total()
+        return created
+
+    def update_quantities(self, quantities):
+        """
+        Altera a quantidade de vários itens (mapa product_id -> quantidade)
+        com um bulk_update e recalcula o total uma vez. Com estoque
+        reservado, a reserva acompanha a diferença de cada item.
+        """
+        with transaction.atomic():
+            items = list(self.items.filter(product_id__in=quantities.keys()))
+            now = timezone.now()
+            more, less = [], []
+            for item in items:
+                delta = quantities[item.product_id] - item.quantity
+                if delta > 0:
+                    more.append((item.product_id, delta))
+                elif delta < 0:
+                    less.append((item.product_id, -delta))
+                item.quantity = quantities[item.product_id]
+                item.updated_at = now
+            if (more or less) and self._stock_is_reserved():
+                inventory.release(less)
+                inventory.reserve(more)
+            OrderItem.objects.bulk_update(items, ['quantity', 'updated_at'])
+            self.recalculate_total()
+        return items
+
+    def remove_items(self, product_ids):
+        """
+        Remove os itens dos produtos informados e recalcula o total uma vez,
+        devolvendo ao estoque o que estava reservado para eles.
+        """
+        with transaction.atomic():
+            items = self.items.filter(product_id__in=product_ids)
+            if self._stock_is_reserved():
+                inventory.release(items.values_list('product_id', 'quantity'))
+            deleted, _ = items.delete()
+            self.recalculate_total()
+        return deleted
     
 class StrictPositiveIntegerField(models.PositiveIntegerField):
     def to_python(self, value):
@@ -205,10 +367,36 @@ class OrderItem(models.Model):
         return self.quantity * self.unit_price
     
     def save(self, *args, **kwargs):
-        """Override save to update order total when item changes"""
-        super().save(*args, **kwargs)
-        
-        # Optionally update order total automatically
-        self.order.total = self.order.calculate_total()
-        self.order.save()
-        
\ No newline at end of file
+        """Override save to update order total (and reserved stock) when item changes"""
+        with transaction.atomic():
+            if self.order._stock_is_reserved():
+                # Mesma regra de update_quantities: a reserva segue a diferença
+                stored = self._stored()
+                if stored is None:
+                    inventory.reserve([(self.product_id, self.quantity)])
+                elif stored[0] != self.product_id:
+                    inventory.release([stored])
+                    inventory.reserve([(self.product_id, self.quantity)])
+                elif self.quantity > stored[1]:
+                    inventory.reserve([(self.product_id, self.quantity - stored[1])])
+                elif self.quantity < stored[1]:
+                    inventory.release([(self.product_id, stored[1] - self.quantity)])
+            super().save(*args, **kwargs)
+
+            # Skipped while the order is inside Order.deferred_total()
+            self.order.recalculate_total()
+
+    def delete(self, *args, **kwargs):
+        """Override delete to keep the order total (and reserved stock) in sync"""
+        with transaction.atomic():
+            if self.order._stock_is_reserved():
+                stored = self._stored()
+                if stored is not None:
+                    inventory.release([stored])
+            result = super().delete(*args, **kwargs)
+            self.order.recalculate_total()
+        return result
+
+    def _stored(self):
+        """(product_id, quantity) gravados no banco, ou None se o item é novo"""
+        return OrderItem.objects.filter(pk=self.pk).values_list('product_id', 'quantity').first()
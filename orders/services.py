@@ -0,0 +1,94 @@
+"""
+Criação de pedidos.
+
+checkout() monta o pedido inteiro numa transação com um número fixo de
+consultas, qualquer que seja o tamanho do carrinho: uma leitura dos
+produtos (in_bulk), o INSERT do pedido, o UPDATE condicional do estoque
+(products.inventory), um bulk_create dos itens e o INSERT do pagamento.
+"""
+import uuid
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from invoices.models import Payment
+from products import inventory
+from products.models import Product
+
+from .models import Order, OrderItem, OrderStatus, PaymentMethod
+
+# Order.payment_method -> Payment.method
+PAYMENT_METHODS = {
+    PaymentMethod.CARTAO_CREDITO: 'credit_card',
+    PaymentMethod.CARTAO_DEBITO: 'debit_card',
+    PaymentMethod.BOLETO: 'boleto',
+    PaymentMethod.PIX: 'pix',
+    PaymentMethod.DINHEIRO: 'cash',
+}
+
+
+def _cart_quantities(cart):
+    """{product_id: quantidade} a partir de um mapa ou de pares, somando repetidos"""
+    if hasattr(cart, 'items'):
+        cart = cart.items()
+    quantities = {}
+    for product_id, quantity in cart:
+        if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 1:
+            raise ValidationError(f"Quantidade inválida para o produto {product_id}")
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    if not quantities:
+        raise ValidationError("O carrinho está vazio")
+    return quantities
+
+
+def checkout(user, cart, shipping_address, payment_method):
+    """
+    Cria o pedido, os itens, a reserva de estoque e o pagamento pendente.
+
+    `cart` é {product_id: quantidade} (ou pares product_id, quantidade).
+    Os preços vêm do banco, não de quem chama. Levanta ValidationError para
+    carrinho ou produtos inválidos e products.inventory.InsufficientStock
+    quando falta estoque; em ambos os casos nada é gravado.
+    """
+    if payment_method not in PAYMENT_METHODS:
+        raise ValidationError(f"Método de pagamento inválido: {payment_method}")
+    if not shipping_address or not shipping_address.strip():
+        raise ValidationError("Endereço de entrega obrigatório")
+    quantities = _cart_quantities(cart)
+
+    products = Product.objects.filter(is_active=True).only('price').in_bulk(quantities)
+    missing = sorted(set(quantities) - set(products))
+    if missing:
+        raise ValidationError(f"Produtos indisponíveis: {missing}")
+
+    total = sum(
+        (products[product_id].price * quantity for product_id, quantity in quantities.items()),
+        Decimal('0'),
+    )
+    with transaction.atomic():
+        order = Order.objects.create(
+            user=user,
+            status=OrderStatus.PENDENTE,
+            total=total,
+            shipping_address=shipping_address,
+            payment_method=payment_method,
+            stock_reserved=True,
+        )
+        inventory.reserve(quantities)
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                product_id=product_id,
+                quantity=quantity,
+                unit_price=products[product_id].price,
+            )
+            for product_id, quantity in quantities.items()
+        ])
+        Payment.objects.create(
+            order=order,
+            method=PAYMENT_METHODS[payment_method],
+            amount=total,
+            transaction_id=uuid.uuid4().hex,
+        )
+    return order
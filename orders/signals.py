@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from products.models import Product
+
+from .models import OrderItem
+from .tasks import recalculate_order_total
+
+
+@receiver(pre_delete, sender=Product)
+def recalculate_totals_of_product_orders(sender, instance, **kwargs):
+    # O CASCADE apaga os itens em lote, sem OrderItem.delete(); um produto
+    # pode estar em milhares de pedidos, então o recálculo vai para o Celery
+    order_ids = list(OrderItem.objects.filter(product=instance).values_list('order_id', flat=True))
+    for order_id in order_ids:
+        transaction.on_commit(lambda order_id=order_id: recalculate_order_total.delay(order_id))
@@ -0,0 +1,16 @@
+from celery import shared_task
+from django.db import OperationalError
+
+from .models import Order
+
+
+@shared_task(autoretry_for=(OperationalError,), retry_backoff=True, max_retries=5)
+def recalculate_order_total(order_id):
+    """
+    Recalcula o total de um pedido a partir dos itens. Idempotente: o
+    total é sempre a soma atual, então reexecuções não o alteram.
+    """
+    order = Order.objects.filter(pk=order_id).first()
+    if order is None:
+        return None
+    return str(order.recalculate_total())
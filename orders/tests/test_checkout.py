@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from invoices.models import Payment
+from orders.models import Order, PaymentMethod
+from orders.services import checkout
+from products.inventory import InsufficientStock
+from products.models import Category, Product
+
+User = get_user_model()
+
+
+class CheckoutTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='checkout@example.com', full_name='Checkout', password='password123',
+        )
+        cls.category = Category.objects.create(name='Checkout')
+        cls.products = [
+            Product.objects.create(
+                name=f'Produto {i}', description='', price=Decimal('10.00') + i,
+                stock=5, category=cls.category,
+            )
+            for i in range(20)
+        ]
+
+    def checkout(self, cart, method=PaymentMethod.PIX):
+        return checkout(self.user, cart, 'Rua Checkout, 1', method)
+
+    def test_creates_order_items_and_payment(self):
+        first, second = self.products[:2]
+        order = self.checkout({first.pk: 2, second.pk: 1})
+
+        order.refresh_from_db()
+        self.assertEqual(order.total, Decimal('31.00'))
+        self.assertTrue(order.stock_reserved)
+        self.assertEqual(order.items.count(), 2)
+        payment = Payment.objects.get(order=order)
+        self.assertEqual((payment.method, payment.amount, payment.status), ('pix', order.total, 'pending'))
+        self.assertEqual(
+            list(Product.objects.filter(pk__in=[first.pk, second.pk]).order_by('pk').values_list('stock', flat=True)),
+            [3, 4],
+        )
+
+    def test_query_count_does_not_depend_on_cart_size(self):
+        with CaptureQueriesContext(connection) as small:
+            self.checkout({self.products[0].pk: 1})
+        with CaptureQueriesContext(connection) as large:
+            self.checkout({product.pk: 1 for product in self.products})
+        self.assertEqual(len(small), len(large))
+
+    def test_repeated_products_are_merged(self):
+        product = self.products[0]
+        order = self.checkout([(product.pk, 1), (product.pk, 2)])
+        self.assertEqual(order.items.get().quantity, 3)
+
+    def test_insufficient_stock_writes_nothing(self):
+        with self.assertRaises(InsufficientStock):
+            self.checkout({self.products[0].pk: 1, self.products[1].pk: 6})
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(Payment.objects.exists())
+        self.assertEqual(Product.objects.get(pk=self.products[0].pk).stock, 5)
+
+    def test_invalid_carts(self):
+        inactive = self.products[2]
+        inactive.is_active = False
+        inactive.save()
+        for cart in ({}, {self.products[0].pk: 0}, {inactive.pk: 1}, {999999: 1}):
+            with self.subTest(cart=cart), self.assertRaises(ValidationError):
+                self.checkout(cart)
+        with self.assertRaises(ValidationError):
+            self.checkout({self.products[0].pk: 1}, method='cheque')
+        self.assertFalse(Order.objects.exists())
@@ -0,0 +1,97 @@
+import csv
+import json
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from invoices.models import Payment
+from orders.models import Order, OrderStatus, PaymentMethod
+from products.models import Category, Product
+
+User = get_user_model()
+
+
+class OrderExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='cliente@example.com',
+            full_name='Cliente',
+            password='password123',
+        )
+        cls.staff = User.objects.create_user(
+            email='staff@example.com',
+            full_name='Staff',
+            password='password123',
+            is_staff=True,
+        )
+        category = Category.objects.create(name='Exportação')
+        cls.products = [
+            Product.objects.create(
+                name=f'Produto {i}', description='', price=Decimal('10.00'), stock=5, category=category,
+            )
+            for i in range(2)
+        ]
+        cls.january = cls.create_order(date(2025, 1, 10), OrderStatus.ENTREGUE)
+        cls.february = cls.create_order(date(2025, 2, 10), OrderStatus.CANCELADO)
+        Payment.objects.create(
+            order=cls.january, method='pix', status='approved', amount=Decimal('20.00'), transaction_id='tx-1',
+        )
+
+    @classmethod
+    def create_order(cls, day, status):
+        order = Order.objects.create(
+            user=cls.user,
+            order_data=day,
+            status=status,
+            total=Decimal('0.01'),
+            shipping_address='Rua Export, 1',
+            payment_method=PaymentMethod.PIX,
+        )
+        order.add_items((product, 1) for product in cls.products)
+        return order
+
+    def test_command_jsonl_with_filters(self):
+        out = StringIO()
+        call_command('export_orders', '--format', 'jsonl', '--start', '2025-01-01', '--end', '2025-01-31', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        order = json.loads(lines[0])
+        self.assertEqual(order['id'], str(self.january.id))
+        self.assertEqual(len(order['items']), 2)
+        self.assertEqual(order['payments'][0]['transaction_id'], 'tx-1')
+
+    def test_command_csv_one_row_per_item(self):
+        out = StringIO()
+        call_command('export_orders', '--status', OrderStatus.CANCELADO, stdout=out)
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual({row['order_id'] for row in rows}, {str(self.february.id)})
+
+    def test_export_query_count_does_not_depend_on_rows(self):
+        # pedidos (com join de usuário), itens, pagamentos e notas, por bloco
+        with self.assertNumQueries(4):
+            call_command('export_orders', '--format', 'jsonl', stdout=StringIO())
+
+    def test_view_streams_for_staff(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('export_orders'), {'format': 'jsonl', 'status': OrderStatus.ENTREGUE})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(body.splitlines()), 1)
+
+    def test_view_requires_staff(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('export_orders'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_view_rejects_invalid_filters(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('export_orders'), {'start': 'ontem'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,115 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from orders.models import Order, OrderItem, OrderStatus, PaymentMethod
+from products.models import Category, Product
+
+User = get_user_model()
+
+
+class OrderTotalBatchTest(TestCase):
+    """Recalculo do total em lote (add_items / deferred_total)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='batch@example.com',
+            full_name='Batch User',
+            password='password123',
+        )
+        cls.category = Category.objects.create(name='Lote')
+        cls.products = [
+            Product.objects.create(
+                name=f'Produto {i}',
+                description='',
+                price=Decimal('10.00') + i,
+                stock=10,
+                category=cls.category,
+            )
+            for i in range(20)
+        ]
+
+    def setUp(self):
+        self.order = Order.objects.create(
+            user=self.user,
+            status=OrderStatus.PENDENTE,
+            total=Decimal('0.01'),
+            shipping_address='Rua Lote, 1',
+            payment_method=PaymentMethod.PIX,
+        )
+
+    def test_add_items_sets_total(self):
+        self.order.add_items([(self.products[0], 2), (self.products[1], 1, Decimal('5.00'))])
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal('25.00'))
+        self.assertEqual(self.order.items.count(), 2)
+
+    def test_deleting_a_product_recalculates_its_orders(self):
+        self.order.add_items([(self.products[0], 2), (self.products[1], 1)])
+        other = Order.objects.create(
+            user=self.user,
+            status=OrderStatus.PENDENTE,
+            total=Decimal('0.01'),
+            shipping_address='Rua Lote, 2',
+            payment_method=PaymentMethod.PIX,
+        )
+        other.add_items([(self.products[0], 1)])
+
+        # Celery roda em modo eager nos testes (REDIS_URL não definido)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.products[0].delete()
+        self.assertEqual(len(callbacks), 2)
+
+        self.order.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal('11.00'))
+        self.assertEqual(other.total, Decimal('0.00'))
+
+    def test_add_items_query_count_is_constant(self):
+        # savepoint, flag de reserva, bulk_create, SUM + UPDATE do total, release
+        with self.assertNumQueries(6):
+            self.order.add_items((product, 1) for product in self.products[:2])
+
+        other = Order.objects.create(
+            user=self.user,
+            status=OrderStatus.PENDENTE,
+            total=Decimal('0.01'),
+            shipping_address='Rua Lote, 2',
+            payment_method=PaymentMethod.PIX,
+        )
+        with self.assertNumQueries(6):
+            other.add_items((product, 1) for product in self.products)
+
+    def test_deferred_total_recalculates_once(self):
+        with self.order.deferred_total():
+            for product in self.products[:3]:
+                OrderItem.objects.create(
+                    order=self.order,
+                    product=product,
+                    quantity=1,
+                    unit_price=product.price,
+                )
+            self.order.refresh_from_db()
+            self.assertEqual(self.order.total, Decimal('0.01'))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal('33.00'))
+
+    def test_update_quantities(self):
+        self.order.add_items([(self.products[0], 1), (self.products[1], 1)])
+        self.order.update_quantities({self.products[0].id: 3})
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal('41.00'))
+
+    def test_remove_items(self):
+        self.order.add_items([(self.products[0], 1), (self.products[1], 1)])
+        self.assertEqual(self.order.remove_items([self.products[1].id]), 1)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal('10.00'))
+
+    def test_item_delete_updates_total(self):
+        item, _ = self.order.add_items([(self.products[0], 1), (self.products[1], 1)])
+        item.delete()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total, Decimal('11.00'))
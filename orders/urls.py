@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('export/', views.export_orders, name='export_orders'),
+]
@@ -1,3 +1,48 @@
-from django.shortcuts import render
+from datetime import date
 
-# Create your views here.
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import BadRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from .exports import FORMATS, export_lines, export_queryset
+from .models import OrderStatus
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"Data inválida: {value}")
+
+
+@staff_member_required
+@require_GET
+def export_orders(request):
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in FORMATS:
+        raise BadRequest(f"Formato inválido: {export_format}")
+    statuses = request.GET.getlist('status')
+    if any(status not in OrderStatus.values for status in statuses):
+        raise BadRequest("Status inválido")
+
+    queryset = export_queryset(
+        _parse_date(request.GET.get('start')),
+        _parse_date(request.GET.get('end')),
+        statuses,
+    )
+    response = StreamingHttpResponse(
+        export_lines(export_format, queryset),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    filename = f"pedidos-{timezone.localdate():%Y%m%d}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,18 @@
+"""
+Aplicação Celery do projeto.
+
+    celery -A petstore worker --loglevel=info
+    celery -A petstore beat --loglevel=info
+
+A configuração vem das settings com prefixo CELERY_; as tarefas ficam em
+<app>/tasks.py e são descobertas automaticamente.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'petstore.settings')
+
+app = Celery('petstore')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
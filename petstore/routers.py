@@ -0,0 +1,65 @@
+"""
+Roteamento opcional de leituras para a réplica.
+
+Por padrão tudo vai para 'default'. Views que toleram um pequeno atraso de
+replicação (listagem de produtos, página de categoria) são marcadas com
+@replica_reads; dentro delas as leituras vão para o alias 'replica', se
+ele estiver configurado (DATABASE_REPLICA_URL).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+import inspect
+
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+@contextmanager
+def read_from_replica():
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def replica_reads(view):
+    """Decorator para views (sync ou async) cujas leituras podem ir para a réplica"""
+    if inspect.iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            with read_from_replica():
+                return await view(*args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with read_from_replica():
+                return view(*args, **kwargs)
+    return wrapper
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # A réplica tem os mesmos dados que o default
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
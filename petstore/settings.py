@@ -12,20 +12,27 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 
 from pathlib import Path
 
+import environ
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+env = environ.Env()
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-0t1^g#gweu-1@1ni)9ico+^^tlfu!bg3fmfs#ton*n4a4pz*g@'
+SECRET_KEY = env(
+    'SECRET_KEY',
+    default='django-insecure-0t1^g#gweu-1@1ni)9ico+^^tlfu!bg3fmfs#ton*n4a4pz*g@',
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env.bool('DEBUG', default=True)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = env.list('ALLOWED_HOSTS', default=[])
 
 
 # Application definition
@@ -43,6 +50,12 @@ INSTALLED_APPS = [
     'orders',
     'accounts',
     'invoices',
+    'reviews',
+    'reports',
+    'search',
+    'core',
+    'api',
+    'cart',
 ]
 
 MIDDLEWARE = [
@@ -79,12 +92,64 @@ WSGI_APPLICATION = 'petstore.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
+# DATABASE_URL (docker-compose/CI) ou SQLite local. Conexões persistentes
+# com verificação de saúde; no PostgreSQL com psycopg 3, DATABASE_POOL=True
+# usa o pool de conexões do driver no lugar delas.
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': env.db('DATABASE_URL', default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
 }
+DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=60)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+if env.bool('DATABASE_POOL', default=False) and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # O pool não convive com conexões persistentes
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': env.int('DATABASE_POOL_MIN_SIZE', default=2),
+        'max_size': env.int('DATABASE_POOL_MAX_SIZE', default=10),
+        'timeout': env.int('DATABASE_POOL_TIMEOUT', default=10),
+    }
+
+# Réplica de leitura opcional; só as views marcadas com
+# petstore.routers.replica_reads leem dela
+if env('DATABASE_REPLICA_URL', default=None):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        **env.db('DATABASE_REPLICA_URL'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['petstore.routers.ReadReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# Redis quando REDIS_URL estiver definido (docker-compose), memória local
+# no desenvolvimento e nos testes.
+
+REDIS_URL = env('REDIS_URL', default=None)
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Tempo (segundos) das páginas de catálogo em cache
+CATALOG_CACHE_TIMEOUT = 60 * 15
+
+# Margem (segundos) da marca d'água dos rollups de vendas; deve cobrir a
+# transação mais longa que grava pedidos
+SALES_ROLLUP_MARGIN = 60 * 10
 
 
 # Password validation
@@ -125,6 +190,34 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Celery
+# https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
+# Broker no Redis (docker-compose). Sem REDIS_URL as tarefas rodam na
+# própria thread (desenvolvimento e testes). As tarefas são idempotentes,
+# então só confirmam a mensagem depois de executadas.
+
+CELERY_BROKER_URL = env('CELERY_BROKER_URL', default=REDIS_URL or 'memory://')
+CELERY_TASK_ALWAYS_EAGER = env.bool('CELERY_TASK_ALWAYS_EAGER', default=not REDIS_URL)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'flush-review-counters': {
+        'task': 'reviews.tasks.flush_review_counters',
+        'schedule': 30.0,
+    },
+}
+
+# NF-e
+# Emitente usado na chave de acesso das notas (invoices.access_key)
+
+NFE_UF = env.int('NFE_UF', default=35)
+NFE_CNPJ = env('NFE_CNPJ', default='00000000000191')
+NFE_SERIES = env.int('NFE_SERIES', default=1)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 
@@ -0,0 +1,44 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from petstore import routers
+from products.models import Product
+
+
+class ReadReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.ReadReplicaRouter()
+
+    def test_reads_go_to_default_outside_marked_views(self):
+        with mock.patch.object(routers, 'replica_configured', return_value=True):
+            self.assertIsNone(self.router.db_for_read(Product))
+
+    def test_marked_reads_go_to_replica_when_configured(self):
+        with mock.patch.object(routers, 'replica_configured', return_value=True):
+            with routers.read_from_replica():
+                self.assertEqual(self.router.db_for_read(Product), 'replica')
+                self.assertIsNone(self.router.db_for_write(Product))
+            self.assertIsNone(self.router.db_for_read(Product))
+
+    def test_marked_reads_fall_back_without_replica(self):
+        with routers.read_from_replica():
+            self.assertIsNone(self.router.db_for_read(Product))
+
+    def test_decorator_supports_sync_and_async_views(self):
+        @routers.replica_reads
+        def sync_view(request):
+            return routers._use_replica.get()
+
+        @routers.replica_reads
+        async def async_view(request):
+            return routers._use_replica.get()
+
+        self.assertTrue(sync_view(None))
+        self.assertTrue(asyncio.run(async_view(None)))
+        self.assertFalse(routers._use_replica.get())
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica', 'products'))
+        self.assertIsNone(self.router.allow_migrate('default', 'products'))
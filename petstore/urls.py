@@ -8,6 +8,11 @@ urlpatterns = [
     path('', include("home.urls")),
     path('list_products/', include('products.urls')),
     path('categories/', include('category.urls')),
+    path('orders/', include('orders.urls')),
+    path('search/', include('search.urls')),
+    path('api/', include('api.urls')),
+    path('cart/', include('cart.urls')),
+    path('reviews/', include('reviews.urls')),
 ]
 
 if settings.DEBUG:
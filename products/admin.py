@@ -1,9 +1,12 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
-from .models import Product, Category
+from . import cache as catalog_cache
+from .models import Product, Category, products_changed
+from .pagination import EstimatedCountPaginator
 
 
 @admin.register(Product)
@@ -29,15 +32,19 @@ class ProductAdmin(admin.ModelAdmin):
         'stock',
         'is_active'
     )
+    # Prefixo do nome: usa o índice UPPER(name) (migração 0008) em vez de
+    # varrer a tabela com icontains na descrição
     search_fields = (
-        'name',
-        'description',
-        'sku',  # Se existir
+        '^name',
     )
     readonly_fields = ('created_at', 'updated_at')
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
     list_per_page = 25
+    list_select_related = ('category',)
+    # Tabelas grandes: sem COUNT(*) extra e com total estimado no PostgreSQL
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     
     fieldsets = (
         ('Informações Básicas', {
@@ -80,19 +87,24 @@ class ProductAdmin(admin.ModelAdmin):
     
     def category_link(self, obj):
         if obj.category:
-            url = reverse('admin:products_category_change', args=[obj.category.pk])
+            url = reverse('admin:products_category_change', args=[obj.category_id])
             return format_html('<a href="{}">{}</a>', url, obj.category.name)
         return "-"
     category_link.short_description = "Categoria"
     
     def is_active_icon(self, obj):
         if obj.is_active:
-            return format_html('<span style="color: green;">✓ Ativo</span>')
-        return format_html('<span style="color: red;">✗ Inativo</span>')
+            return mark_safe('<span style="color: green;">✓ Ativo</span>')
+        return mark_safe('<span style="color: red;">✗ Inativo</span>')
     is_active_icon.short_description = "Status"
     
     def ativar_produtos(self, request, queryset):
+        product_ids = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(is_active=True)
+        # update() não dispara post_save; invalida o cache manualmente
+        catalog_cache.invalidate_products(product_ids)
+        catalog_cache.bump_catalog_version()
+        products_changed.send(sender=Product, product_ids=product_ids)
         self.message_user(
             request, 
             f'{updated} produto(s) ativado(s) com sucesso.'
@@ -100,7 +112,12 @@ class ProductAdmin(admin.ModelAdmin):
     ativar_produtos.short_description = "Ativar produtos selecionados"
     
     def desativar_produtos(self, request, queryset):
+        product_ids = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(is_active=False)
+        # update() não dispara post_save; invalida o cache manualmente
+        catalog_cache.invalidate_products(product_ids)
+        catalog_cache.bump_catalog_version()
+        products_changed.send(sender=Product, product_ids=product_ids)
         self.message_user(
             request, 
             f'{updated} produto(s) desativado(s) com sucesso.'
@@ -115,15 +132,23 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = (
         'id', 
         'name', 
+        'parent',
         'product_count',
         'created_at'
     )
-    search_fields = ('name', 'description')
+    list_select_related = ('parent',)
+    search_fields = ('^name',)
     ordering = ('name',)
     readonly_fields = ('created_at', 'updated_at')
     list_per_page = 20
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    
+    def get_queryset(self, request):
+        # Um único COUNT agrupado em vez de um por linha
+        return super().get_queryset(request).annotate(product_total=Count('products'))
     
     def product_count(self, obj):
-        count = obj.products.count() 
-        return f"{count} produto(s)"
-    product_count.short_description = "Qtd. Produtos"
\ No newline at end of file
+        return f"{obj.product_total} produto(s)"
+    product_count.short_description = "Qtd. Produtos"
+    product_count.admin_order_field = 'product_total'
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Cache das páginas do catálogo.
+
+Páginas de detalhe são guardadas por (id, updated_at) do produto, a
+listagem por um token de versão do catálogo e a página de cada categoria
+por um token próprio, trocado quando um produto da subárvore muda. Os sinais em products.signals
+trocam esses tokens quando Product ou Category mudam, então as entradas
+antigas simplesmente deixam de ser lidas e expiram sozinhas.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = 'catalog:version'
+CATEGORY_TREE_VERSION_KEY = 'catalog:category-tree:version'
+HITS_KEY = 'catalog:stats:hits'
+MISSES_KEY = 'catalog:stats:misses'
+
+
+def cache_timeout():
+    return getattr(settings, 'CATALOG_CACHE_TIMEOUT', 60 * 15)
+
+
+def product_version_key(product_id):
+    return f'catalog:product:{product_id}:version'
+
+
+def product_version(product):
+    return str(product.updated_at.timestamp())
+
+
+def detail_page_key(product_id, version):
+    return f'catalog:product:{product_id}:{version}:detail'
+
+
+def list_page_key(version, cursor):
+    return f'catalog:list:{version}:{cursor or "first"}'
+
+
+def _version(key):
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def catalog_version():
+    return _version(CATALOG_VERSION_KEY)
+
+
+async def _aversion(key, timeout=None):
+    version = await cache.aget(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await cache.aadd(key, version, timeout):
+            version = await cache.aget(key, version)
+    return version
+
+
+async def acatalog_version():
+    return await _aversion(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    cache.set(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def category_tree_version():
+    """Muda sempre que alguma categoria muda (nome, slug ou posição na árvore)"""
+    return _version(CATEGORY_TREE_VERSION_KEY)
+
+
+async def acategory_tree_version():
+    return await _aversion(CATEGORY_TREE_VERSION_KEY)
+
+
+def bump_category_tree_version():
+    cache.set(CATEGORY_TREE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def category_version_key(slug):
+    return f'catalog:category:{slug}:version'
+
+
+async def acategory_version(slug):
+    # Com prazo, como as páginas: slugs inexistentes não deixam chaves eternas
+    return await _aversion(category_version_key(slug), cache_timeout())
+
+
+def category_page_key(slug, version, tree_version, cursor):
+    return f'catalog:category:{slug}:{version}:{tree_version}:{cursor or "first"}:page'
+
+
+def invalidate_category_pages(slugs):
+    cache.delete_many([category_version_key(slug) for slug in slugs])
+
+
+def breadcrumbs_key(category_id, version):
+    return f'catalog:category:{category_id}:{version}:breadcrumbs'
+
+
+def invalidate_products(product_ids):
+    cache.delete_many([product_version_key(pk) for pk in product_ids])
+
+
+def record_hit(hit):
+    key = HITS_KEY if hit else MISSES_KEY
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Expirou entre o add() e o incr()
+            cache.add(key, 1, None)
+
+
+async def arecord_hit(hit):
+    key = HITS_KEY if hit else MISSES_KEY
+    if not await cache.aadd(key, 1, None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aadd(key, 1, None)
+
+
+def cache_stats():
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = stats.get(HITS_KEY, 0)
+    misses = stats.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,204 @@
+"""
+Geração de imagens derivadas (thumbnail, card, full) em WebP e JPEG.
+
+As derivadas são gravadas no storage com o hash do conteúdo no nome, então
+podem ser servidas com cache de longa duração. A geração roda numa
+tarefa Celery, fora da requisição: ao salvar a imagem (sinais) ou, se
+ainda não existir, no primeiro uso pelo template tag. O manifesto de
+cada imagem fica no cache para que os templates não consultem o banco
+por linha; as views de listagem carregam os manifestos da página inteira
+com manifests() (um get_many e no máximo uma consulta) e os passam no
+contexto como image_manifests. Enquanto as derivadas não existem, o
+manifesto vazio também fica em cache, por PENDING_TIMEOUT.
+"""
+import hashlib
+import os
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, features
+
+from .models import ImageDerivative
+
+# Maior lado, em pixels
+SIZES = {
+    'thumbnail': 120,
+    'card': 400,
+    'full': 1200,
+}
+FORMATS = {
+    'webp': 'WEBP',
+    'jpeg': 'JPEG',
+}
+QUALITY = 82
+DERIVATIVES_DIR = 'derivatives'
+MANIFEST_TIMEOUT = 60 * 60 * 24
+PENDING_TIMEOUT = 60 * 5
+
+
+def available_formats():
+    return [name for name in FORMATS if name != 'webp' or features.check('webp')]
+
+
+def manifest_key(source):
+    digest = hashlib.md5(source.encode()).hexdigest()
+    return f'images:manifest:{digest}'
+
+
+def pending_key(source):
+    digest = hashlib.md5(source.encode()).hexdigest()
+    return f'images:pending:{digest}'
+
+
+def generate_derivatives(source):
+    """
+    Gera todas as derivadas de `source` (nome no storage) que ainda não
+    existem. Idempotente: rodar de novo não cria arquivos nem linhas.
+    """
+    existing = set(
+        ImageDerivative.objects.filter(source=source).values_list('size', 'format')
+    )
+    wanted = [
+        (size, fmt)
+        for size in SIZES
+        for fmt in available_formats()
+        if (size, fmt) not in existing
+    ]
+    if not wanted:
+        return 0
+
+    with default_storage.open(source, 'rb') as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    stem = os.path.splitext(os.path.basename(source))[0]
+    derivatives = []
+    for size, fmt in wanted:
+        resized = image.copy()
+        resized.thumbnail((SIZES[size], SIZES[size]), Image.LANCZOS)
+        buffer = BytesIO()
+        resized.save(buffer, FORMATS[fmt], quality=QUALITY, optimize=True)
+        content = buffer.getvalue()
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        name = f'{DERIVATIVES_DIR}/{stem}-{size}.{digest}.{fmt}'
+        if not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(content))
+        derivatives.append(
+            ImageDerivative(
+                source=source,
+                size=size,
+                format=fmt,
+                file=name,
+                width=resized.width,
+                height=resized.height,
+            )
+        )
+    ImageDerivative.objects.bulk_create(derivatives, ignore_conflicts=True)
+    cache.delete_many([manifest_key(source), pending_key(source)])
+    return len(derivatives)
+
+
+def schedule_derivatives(source):
+    """Agenda a geração das derivadas (Celery) depois do commit da transação atual"""
+    from .tasks import generate_image_derivatives
+
+    if not source:
+        return
+    transaction.on_commit(lambda: generate_image_derivatives.delay(source))
+
+
+def manifest(source):
+    """
+    {(size, format): (url, width)} das derivadas prontas de `source`.
+
+    Lê do cache; na falta, consulta o banco uma vez. Se ainda não houver
+    derivadas, agenda a geração e devolve {} (o template usa o original).
+    """
+    if not source:
+        return {}
+    return manifests([source])[source]
+
+
+def manifests(sources):
+    """{source: manifesto} de várias imagens, com um get_many e no máximo uma consulta"""
+    sources = {source for source in sources if source}
+    if not sources:
+        return {}
+    keys = {manifest_key(source): source for source in sources}
+    found = {keys[key]: data for key, data in cache.get_many(list(keys)).items()}
+    missing = sources - set(found)
+    if missing:
+        rows = _derivatives(missing)
+        fresh = _build_manifests(missing, rows)
+        # Antes de agendar: a geração apaga a chave ao terminar, e o
+        # manifesto vazio não pode sobrescrever o pronto
+        for entries, timeout in _manifest_entries(fresh):
+            cache.set_many(entries, timeout)
+        found.update(fresh)
+        _schedule_pending(source for source, data in fresh.items() if not data)
+    return found
+
+
+async def amanifests(sources):
+    """Versão assíncrona de manifests"""
+    sources = {source for source in sources if source}
+    if not sources:
+        return {}
+    keys = {manifest_key(source): source for source in sources}
+    found = {keys[key]: data for key, data in (await cache.aget_many(list(keys))).items()}
+    missing = sources - set(found)
+    if missing:
+        rows = [row async for row in _derivatives(missing)]
+        fresh = _build_manifests(missing, rows)
+        for entries, timeout in _manifest_entries(fresh):
+            await cache.aset_many(entries, timeout)
+        found.update(fresh)
+        pending = [source for source, data in fresh.items() if not data]
+        if pending:
+            # O agendamento pode rodar a tarefa na hora (Celery eager)
+            await sync_to_async(_schedule_pending)(pending)
+    return found
+
+
+def _derivatives(sources):
+    return ImageDerivative.objects.filter(source__in=sources).only('source', 'size', 'format', 'file', 'width')
+
+
+def _build_manifests(sources, rows):
+    data = {source: {} for source in sources}
+    for row in rows:
+        data[row.source][(row.size, row.format)] = (default_storage.url(row.file), row.width)
+    return data
+
+
+def _manifest_entries(data):
+    """(chaves, timeout) a gravar; o manifesto vazio (pendente) expira logo"""
+    ready = {manifest_key(source): value for source, value in data.items() if value}
+    pending = {manifest_key(source): value for source, value in data.items() if not value}
+    return [
+        (entries, timeout)
+        for entries, timeout in ((ready, MANIFEST_TIMEOUT), (pending, PENDING_TIMEOUT))
+        if entries
+    ]
+
+
+def _schedule_pending(sources):
+    for source in sources:
+        if cache.add(pending_key(source), 1, PENDING_TIMEOUT):
+            schedule_derivatives(source)
+
+
+def srcset(data, fmt='jpeg'):
+    """'url 120w, url 400w, ...' de um manifesto, no formato pedido"""
+    entries = sorted(
+        (width, url)
+        for (size, entry_format), (url, width) in data.items()
+        if entry_format == fmt
+    )
+    return ', '.join(f'{url} {width}w' for width, url in entries)
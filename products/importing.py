@@ -0,0 +1,231 @@
+"""
+Importação em lote do catálogo de fornecedores.
+
+O arquivo (CSV ou JSONL) é lido em streaming e processado em blocos: cada
+bloco é validado, tem as categorias resolvidas por um mapa nome -> id em
+memória (as que faltam são criadas com um bulk_create) e os produtos são
+gravados com um único upsert sobre o nome único. Depois de cada bloco o
+número do último registro é gravado no checkpoint, permitindo retomar.
+"""
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import cache as catalog_cache
+from . import tree
+from .models import Category, Product, ProductStatus, path_segment, products_changed
+
+IMPORT_CHUNK_SIZE = 1000
+UPDATE_FIELDS = ['description', 'price', 'stock', 'category', 'status', 'is_active', 'updated_at']
+TRUE_VALUES = {'1', 'true', 't', 'sim', 's', 'yes', 'y'}
+
+
+class RowError(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejected: list = field(default_factory=list)
+    categories_created: int = 0
+    last_record: int = 0
+
+
+def read_records(path, file_format=None):
+    """Gera (número do registro, dict) a partir de um CSV ou JSONL"""
+    file_format = file_format or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, encoding='utf-8', newline='') as source:
+        if file_format == 'csv':
+            for number, row in enumerate(csv.DictReader(source), start=1):
+                yield number, row
+        else:
+            number = 0
+            for line in source:
+                if not line.strip():
+                    continue
+                number += 1
+                try:
+                    yield number, json.loads(line)
+                except ValueError:
+                    yield number, None
+
+
+def clean_record(record):
+    """Valida um registro e devolve os campos já convertidos"""
+    if not isinstance(record, dict):
+        raise RowError("registro malformado")
+    name = str(record.get('name') or '').strip()
+    if not name:
+        raise RowError("nome obrigatório")
+    if len(name) > Product._meta.get_field('name').max_length:
+        raise RowError("nome muito longo")
+    category = str(record.get('category') or '').strip()
+    if not category:
+        raise RowError("categoria obrigatória")
+    if len(category) > Category._meta.get_field('name').max_length:
+        raise RowError("nome de categoria muito longo")
+    try:
+        price = Decimal(str(record.get('price', '')).replace(',', '.'))
+    except InvalidOperation:
+        raise RowError("preço inválido")
+    if not price.is_finite() or price < 0 or price >= Decimal('1e8'):
+        raise RowError("preço fora do intervalo")
+    try:
+        stock = int(str(record.get('stock', '')).strip())
+    except ValueError:
+        raise RowError("estoque inválido")
+    if stock < 0:
+        raise RowError("estoque negativo")
+    status = str(record.get('status') or ProductStatus.PENDENTE).strip()
+    if status not in ProductStatus.values:
+        raise RowError("status inválido")
+    is_active = record.get('is_active', True)
+    if isinstance(is_active, str):
+        is_active = is_active.strip().lower() in TRUE_VALUES
+    return {
+        'name': name,
+        'description': str(record.get('description') or ''),
+        'price': price.quantize(Decimal('0.01')),
+        'stock': stock,
+        'category': category,
+        'status': status,
+        'is_active': bool(is_active),
+    }
+
+
+class ProductImporter:
+    def __init__(self, chunk_size=IMPORT_CHUNK_SIZE, checkpoint_path=None):
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+        self.categories = dict(Category.objects.values_list('name', 'id'))
+        self.result = ImportResult()
+
+    def run(self, records, resume=False):
+        skip_until = self.read_checkpoint() if resume else 0
+        chunk = []
+        for number, record in records:
+            if number <= skip_until:
+                continue
+            chunk.append((number, record))
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return self.result
+
+    def import_chunk(self, chunk):
+        valid = {}
+        for number, record in chunk:
+            try:
+                row = clean_record(record)
+            except RowError as exc:
+                self.result.rejected.append((number, record, str(exc)))
+                continue
+            # O mesmo nome duas vezes no bloco: vale o último
+            valid[row['name']] = (number, row)
+
+        with transaction.atomic():
+            self.ensure_categories({row['category'] for _, row in valid.values()})
+            now = timezone.now()
+            products = []
+            for number, row in valid.values():
+                category_id = self.categories.get(row['category'])
+                if category_id is None:
+                    self.result.rejected.append((number, row, "categoria não pôde ser criada"))
+                    continue
+                products.append(
+                    Product(
+                        name=row['name'],
+                        description=row['description'],
+                        price=row['price'],
+                        stock=row['stock'],
+                        category_id=category_id,
+                        status=row['status'],
+                        is_active=row['is_active'],
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+            # Linhas já existentes: pk e a categoria de antes do upsert, para
+            # invalidar também as páginas de onde o produto saiu
+            existing = {
+                name: (pk, category_id)
+                for name, pk, category_id in Product.objects.filter(name__in=[p.name for p in products])
+                .values_list('name', 'pk', 'category_id')
+            }
+            Product.objects.bulk_create(
+                products,
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=UPDATE_FIELDS,
+            )
+
+        # bulk_create não dispara post_save
+        product_ids = [pk for pk, _ in existing.values()]
+        created = [p.name for p in products if p.name not in existing]
+        if created:
+            product_ids += Product.objects.filter(name__in=created).values_list('pk', flat=True)
+        catalog_cache.invalidate_products(product_ids)
+        catalog_cache.bump_catalog_version()
+        tree.invalidate_subtree_pages(
+            {p.category_id for p in products} | {category_id for _, category_id in existing.values()}
+        )
+        products_changed.send(sender=Product, product_ids=product_ids)
+
+        self.result.imported += len(products)
+        self.result.last_record = chunk[-1][0]
+        self.write_checkpoint(self.result.last_record)
+
+    def ensure_categories(self, names):
+        missing = [name for name in names if name not in self.categories]
+        if not missing:
+            return
+        taken = set(
+            Category.objects.filter(slug__in=[slugify(name) for name in missing])
+            .values_list('slug', flat=True)
+        )
+        new = []
+        for name in sorted(missing):
+            slug = slugify(name) or 'categoria'
+            base, suffix = slug, 2
+            while slug in taken:
+                slug = f'{base}-{suffix}'
+                suffix += 1
+            taken.add(slug)
+            new.append(Category(name=name, slug=slug))
+        Category.objects.bulk_create(new, ignore_conflicts=True)
+        created = dict(Category.objects.filter(name__in=missing).values_list('name', 'id'))
+        # bulk_create não passa por Category.save(): as novas entram como raízes
+        Category.objects.bulk_update(
+            [
+                Category(pk=pk, path=path_segment(pk), depth=0)
+                for pk in Category.objects.filter(pk__in=created.values(), path='').values_list('pk', flat=True)
+            ],
+            ['path', 'depth'],
+        )
+        self.result.categories_created += len(created)
+        self.categories.update(created)
+
+    def read_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, encoding='utf-8') as checkpoint:
+            return json.load(checkpoint).get('last_record', 0)
+
+    def write_checkpoint(self, last_record):
+        if not self.checkpoint_path:
+            return
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as checkpoint:
+            json.dump({'last_record': last_record}, checkpoint)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,103 @@
+"""
+Reserva e devolução de estoque sem SELECT ... FOR UPDATE.
+
+Uma reserva é um único UPDATE condicional para todos os produtos do
+pedido:
+
+    UPDATE products_product
+       SET stock = stock - CASE id WHEN ... END
+     WHERE id IN (...) AND stock >= CASE id WHEN ... END
+
+Se alguma linha não satisfaz a condição, o número de linhas afetadas fica
+menor que o número de produtos e a transação é desfeita. Os produtos são
+ordenados por id, o que mantém a mesma ordem de bloqueio entre pedidos
+concorrentes (o UPDATE percorre o índice da chave primária).
+
+O UPDATE também grava updated_at, mas não passa por save(): depois do
+commit, stock_changed avisa quem guarda cópias do produto (páginas do
+catálogo, snapshots do carrinho) com a lista de ids alterados.
+"""
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Now
+from django.dispatch import Signal
+
+from .models import Product
+
+# Enviado após o commit, com product_ids
+stock_changed = Signal()
+
+
+class InsufficientStock(Exception):
+    def __init__(self, product_ids):
+        self.product_ids = list(product_ids)
+        super().__init__(f"Estoque insuficiente para os produtos {self.product_ids}")
+
+
+def _normalize(quantities):
+    """{product_id: quantidade} somando repetidos, ordenado por id"""
+    if hasattr(quantities, 'items'):
+        quantities = quantities.items()
+    totals = {}
+    for product_id, quantity in quantities:
+        if quantity < 0:
+            raise ValueError("Quantidade negativa")
+        if quantity:
+            totals[product_id] = totals.get(product_id, 0) + quantity
+    return sorted(totals.items())
+
+
+def _quantity_case(items):
+    return Case(
+        *[When(pk=product_id, then=Value(quantity)) for product_id, quantity in items],
+        output_field=IntegerField(),
+    )
+
+
+def _notify(product_ids):
+    product_ids = list(product_ids)
+    # robust: uma falha ao invalidar caches não pode fazer uma reserva já
+    # gravada parecer que falhou (e ser repetida)
+    transaction.on_commit(
+        lambda: stock_changed.send(sender=Product, product_ids=product_ids),
+        robust=True,
+    )
+
+
+def reserve(quantities):
+    """
+    Baixa o estoque de todos os produtos ou de nenhum.
+    Levanta InsufficientStock com os ids que não tinham saldo.
+    """
+    items = _normalize(quantities)
+    if not items:
+        return
+    try:
+        with transaction.atomic():
+            updated = Product.objects.filter(
+                pk__in=[product_id for product_id, _ in items],
+                stock__gte=_quantity_case(items),
+            ).update(stock=F('stock') - _quantity_case(items), updated_at=Now())
+            if updated != len(items):
+                raise InsufficientStock([])
+            _notify(product_id for product_id, _ in items)
+    except InsufficientStock:
+        # Fora do caminho feliz: descobre quais produtos faltaram
+        wanted = dict(items)
+        stock = dict(Product.objects.filter(pk__in=wanted).values_list('pk', 'stock'))
+        raise InsufficientStock(
+            product_id for product_id, quantity in items
+            if stock.get(product_id, 0) < quantity
+        )
+
+
+def release(quantities):
+    """Devolve ao estoque as quantidades informadas"""
+    items = _normalize(quantities)
+    if not items:
+        return
+    product_ids = [product_id for product_id, _ in items]
+    Product.objects.filter(pk__in=product_ids).update(
+        stock=F('stock') + _quantity_case(items), updated_at=Now(),
+    )
+    _notify(product_ids)
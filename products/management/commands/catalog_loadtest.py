@@ -0,0 +1,193 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.urls import reverse
+
+from products.models import Category, Product
+
+
+def wsgi_get(handler, url):
+    path = urlsplit(url)
+    environ = {}
+    setup_testing_defaults(environ)
+    environ.update(REQUEST_METHOD='GET', PATH_INFO=path.path, QUERY_STRING=path.query)
+    status = []
+
+    def start_response(value, headers, exc_info=None):
+        status.append(int(value.split()[0]))
+
+    response = handler(environ, start_response)
+    try:
+        for _ in response:
+            pass
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+    return status[0]
+
+
+async def asgi_get(handler, url):
+    path = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path.path,
+        'raw_path': path.path.encode(),
+        'query_string': path.query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'127.0.0.1')],
+        'client': ('127.0.0.1', 0),
+        'server': ('127.0.0.1', 80),
+    }
+    body_sent = False
+    disconnected = asyncio.Event()
+    status = []
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # O handler fica ouvindo a desconexão até a resposta terminar
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await handler(scope, receive, send)
+    return status[0]
+
+
+def summarize(name, latencies, errors, elapsed):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0
+    return {
+        'mode': name,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': statistics.median(ordered) * 1000 if ordered else 0.0,
+        'p99': p99 * 1000,
+    }
+
+
+class Command(BaseCommand):
+    """
+    Compara o catálogo servido pelo handler WSGI (threads) e pelo handler
+    ASGI (event loop), no mesmo processo e no mesmo banco configurado.
+    Sem servidor HTTP: mede a pilha Django + ORM + cache, não a rede.
+
+    As views do catálogo são corrotinas nos dois modos. Sob WSGI o Django
+    as roda com async_to_sync a cada requisição, então a linha
+    "wsgi-async" é views assíncronas mais o adaptador, não uma linha de
+    base de views síncronas.
+    """
+
+    help = (
+        "Teste de carga das páginas do catálogo: as mesmas views assíncronas "
+        "sob o handler WSGI (async_to_sync, em threads) e sob o ASGI (event loop). "
+        "O modo WSGI não é uma linha de base de views síncronas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help="Requisições por modo")
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help="Limpa o cache antes de cada modo (mede o caminho até o banco)",
+        )
+        parser.add_argument('--url', action='append', dest='urls', help="URL a requisitar (repetível)")
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        concurrency = options['concurrency']
+        if total < 1 or concurrency < 1:
+            raise CommandError("--requests e --concurrency devem ser positivos")
+        urls = options['urls'] or self.default_urls()
+        schedule = [urls[i % len(urls)] for i in range(total)]
+
+        results = []
+        for name, run in (('wsgi-async', self.run_wsgi), ('asgi', self.run_asgi)):
+            if options['cold']:
+                cache.clear()
+            run(schedule[:concurrency], concurrency)  # aquecimento
+            results.append(run(schedule, concurrency, name=name))
+
+        self.stdout.write(f"{'modo':<12}{'req':>8}{'erros':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for row in results:
+            self.stdout.write(
+                f"{row['mode']:<12}{row['requests']:>8}{row['errors']:>8}"
+                f"{row['rps']:>10.1f}{row['p50']:>10.2f}{row['p99']:>10.2f}"
+            )
+        self.stdout.write("wsgi-async: views assíncronas sob WSGI (async_to_sync), não views síncronas")
+
+    def default_urls(self):
+        urls = [reverse('home'), reverse('list_products')]
+        product = Product.objects.filter(is_active=True).only('pk').first()
+        if product is not None:
+            urls.append(reverse('detail_product', kwargs={'product_id': product.pk}))
+        category = Category.objects.only('slug').first()
+        if category is not None:
+            urls.append(reverse('category_detail', kwargs={'slug': category.slug}))
+        return urls
+
+    def run_wsgi(self, schedule, concurrency, name='wsgi-async'):
+        handler = WSGIHandler()
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+
+        def request(url):
+            nonlocal errors
+            started = time.perf_counter()
+            try:
+                status = wsgi_get(handler, url)
+            finally:
+                close_old_connections()
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                errors += status >= 400
+
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(request, schedule))
+        return summarize(name, latencies, errors, time.perf_counter() - began)
+
+    def run_asgi(self, schedule, concurrency, name='asgi'):
+        handler = ASGIHandler()
+        latencies = []
+        errors = 0
+
+        async def main():
+            nonlocal errors
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def request(url):
+                nonlocal errors
+                async with semaphore:
+                    started = time.perf_counter()
+                    status = await asgi_get(handler, url)
+                    latencies.append(time.perf_counter() - started)
+                    errors += status >= 400
+
+            await asyncio.gather(*(request(url) for url in schedule))
+
+        began = time.perf_counter()
+        asyncio.run(main())
+        return summarize(name, latencies, errors, time.perf_counter() - began)
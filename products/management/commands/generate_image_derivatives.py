@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from products.images import generate_derivatives
+from products.models import Product
+from reviews.models import ReviewImage
+
+
+class Command(BaseCommand):
+    """
+    Gera as derivadas que faltam para as imagens já existentes de
+    produtos e reviews.
+    """
+
+    help = "Gera thumbnails/cards/full das imagens de produtos e reviews"
+
+    def handle(self, *args, **options):
+        sources = (
+            Product.objects.exclude(image='').exclude(image__isnull=True)
+            .values_list('image', flat=True)
+            .iterator()
+        )
+        review_sources = (
+            ReviewImage.objects.exclude(image='')
+            .values_list('image', flat=True)
+            .iterator()
+        )
+        created = 0
+        for queryset in (sources, review_sources):
+            for name in queryset:
+                try:
+                    created += generate_derivatives(name)
+                except (OSError, ValueError) as exc:
+                    self.stdout.write(self.style.WARNING(f"{name}: {exc}"))
+        self.stdout.write(self.style.SUCCESS(f"{created} derivada(s) gerada(s)"))
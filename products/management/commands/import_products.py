@@ -0,0 +1,59 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.importing import IMPORT_CHUNK_SIZE, ProductImporter, read_records
+
+
+class Command(BaseCommand):
+    """
+    Importa o catálogo de fornecedores (CSV ou JSONL) com upserts em lote.
+
+    Colunas: name, description, price, stock, category e, opcionalmente,
+    status e is_active. Produtos já existentes (mesmo nome) são atualizados.
+    """
+
+    help = "Importa produtos em lote a partir de um arquivo CSV ou JSONL"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Arquivo .csv ou .jsonl")
+        parser.add_argument('--format', choices=['csv', 'jsonl'])
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument(
+            '--checkpoint',
+            help="Arquivo de checkpoint (padrão: <arquivo>.checkpoint)",
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help="Continua a partir do último bloco gravado no checkpoint",
+        )
+        parser.add_argument('--rejects', help="Grava as linhas rejeitadas neste CSV")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size deve ser positivo")
+        checkpoint = options['checkpoint'] or f"{options['path']}.checkpoint"
+        importer = ProductImporter(chunk_size=options['chunk_size'], checkpoint_path=checkpoint)
+        try:
+            records = read_records(options['path'], options['format'])
+            result = importer.run(records, resume=options['resume'])
+        except FileNotFoundError:
+            raise CommandError(f"Arquivo não encontrado: {options['path']}")
+
+        if options['rejects'] and result.rejected:
+            with open(options['rejects'], 'w', encoding='utf-8', newline='') as output:
+                writer = csv.writer(output)
+                writer.writerow(['record', 'reason', 'data'])
+                for number, record, reason in result.rejected:
+                    writer.writerow([number, reason, record])
+
+        for number, record, reason in result.rejected[:20]:
+            self.stdout.write(self.style.WARNING(f"Registro {number} rejeitado: {reason}"))
+        if len(result.rejected) > 20:
+            self.stdout.write(self.style.WARNING(f"... e mais {len(result.rejected) - 20}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.imported} produto(s) importado(s), "
+            f"{result.categories_created} categoria(s) criada(s), "
+            f"{len(result.rejected)} rejeitado(s)"
+        ))
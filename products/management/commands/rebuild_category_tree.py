@@ -0,0 +1,26 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from products.tree import REBUILD_BATCH_SIZE, rebuild_tree
+
+
+class Command(BaseCommand):
+    """
+    Recalcula o caminho materializado de todas as categorias a partir de parent.
+    """
+
+    help = "Reconstrói path/depth da árvore de categorias"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                updated = rebuild_tree(batch_size=options['batch_size'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        except ValidationError as exc:
+            raise CommandError(exc.messages[0])
+        self.stdout.write(self.style.SUCCESS(f"{updated} categoria(s) atualizada(s)"))
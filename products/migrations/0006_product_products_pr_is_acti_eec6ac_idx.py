@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_alter_category_options_category_slug'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_active', 'created_at', 'id'], name='products_pr_is_acti_eec6ac_idx'),
+        ),
+    ]
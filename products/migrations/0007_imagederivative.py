@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_products_pr_is_acti_eec6ac_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageDerivative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, verbose_name='Imagem original')),
+                ('size', models.CharField(max_length=20, verbose_name='Tamanho')),
+                ('format', models.CharField(max_length=10, verbose_name='Formato')),
+                ('file', models.CharField(max_length=255, verbose_name='Arquivo')),
+                ('width', models.PositiveIntegerField(verbose_name='Largura')),
+                ('height', models.PositiveIntegerField(verbose_name='Altura')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Imagem derivada',
+                'verbose_name_plural': 'Imagens derivadas',
+                'constraints': [models.UniqueConstraint(fields=('source', 'size', 'format'), name='image_derivative_unique_source_size_format')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# Índice para a busca por prefixo do admin (name__istartswith), que no
+# PostgreSQL vira UPPER(name::text) LIKE UPPER('...%'). text_pattern_ops
+# permite usar o índice em LIKE independente da collation. No SQLite não
+# há equivalente útil, então a migração não faz nada.
+CREATE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS products_product_name_upper_like "
+    "ON products_product (UPPER(name::text) text_pattern_ops)"
+)
+DROP_INDEX = "DROP INDEX IF EXISTS products_product_name_upper_like"
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_imagederivative'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Até aqui as categorias eram planas: todas viram raízes com path = pk.
+SEGMENT = '{:08x}/'
+
+
+def fill_paths(apps, schema_editor):
+    Category = apps.get_model('products', 'Category')
+    categories = list(Category.objects.only('pk'))
+    for category in categories:
+        category.path = SEGMENT.format(category.pk)
+        category.depth = 0
+    Category.objects.bulk_update(categories, ['path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_product_name_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Nível'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='products.category', verbose_name='Categoria pai'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, help_text='Caminho materializado (pks dos ancestrais)', max_length=255, verbose_name='Caminho'),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
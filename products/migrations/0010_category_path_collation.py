@@ -0,0 +1,30 @@
+from django.db import migrations
+
+# subtree_range() compara paths byte a byte ('/' < '0' < ... < 'f'). Numa
+# collation linguística (pt_BR.UTF-8) a pontuação é ignorada no primeiro
+# nível da comparação e o intervalo pode pegar ou perder linhas; a
+# collation "C" ordena por bytes. ALTER TYPE reconstrói os índices de
+# path. No SQLite a collation padrão (BINARY) já ordena por bytes.
+SET_COLLATION = 'ALTER TABLE products_category ALTER COLUMN path TYPE varchar(255) COLLATE "C"'
+RESET_COLLATION = 'ALTER TABLE products_category ALTER COLUMN path TYPE varchar(255) COLLATE "default"'
+
+
+def set_collation(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(SET_COLLATION)
+
+
+def reset_collation(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(RESET_COLLATION)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_category_tree'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_collation, reset_collation),
+    ]
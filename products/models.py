@@ -1,12 +1,54 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Max, Q, Value
+from django.db.models.functions import Concat, Substr
+from django.dispatch import Signal
 from django.urls import reverse
 from django.utils.text import slugify
 
+# Enviado por gravações em lote que não passam por save() (update(),
+# bulk_create), com product_ids
+products_changed = Signal()
+
+
 class ProductStatus(models.TextChoices):
     PENDENTE = 'pendente', 'Pendente'
     APROVADO = 'aprovado', 'Aprovado'
     REJEITADO = 'rejeitado', 'Rejeitado'
 
+# Caminho materializado: um segmento hexadecimal de largura fixa por nível,
+# com o pk de cada ancestral ("0000000a/0000002f/"). A subárvore de uma
+# categoria é um intervalo contínuo de path, então cabe num índice comum.
+# O intervalo depende da ordem byte a byte ('/' antes de '0'): no
+# PostgreSQL a coluna usa a collation "C" (migração 0010); no SQLite a
+# collation padrão (BINARY) já é essa.
+PATH_SEGMENT_WIDTH = 8
+PATH_SEPARATOR = '/'
+PATH_MAX_LENGTH = 255
+# Nível mais fundo cujo path ainda cabe na coluna (a raiz é o nível 0)
+MAX_DEPTH = PATH_MAX_LENGTH // (PATH_SEGMENT_WIDTH + len(PATH_SEPARATOR)) - 1
+
+
+def path_segment(pk):
+    return f'{pk:0{PATH_SEGMENT_WIDTH}x}{PATH_SEPARATOR}'
+
+
+def path_ids(path):
+    """pks dos ancestrais (e da própria categoria) codificados em `path`"""
+    return [int(segment, 16) for segment in path.split(PATH_SEPARATOR) if segment]
+
+
+def check_depth(depth):
+    if depth > MAX_DEPTH:
+        raise ValidationError(f"A árvore de categorias não pode passar de {MAX_DEPTH + 1} níveis")
+
+
+def subtree_range(path):
+    """(início, fim) do intervalo de paths da subárvore que começa em `path`"""
+    # '0' é o caractere seguinte a '/', e todo descendente continua com [0-9a-f]
+    return path, path[:-1] + chr(ord(PATH_SEPARATOR) + 1)
+
+
 class Category(models.Model):
     name = models.CharField("Nome", max_length=255, unique=True)
     slug = models.SlugField(
@@ -17,6 +59,23 @@ class Category(models.Model):
         editable=False,
         help_text="Preenchido automaticamente a partir do nome"
     )
+    parent = models.ForeignKey(
+        'self',
+        verbose_name="Categoria pai",
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="children"
+    )
+    path = models.CharField(
+        "Caminho",
+        max_length=PATH_MAX_LENGTH,
+        editable=False,
+        db_index=True,
+        default='',
+        help_text="Caminho materializado (pks dos ancestrais)"
+    )
+    depth = models.PositiveSmallIntegerField("Nível", default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -32,7 +91,52 @@ class Category(models.Model):
         if not self.slug:
             # Remove acentos e caracteres esepeciais, gerar slug limpo
             self.slug = slugify(self.name, allow_unicode=False)
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._update_path()
+
+    def clean(self):
+        super().clean()
+        if self.parent_id and self.pk and self.parent_id in self._descendant_ids():
+            raise ValidationError({'parent': "A categoria pai não pode ser descendente desta categoria"})
+
+    def _descendant_ids(self):
+        return set(Category.objects.filter(self.subtree_q()).values_list('pk', flat=True))
+
+    def _update_path(self):
+        """Recalcula path/depth desta categoria e, num único UPDATE, dos descendentes"""
+        if self.parent_id:
+            parent = Category.objects.only('path', 'depth').get(pk=self.parent_id)
+            if self.pk in path_ids(parent.path):
+                raise ValidationError("A categoria pai não pode ser descendente desta categoria")
+            path, depth = parent.path + path_segment(self.pk), parent.depth + 1
+        else:
+            path, depth = path_segment(self.pk), 0
+        old_path, old_depth = self.path, self.depth
+        if path == old_path:
+            return
+        check_depth(depth)
+        if old_path:
+            deepest = Category.objects.filter(self.subtree_q()).aggregate(deepest=Max('depth'))['deepest']
+            check_depth((deepest or old_depth) + depth - old_depth)
+            Category.objects.filter(self.subtree_q()).update(
+                path=Concat(Value(path), Substr('path', len(old_path) + 1)),
+                depth=F('depth') + (depth - old_depth),
+            )
+        else:
+            Category.objects.filter(pk=self.pk).update(path=path, depth=depth)
+        self.path, self.depth = path, depth
+
+    def subtree_q(self, prefix=''):
+        """Q da subárvore (esta categoria e descendentes) como intervalo de path"""
+        start, end = subtree_range(self.path)
+        return Q(**{f'{prefix}path__gte': start, f'{prefix}path__lt': end})
+
+    def get_descendants(self, include_self=True):
+        descendants = Category.objects.filter(self.subtree_q())
+        if not include_self:
+            descendants = descendants.exclude(pk=self.pk)
+        return descendants
 
     def get_absolute_url(self):
         return reverse("category_detail", kwargs={"slug": self.slug})
@@ -63,6 +167,37 @@ class Product(models.Model):
         verbose_name = "Produto"
         verbose_name_plural = "Produtos"
         ordering = ['-created_at']
+        indexes = [
+            # Paginação por cursor da listagem (is_active, created_at, id)
+            models.Index(fields=['is_active', 'created_at', 'id']),
+        ]
         
     def __str__(self):
         return self.name
+
+
+class ImageDerivative(models.Model):
+    """
+    Versão redimensionada de uma imagem enviada (Product.image,
+    ReviewImage.image), gerada por products.images
+    """
+    source = models.CharField("Imagem original", max_length=255)
+    size = models.CharField("Tamanho", max_length=20)
+    format = models.CharField("Formato", max_length=10)
+    file = models.CharField("Arquivo", max_length=255)
+    width = models.PositiveIntegerField("Largura")
+    height = models.PositiveIntegerField("Altura")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Imagem derivada"
+        verbose_name_plural = "Imagens derivadas"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'size', 'format'],
+                name='image_derivative_unique_source_size_format',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.source} [{self.size}/{self.format}]"
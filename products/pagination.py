@@ -0,0 +1,141 @@
+import base64
+import json
+from dataclasses import dataclass, field
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# Abaixo disso um COUNT(*) exato é barato o bastante
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+class InvalidCursor(ValueError):
+    """Cursor malformado ou que não corresponde à ordenação"""
+
+
+@dataclass
+class KeysetPage:
+    items: list = field(default_factory=list)
+    next_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(values):
+    payload = json.dumps([_serialize(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """Converte o cursor de volta para os valores Python dos campos de ordenação"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor(cursor)
+    try:
+        return [
+            model._meta.get_field(name.lstrip('-')).to_python(value)
+            for name, value in zip(ordering, values)
+        ]
+    except Exception as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def keyset_paginate(queryset, ordering, cursor=None, page_size=25):
+    """
+    Paginação por cursor (keyset) sobre `ordering`.
+
+    Em vez de OFFSET, filtra pelas linhas depois da última da página
+    anterior, então o custo de cada página não cresce com a posição e o
+    índice composto sobre `ordering` pode ser percorrido diretamente.
+    O último campo de `ordering` deve ser único (normalmente o id).
+    """
+    queryset = _keyset_queryset(queryset, ordering, cursor, page_size)
+    return _keyset_page(list(queryset), ordering, page_size)
+
+
+async def akeyset_paginate(queryset, ordering, cursor=None, page_size=25):
+    """Versão assíncrona de keyset_paginate (ORM assíncrono)"""
+    queryset = _keyset_queryset(queryset, ordering, cursor, page_size)
+    return _keyset_page([item async for item in queryset], ordering, page_size)
+
+
+def _keyset_queryset(queryset, ordering, cursor, page_size):
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(_after(ordering, values))
+    # Uma linha a mais diz se existe próxima página
+    return queryset[:page_size + 1]
+
+
+def _keyset_page(items, ordering, page_size):
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            [getattr(last, name.lstrip('-')) for name in ordering]
+        )
+    return KeysetPage(items=items, next_cursor=next_cursor)
+
+
+def _after(ordering, values):
+    """Monta (a > x) OR (a = x AND b > y) ... respeitando a direção de cada campo"""
+    condition = Q()
+    for index, name in enumerate(ordering):
+        column = name.lstrip('-')
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        term = Q(**{f'{column}__{lookup}': values[index]})
+        for previous, value in zip(ordering[:index], values[:index]):
+            term &= Q(**{previous.lstrip('-'): value})
+        condition |= term
+    return condition
+
+
+def _serialize(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator que, no PostgreSQL, usa pg_class.reltuples como total quando o
+    queryset não tem filtros, evitando um COUNT(*) na tabela inteira a cada
+    página do admin. Com filtros ou tabelas pequenas, conta normalmente.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+        return super().count
+
+    def estimated_count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None or query.where or query.distinct:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < 0:
+            return None
+        return row[0]
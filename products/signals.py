@@ -0,0 +1,66 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import cache as catalog_cache
+from . import images, tree
+from .inventory import stock_changed
+from .models import Category, Product
+
+
+def image_name(instance, field='image'):
+    """Nome da imagem sem disparar o carregamento de um campo adiado"""
+    value = instance.__dict__.get(field)
+    return getattr(value, 'name', value) or ''
+
+
+@receiver(post_init, sender=Product)
+def remember_product_image(sender, instance, **kwargs):
+    instance._loaded_image = image_name(instance)
+    instance._loaded_category_id = instance.__dict__.get('category_id')
+
+
+@receiver(post_save, sender=Product)
+def generate_product_image_derivatives(sender, instance, **kwargs):
+    if 'image' in instance.get_deferred_fields():
+        return
+    name = image_name(instance)
+    if name and name != getattr(instance, '_loaded_image', None):
+        images.schedule_derivatives(name)
+    instance._loaded_image = name
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_pages(sender, instance, **kwargs):
+    catalog_cache.invalidate_products([instance.pk])
+    catalog_cache.bump_catalog_version()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_category_pages(sender, instance, **kwargs):
+    # A categoria anterior também, se o produto mudou de categoria
+    previous = getattr(instance, '_loaded_category_id', None)
+    tree.invalidate_subtree_pages({instance.category_id, previous})
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(stock_changed)
+def invalidate_stock_pages(sender, product_ids, **kwargs):
+    # Reservas e devoluções são UPDATEs diretos, sem post_save
+    catalog_cache.invalidate_products(product_ids)
+    catalog_cache.bump_catalog_version()
+    tree.invalidate_subtree_pages(
+        Product.objects.filter(pk__in=product_ids).values_list('category_id', flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_pages(sender, instance, **kwargs):
+    # O nome da categoria aparece no detalhe de cada produto dela
+    if not kwargs.get('created'):
+        product_ids = Product.objects.filter(category_id=instance.pk).values_list('pk', flat=True)
+        catalog_cache.invalidate_products(product_ids)
+    catalog_cache.bump_catalog_version()
+    catalog_cache.bump_category_tree_version()
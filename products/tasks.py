@@ -0,0 +1,10 @@
+from celery import shared_task
+from django.db import OperationalError
+
+from . import images
+
+
+@shared_task(autoretry_for=(OperationalError,), retry_backoff=True, max_retries=5)
+def generate_image_derivatives(source):
+    """Gera as derivadas de `source`; as já existentes são mantidas"""
+    return images.generate_derivatives(source)
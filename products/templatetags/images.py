@@ -0,0 +1,50 @@
+from django import template
+from django.utils.html import format_html
+
+from products import images
+
+register = template.Library()
+
+
+def _manifest(context, image):
+    # As views de listagem carregam os manifestos da página de uma vez
+    preloaded = context.get('image_manifests') or {}
+    if image.name in preloaded:
+        return preloaded[image.name]
+    return images.manifest(image.name)
+
+
+@register.simple_tag(takes_context=True)
+def srcset(context, image, fmt='jpeg'):
+    """Valor do atributo srcset com as derivadas de `image`"""
+    if not image:
+        return ''
+    return images.srcset(_manifest(context, image), fmt)
+
+
+@register.simple_tag(takes_context=True)
+def responsive_image(context, image, size='card', sizes='100vw', alt=''):
+    """
+    <picture> com WebP e JPEG em todos os tamanhos; `size` escolhe o src
+    padrão. Enquanto as derivadas não existem, usa a imagem original.
+    """
+    if not image:
+        return ''
+    data = _manifest(context, image)
+    fallback = data.get((size, 'jpeg'), (image.url, None))[0]
+    webp = images.srcset(data, 'webp')
+    jpeg = images.srcset(data, 'jpeg')
+    if not jpeg:
+        return format_html('<img src="{}" alt="{}" loading="lazy">', fallback, alt)
+    if not webp:
+        return format_html(
+            '<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="lazy">',
+            fallback, jpeg, sizes, alt,
+        )
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="lazy">'
+        '</picture>',
+        webp, sizes, fallback, jpeg, sizes, alt,
+    )
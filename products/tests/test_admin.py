@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from products.models import Category, Product
+
+User = get_user_model()
+
+
+class AdminChangelistQueryBudgetTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com',
+            full_name='Admin',
+            password='password123',
+        )
+        self.client.force_login(self.admin)
+
+    def populate(self, categories, products_per_category):
+        for c in range(categories):
+            category = Category.objects.create(name=f'Categoria {Category.objects.count()}')
+            Product.objects.bulk_create(
+                Product(
+                    name=f'{category.name} produto {i}',
+                    description='',
+                    price=Decimal('10.00'),
+                    stock=i,
+                    category=category,
+                )
+                for i in range(products_per_category)
+            )
+
+    def queries_for(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_product_changelist_budget_is_fixed(self):
+        url = reverse('admin:products_product_changelist')
+        self.populate(1, 2)
+        small = self.queries_for(url)
+        self.populate(5, 10)
+        large = self.queries_for(url)
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 12)
+
+    def test_category_changelist_budget_is_fixed(self):
+        url = reverse('admin:products_category_changelist')
+        self.populate(2, 1)
+        small = self.queries_for(url)
+        self.populate(15, 3)
+        large = self.queries_for(url)
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 8)
+
+    def test_category_product_count_annotated(self):
+        self.populate(1, 3)
+        response = self.client.get(reverse('admin:products_category_changelist'))
+        self.assertContains(response, '3 produto(s)')
+
+    def test_product_search_by_name_prefix(self):
+        self.populate(2, 2)
+        url = reverse('admin:products_product_changelist')
+        response = self.client.get(url, {'q': 'categoria'})
+        self.assertEqual(response.context['cl'].result_count, 4)
+        # Só prefixo do nome, não qualquer trecho
+        response = self.client.get(url, {'q': 'produto'})
+        self.assertEqual(response.context['cl'].result_count, 0)
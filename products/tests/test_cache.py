@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from products import cache as catalog_cache
+from products import inventory
+from products.models import Category, Product
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'products-cache-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CatalogCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Coleiras")
+        self.product = Product.objects.create(
+            name="Coleira azul",
+            description="Coleira ajustável",
+            price=Decimal('25.00'),
+            stock=3,
+            category=self.category,
+        )
+        catalog_cache.reset_stats()
+
+    def detail_url(self):
+        return reverse('detail_product', kwargs={'product_id': self.product.id})
+
+    def test_detail_second_hit_served_from_cache(self):
+        response = self.client.get(self.detail_url())
+        self.assertContains(response, "Coleira azul")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url())
+        self.assertContains(response, "Coleira azul")
+        self.assertEqual(catalog_cache.cache_stats()['hits'], 1)
+        self.assertEqual(catalog_cache.cache_stats()['misses'], 1)
+
+    def test_detail_invalidated_on_product_save(self):
+        self.client.get(self.detail_url())
+        self.product.name = "Coleira vermelha"
+        self.product.save()
+
+        response = self.client.get(self.detail_url())
+        self.assertContains(response, "Coleira vermelha")
+
+    def test_detail_invalidated_on_stock_reservation(self):
+        self.client.get(self.detail_url())
+        version = catalog_cache.catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.reserve({self.product.pk: 2})
+
+        self.assertContains(self.client.get(self.detail_url()), "Em estoque (1)")
+        self.assertNotEqual(catalog_cache.catalog_version(), version)
+
+    def test_list_rows_follow_category_rename(self):
+        self.assertContains(self.client.get(reverse('list_products')), "Coleiras")
+        self.category.name = "Guias"
+        self.category.save()
+        self.assertContains(self.client.get(reverse('list_products')), "Guias")
+
+    def test_detail_invalidated_on_category_rename(self):
+        self.client.get(self.detail_url())
+        self.category.name = "Coleiras e guias"
+        self.category.save()
+
+        response = self.client.get(self.detail_url())
+        self.assertContains(response, "Coleiras e guias")
+
+    def test_detail_missing_product_returns_404(self):
+        response = self.client.get(reverse('detail_product', kwargs={'product_id': 9999}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_served_from_cache_until_product_changes(self):
+        self.client.get(reverse('list_products'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('list_products'))
+
+        Product.objects.create(
+            name="Coleira verde",
+            description="",
+            price=Decimal('20.00'),
+            stock=1,
+            category=self.category,
+        )
+        response = self.client.get(reverse('list_products'))
+        self.assertContains(response, "Coleira verde")
+
+    def test_list_invalidated_on_delete(self):
+        self.client.get(reverse('list_products'))
+        self.product.delete()
+        response = self.client.get(reverse('list_products'))
+        self.assertNotContains(response, "Coleira azul")
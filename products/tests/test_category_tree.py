@@ -0,0 +1,172 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from products import tree
+from products.models import MAX_DEPTH, PATH_SEGMENT_WIDTH, Category, Product
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'category-tree-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CategoryTreeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dogs = Category.objects.create(name='Cães')
+        self.food = Category.objects.create(name='Alimentação', parent=self.dogs)
+        self.dry = Category.objects.create(name='Ração seca', parent=self.food)
+        self.cats = Category.objects.create(name='Gatos')
+
+    def create_product(self, name, category, **kwargs):
+        return Product.objects.create(
+            name=name, description='', price=Decimal('10.00'), stock=1, category=category, **kwargs,
+        )
+
+    def test_paths_and_depths(self):
+        self.assertEqual(self.dry.depth, 2)
+        self.assertTrue(self.dry.path.startswith(self.food.path))
+        self.assertTrue(self.food.path.startswith(self.dogs.path))
+        self.assertEqual(
+            set(self.dogs.get_descendants(include_self=False)),
+            {self.food, self.dry},
+        )
+
+    def test_subtree_products_in_one_query(self):
+        self.create_product('Ração A', self.dry)
+        self.create_product('Petisco', self.food)
+        self.create_product('Arranhador', self.cats)
+
+        with self.assertNumQueries(1):
+            names = set(
+                Product.objects.filter(self.dogs.subtree_q(prefix='category__'))
+                .values_list('name', flat=True)
+            )
+        self.assertEqual(names, {'Ração A', 'Petisco'})
+
+    def test_moving_a_category_moves_its_subtree(self):
+        self.food.parent = self.cats
+        self.food.save()
+
+        self.dry.refresh_from_db()
+        self.assertTrue(self.dry.path.startswith(self.cats.path))
+        self.assertEqual(self.dry.depth, 2)
+        self.assertNotIn(self.dry, self.dogs.get_descendants())
+
+    def test_cannot_move_under_own_descendant(self):
+        self.dogs.parent = self.dry
+        with self.assertRaises(ValidationError):
+            self.dogs.full_clean()
+        with self.assertRaises(ValidationError):
+            self.dogs.save()
+
+    def chain(self, levels, parent=None):
+        for level in range(levels):
+            parent = Category.objects.create(name=f'Nível {level}', parent=parent)
+        return parent
+
+    def test_tree_depth_is_limited_by_path_length(self):
+        deepest = self.chain(MAX_DEPTH + 1)
+        self.assertEqual(deepest.depth, MAX_DEPTH)
+        self.assertLessEqual(len(deepest.path), Category._meta.get_field('path').max_length)
+
+        with self.assertRaises(ValidationError):
+            Category.objects.create(name='Fundo demais', parent=deepest)
+        # A subárvore de Cães tem 3 níveis e não cabe sob um nível profundo
+        self.dogs.parent = Category.objects.get(path=deepest.path[:-(PATH_SEGMENT_WIDTH + 1) * 2])
+        with self.assertRaises(ValidationError):
+            self.dogs.save()
+        self.dry.refresh_from_db()
+        self.assertEqual(self.dry.depth, 2)
+
+    def test_rebuild_rejects_trees_deeper_than_path_allows(self):
+        deepest = self.chain(MAX_DEPTH + 1)
+        Category.objects.filter(pk=self.dogs.pk).update(parent=deepest)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_category_tree', stdout=StringIO())
+
+    def test_breadcrumbs_are_cached_until_tree_changes(self):
+        self.assertEqual(
+            [name for name, _ in tree.breadcrumbs(self.dry)],
+            ['Cães', 'Alimentação', 'Ração seca'],
+        )
+        with self.assertNumQueries(0):
+            tree.breadcrumbs(self.dry)
+
+        self.food.name = 'Comida'
+        self.food.save()
+        self.assertEqual(tree.breadcrumbs(self.dry)[1][0], 'Comida')
+
+    def test_rebuild_repairs_paths(self):
+        Category.objects.filter(pk=self.dry.pk).update(path='', depth=0)
+        out = StringIO()
+        call_command('rebuild_category_tree', stdout=out)
+        self.assertIn('1 categoria(s)', out.getvalue())
+
+        self.dry.refresh_from_db()
+        self.assertEqual(self.dry.depth, 2)
+        self.assertTrue(self.dry.path.startswith(self.food.path))
+
+    def test_category_page_lists_subtree_products(self):
+        self.create_product('Ração A', self.dry)
+        self.create_product('Arranhador', self.cats)
+
+        response = self.client.get(reverse('category_detail', kwargs={'slug': self.dogs.slug}))
+        self.assertContains(response, 'Ração A')
+        self.assertContains(response, 'Alimentação')
+        self.assertNotContains(response, 'Arranhador')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CategoryPageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dogs = Category.objects.create(name='Cães')
+        self.food = Category.objects.create(name='Alimentação', parent=self.dogs)
+        self.cats = Category.objects.create(name='Gatos')
+        self.product = Product.objects.create(
+            name='Ração A', description='', price=Decimal('10.00'), stock=1, category=self.food,
+        )
+
+    def get(self, category):
+        return self.client.get(reverse('category_detail', kwargs={'slug': category.slug}))
+
+    def test_second_hit_served_from_cache(self):
+        self.assertContains(self.get(self.dogs), 'Ração A')
+        with self.assertNumQueries(0):
+            self.assertContains(self.get(self.dogs), 'Ração A')
+
+    def test_product_change_invalidates_ancestor_pages(self):
+        self.get(self.dogs)
+        self.get(self.food)
+
+        self.product.name = 'Ração B'
+        self.product.save()
+
+        self.assertContains(self.get(self.dogs), 'Ração B')
+        self.assertContains(self.get(self.food), 'Ração B')
+
+    def test_moving_product_invalidates_old_category(self):
+        self.get(self.dogs)
+        self.get(self.cats)
+
+        self.product.category = self.cats
+        self.product.save()
+
+        self.assertNotContains(self.get(self.dogs), 'Ração A')
+        self.assertContains(self.get(self.cats), 'Ração A')
+
+    def test_other_category_pages_survive_product_change(self):
+        self.get(self.cats)
+        self.product.save()
+        with self.assertNumQueries(0):
+            self.get(self.cats)
@@ -0,0 +1,120 @@
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from products import images
+from products.models import Category, ImageDerivative, Product
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def upload(name='foto.png', size=(1600, 900)):
+    buffer = BytesIO()
+    Image.new('RGBA', size, (255, 145, 77, 255)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageDerivativeTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Camas')
+
+    def create_product(self, name='Cama', **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Product.objects.create(
+                name=name, description='', price=Decimal('80.00'), stock=2,
+                category=self.category, image=upload(), **kwargs,
+            )
+
+    def test_upload_generates_all_sizes_and_formats(self):
+        product = self.create_product()
+        derivatives = ImageDerivative.objects.filter(source=product.image.name)
+        self.assertEqual(derivatives.count(), len(images.SIZES) * len(images.available_formats()))
+
+        thumbnail = derivatives.get(size='thumbnail', format='jpeg')
+        self.assertEqual((thumbnail.width, thumbnail.height), (120, 68))
+        self.assertRegex(thumbnail.file, r'^derivatives/.+-thumbnail\.[0-9a-f]{16}\.jpeg$')
+
+    def test_generation_is_idempotent(self):
+        product = self.create_product()
+        self.assertEqual(images.generate_derivatives(product.image.name), 0)
+
+    def test_saving_without_image_change_does_not_reschedule(self):
+        product = self.create_product()
+        product.stock = 5
+        with self.captureOnCommitCallbacks() as callbacks:
+            product.save()
+        self.assertEqual(callbacks, [])
+
+    def test_srcset_tag_uses_cached_manifest(self):
+        product = self.create_product()
+        template = Template("{% load images %}{% srcset product.image 'jpeg' %}")
+        rendered = template.render(Context({'product': product}))
+        self.assertIn('120w', rendered)
+        self.assertIn('1200w', rendered)
+
+        with self.assertNumQueries(0):
+            template.render(Context({'product': product}))
+
+    def test_responsive_image_falls_back_to_original(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            product = Product.objects.create(
+                name='Cama', description='', price=Decimal('80.00'), stock=2,
+                category=self.category, image=upload(),
+            )
+        template = Template("{% load images %}{% responsive_image product.image size='card' %}")
+        with self.captureOnCommitCallbacks(execute=True):
+            rendered = template.render(Context({'product': product}))
+        self.assertIn(product.image.url, rendered)
+
+        rendered = template.render(Context({'product': product}))
+        self.assertIn('<picture>', rendered)
+        self.assertIn('image/webp', rendered)
+
+    def test_pending_manifest_is_cached(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            product = Product.objects.create(
+                name='Cama', description='', price=Decimal('80.00'), stock=2,
+                category=self.category, image=upload(),
+            )
+        template = Template("{% load images %}{% responsive_image product.image %}")
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            template.render(Context({'product': product}))
+            with self.assertNumQueries(0):
+                rendered = template.render(Context({'product': product}))
+        self.assertEqual(len(callbacks), 1)
+        self.assertIn(product.image.url, rendered)
+
+    def test_manifests_loads_many_images_with_one_query(self):
+        sources = [self.create_product(name=f'Cama {i}').image.name for i in range(3)]
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            data = images.manifests(sources)
+        self.assertEqual(set(data), set(sources))
+        self.assertTrue(all(('thumbnail', 'jpeg') in manifest for manifest in data.values()))
+        with self.assertNumQueries(0):
+            self.assertEqual(images.manifests(sources), data)
+
+    def test_tags_use_preloaded_manifests(self):
+        product = self.create_product()
+        cache.clear()
+        manifests = images.manifests([product.image.name])
+        template = Template("{% load images %}{% responsive_image product.image %}{% srcset product.image %}")
+        cache.clear()
+        with self.assertNumQueries(0):
+            rendered = template.render(Context({'product': product, 'image_manifests': manifests}))
+        self.assertIn('<picture>', rendered)
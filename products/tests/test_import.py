@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from products.importing import ProductImporter, read_records
+from products.models import Category, Product
+
+
+class ImportProductsTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(content)
+        return path
+
+    def test_csv_import_creates_categories_and_products(self):
+        Category.objects.create(name='Rações')
+        path = self.write('catalogo.csv', (
+            "name,description,price,stock,category\n"
+            "Ração A,Boa,10.50,5,Rações\n"
+            "Bola,Colorida,\"3,90\",10,Brinquedos\n"
+            "Osso,,2.00,1,Brinquedos\n"
+        ))
+        out = StringIO()
+        call_command('import_products', path, stdout=out)
+
+        self.assertEqual(Product.objects.count(), 3)
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(Product.objects.get(name='Bola').price, Decimal('3.90'))
+        self.assertEqual(Category.objects.get(name='Brinquedos').slug, 'brinquedos')
+        self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+
+    def test_existing_products_are_updated(self):
+        category = Category.objects.create(name='Rações')
+        product = Product.objects.create(
+            name='Ração A', description='Antiga', price=Decimal('9.00'), stock=1, category=category,
+        )
+        path = self.write('catalogo.jsonl', json.dumps(
+            {'name': 'Ração A', 'description': 'Nova', 'price': '12.00', 'stock': 7, 'category': 'Rações'}
+        ) + '\n')
+        call_command('import_products', path, stdout=StringIO())
+
+        product.refresh_from_db()
+        self.assertEqual(Product.objects.count(), 1)
+        self.assertEqual(product.description, 'Nova')
+        self.assertEqual(product.stock, 7)
+
+    def test_moved_product_leaves_old_category_page(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        dogs = Category.objects.create(name='Cães')
+        Category.objects.create(name='Gatos')
+        Product.objects.create(name='Caminha', description='', price=Decimal('50.00'), stock=1, category=dogs)
+        page = reverse('category_detail', kwargs={'slug': dogs.slug})
+        self.assertContains(self.client.get(page), 'Caminha')
+
+        path = self.write('catalogo.csv', "name,description,price,stock,category\nCaminha,,50.00,1,Gatos\n")
+        ProductImporter().run(read_records(path))
+
+        self.assertNotContains(self.client.get(page), 'Caminha')
+
+    def test_invalid_rows_are_reported(self):
+        path = self.write('catalogo.csv', (
+            "name,description,price,stock,category\n"
+            ",Sem nome,1.00,1,X\n"
+            "Preço ruim,,abc,1,X\n"
+            "Estoque ruim,,1.00,-2,X\n"
+            "Bom,,1.00,2,X\n"
+        ))
+        rejects = os.path.join(self.tmpdir.name, 'rejeitados.csv')
+        call_command('import_products', path, '--rejects', rejects, stdout=StringIO())
+
+        self.assertEqual(list(Product.objects.values_list('name', flat=True)), ['Bom'])
+        with open(rejects, encoding='utf-8') as report:
+            self.assertEqual(len(report.read().splitlines()), 4)
+
+    def test_chunk_query_count_is_constant(self):
+        Category.objects.create(name='Rações')
+        lines = ["name,description,price,stock,category"]
+        lines += [f"Produto {i},,1.00,1,Rações" for i in range(50)]
+        path = self.write('catalogo.csv', '\n'.join(lines) + '\n')
+
+        importer = ProductImporter(chunk_size=100)
+        # savepoint, linhas existentes, upsert, release, ids dos criados,
+        # paths e slugs das categorias para invalidar as páginas delas e,
+        # para o índice de busca, produtos + savepoint, upsert, release
+        with self.assertNumQueries(11):
+            importer.run(read_records(path))
+        self.assertEqual(Product.objects.count(), 50)
+
+    def test_resume_from_checkpoint(self):
+        lines = ["name,description,price,stock,category"]
+        lines += [f"Produto {i},,1.00,1,Rações" for i in range(5)]
+        path = self.write('catalogo.csv', '\n'.join(lines) + '\n')
+        checkpoint = f'{path}.checkpoint'
+        with open(checkpoint, 'w') as output:
+            json.dump({'last_record': 3}, output)
+
+        call_command('import_products', path, '--resume', stdout=StringIO())
+        self.assertEqual(
+            sorted(Product.objects.values_list('name', flat=True)),
+            ['Produto 3', 'Produto 4'],
+        )
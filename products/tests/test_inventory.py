@@ -0,0 +1,213 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from orders.models import Order, OrderItem, OrderStatus, PaymentMethod
+from products import inventory
+from products.models import Category, Product
+
+User = get_user_model()
+
+
+class StockReservationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Estoque')
+        cls.products = [
+            Product.objects.create(
+                name=f'Ração {i}',
+                description='',
+                price=Decimal('10.00'),
+                stock=5,
+                category=cls.category,
+            )
+            for i in range(3)
+        ]
+
+    def stock(self):
+        return list(Product.objects.order_by('pk').values_list('stock', flat=True))
+
+    def test_reserve_is_single_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            inventory.reserve({p.pk: 2 for p in self.products})
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.stock(), [3, 3, 3])
+
+    def test_reserve_is_all_or_nothing(self):
+        first, second, third = self.products
+        with self.assertRaises(inventory.InsufficientStock) as raised:
+            inventory.reserve({first.pk: 1, second.pk: 6, third.pk: 1})
+        self.assertEqual(raised.exception.product_ids, [second.pk])
+        self.assertEqual(self.stock(), [5, 5, 5])
+
+    def test_release_returns_stock(self):
+        inventory.reserve([(self.products[0].pk, 4)])
+        inventory.release([(self.products[0].pk, 4)])
+        self.assertEqual(self.stock(), [5, 5, 5])
+
+    def test_order_cancel_releases_reservation_once(self):
+        user = User.objects.create_user(
+            email='estoque@example.com', full_name='Estoque', password='password123',
+        )
+        order = Order.objects.create(
+            user=user,
+            status=OrderStatus.PENDENTE,
+            total=Decimal('0.01'),
+            shipping_address='Rua Estoque, 1',
+            payment_method=PaymentMethod.PIX,
+        )
+        order.add_items([(self.products[0], 2), (self.products[1], 1)])
+
+        order.reserve_stock()
+        order.reserve_stock()
+        self.assertEqual(self.stock(), [3, 4, 5])
+
+        order.cancel()
+        order.refresh_from_db()
+        self.assertEqual(order.status, OrderStatus.CANCELADO)
+        self.assertFalse(order.stock_reserved)
+        self.assertEqual(self.stock(), [5, 5, 5])
+
+        order.release_stock()
+        self.assertEqual(self.stock(), [5, 5, 5])
+
+    def test_item_edits_follow_the_reservation(self):
+        user = User.objects.create_user(
+            email='edicao@example.com', full_name='Edição', password='password123',
+        )
+        order = Order.objects.create(
+            user=user,
+            status=OrderStatus.PENDENTE,
+            total=Decimal('0.01'),
+            shipping_address='Rua Estoque, 2',
+            payment_method=PaymentMethod.PIX,
+        )
+        order.add_items([(self.products[0], 2)])
+        order.reserve_stock()
+
+        order.add_items([(self.products[1], 1)])
+        order.update_quantities({self.products[0].pk: 4})
+        self.assertEqual(self.stock(), [1, 4, 5])
+
+        with self.assertRaises(inventory.InsufficientStock):
+            order.update_quantities({self.products[1].pk: 6})
+        self.assertEqual(self.stock(), [1, 4, 5])
+
+        order.remove_items([self.products[1].pk])
+        order.release_stock()
+        self.assertEqual(self.stock(), [5, 5, 5])
+
+    def test_single_item_save_and_delete_follow_the_reservation(self):
+        # O caminho do OrderItemAdmin: save()/delete() de um item por vez
+        user = User.objects.create_user(
+            email='item@example.com', full_name='Item', password='password123',
+        )
+        order = Order.objects.create(
+            user=user,
+            status=OrderStatus.PENDENTE,
+            total=Decimal('0.01'),
+            shipping_address='Rua Estoque, 3',
+            payment_method=PaymentMethod.PIX,
+        )
+        order.add_items([(self.products[0], 2)])
+        order.reserve_stock()
+        item = order.items.get()
+
+        item.quantity = 5
+        item.save()
+        self.assertEqual(self.stock(), [0, 5, 5])
+        item.quantity = 1
+        item.save()
+        self.assertEqual(self.stock(), [4, 5, 5])
+
+        other = OrderItem.objects.create(
+            order=order, product=self.products[1], quantity=2, unit_price=Decimal('10.00'),
+        )
+        self.assertEqual(self.stock(), [4, 3, 5])
+        other.quantity = 9
+        with self.assertRaises(inventory.InsufficientStock):
+            other.save()
+        self.assertEqual(OrderItem.objects.get(pk=other.pk).quantity, 2)
+
+        item.product = self.products[2]
+        item.save()
+        self.assertEqual(self.stock(), [5, 3, 4])
+        other.delete()
+        self.assertEqual(self.stock(), [5, 5, 4])
+
+        order.release_stock()
+        self.assertEqual(self.stock(), [5, 5, 5])
+
+    def test_reserve_touches_updated_at(self):
+        before = Product.objects.get(pk=self.products[0].pk).updated_at
+        inventory.reserve({self.products[0].pk: 1})
+        self.assertGreater(Product.objects.get(pk=self.products[0].pk).updated_at, before)
+
+
+class StockReservationStressTest(TransactionTestCase):
+    """Várias threads disputando o mesmo estoque não podem vender a mais"""
+
+    WORKERS = 8
+    ATTEMPTS = 10
+    STOCK = 25
+
+    def setUp(self):
+        category = Category.objects.create(name='Concorrência')
+        self.product = Product.objects.create(
+            name='Areia',
+            description='',
+            price=Decimal('30.00'),
+            stock=self.STOCK,
+            category=category,
+        )
+
+    def reserve_with_retry(self, quantities):
+        """(reservou?, UPDATEs da tentativa que terminou)"""
+        # SQLite serializa escritas; "database is locked" só significa tentar de novo
+        while True:
+            with CaptureQueriesContext(connection) as ctx:
+                try:
+                    inventory.reserve(quantities)
+                    ok = True
+                except inventory.InsufficientStock:
+                    ok = False
+                except OperationalError:
+                    time.sleep(0.001)
+                    continue
+            updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+            return ok, len(updates)
+
+    def test_no_oversell_under_contention(self):
+        results = []
+        lock = threading.Lock()
+        start = threading.Barrier(self.WORKERS)
+
+        def worker():
+            try:
+                start.wait()
+                for _ in range(self.ATTEMPTS):
+                    result = self.reserve_with_retry({self.product.pk: 1})
+                    with lock:
+                        results.append(result)
+            finally:
+                close_old_connections()
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.product.refresh_from_db()
+        self.assertEqual(len(results), self.WORKERS * self.ATTEMPTS)
+        self.assertEqual([ok for ok, _ in results].count(True), self.STOCK)
+        self.assertEqual(self.product.stock, 0)
+        # Mesmo disputada, cada reserva (aceita ou recusada) é um único UPDATE condicional
+        self.assertEqual({updates for _, updates in results}, {1})
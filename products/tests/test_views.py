@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from products.models import Category, Product
+from products.views import PRODUCTS_PER_PAGE
+
+
+class ListProductsViewTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Brinquedos")
+
+    def create_products(self, count, start=0, with_image=False):
+        for i in range(start, start + count):
+            Product.objects.create(
+                name=f"Produto {i}",
+                description="Descrição",
+                price=Decimal('10.00'),
+                stock=5,
+                category=self.category,
+                image=f"products/produto-{i}.jpg" if with_image else '',
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_catalog(self):
+        self.create_products(3)
+        small = self.count_queries(reverse('list_products'))
+
+        self.create_products(60, start=3)
+        large = self.count_queries(reverse('list_products'))
+
+        self.assertEqual(small, large)
+        # Produtos com a categoria + notas de avaliação
+        self.assertEqual(large, 2)
+
+    def test_query_count_does_not_grow_with_product_images(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.create_products(2, with_image=True)
+        small = self.count_queries(reverse('list_products'))
+
+        self.create_products(10, start=2, with_image=True)
+        large = self.count_queries(reverse('list_products'))
+
+        self.assertEqual(small, large)
+        # Produtos, notas e os manifestos das imagens (derivadas ainda pendentes)
+        self.assertEqual(large, 3)
+
+    def test_pages_through_catalog_without_repeats(self):
+        self.create_products(PRODUCTS_PER_PAGE + 5)
+        Product.objects.filter(name="Produto 0").update(is_active=False)
+
+        response = self.client.get(reverse('list_products'))
+        first_page = response.context['products']
+        page = response.context['page']
+        self.assertEqual(len(first_page), PRODUCTS_PER_PAGE)
+        self.assertTrue(page.has_next)
+
+        response = self.client.get(reverse('list_products'), {'cursor': page.next_cursor})
+        second_page = response.context['products']
+        self.assertEqual(len(second_page), 4)
+        self.assertFalse(response.context['page'].has_next)
+
+        names = [p.name for p in first_page] + [p.name for p in second_page]
+        self.assertEqual(len(set(names)), PRODUCTS_PER_PAGE + 4)
+        self.assertNotIn("Produto 0", names)
+
+    def test_invalid_cursor_returns_bad_request(self):
+        response = self.client.get(reverse('list_products'), {'cursor': 'não-é-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncCatalogViewsTest(TestCase):
+    """As views do catálogo são corrotinas e funcionam sob o handler ASGI"""
+
+    async def test_list_and_detail_under_async_client(self):
+        category = await Category.objects.acreate(name="Petiscos")
+        product = await Product.objects.acreate(
+            name="Bifinho", description="", price=Decimal('7.50'), stock=9, category=category,
+        )
+
+        response = await self.async_client.get(reverse('list_products'))
+        self.assertContains(response, "Bifinho")
+
+        response = await self.async_client.get(
+            reverse('detail_product', kwargs={'product_id': product.pk})
+        )
+        self.assertContains(response, "Bifinho")
+
+        response = await self.async_client.get(
+            reverse('detail_product', kwargs={'product_id': product.pk + 1})
+        )
+        self.assertEqual(response.status_code, 404)
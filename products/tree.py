@@ -0,0 +1,95 @@
+"""
+Operações sobre a árvore de categorias (caminho materializado).
+
+Category.save() mantém path/depth ao criar ou mover uma categoria;
+rebuild_tree() recalcula tudo a partir de parent, para reparo ou depois de
+cargas em lote que não passam pelo save().
+"""
+from django.core.cache import cache
+
+from . import cache as catalog_cache
+from .models import Category, check_depth, path_ids, path_segment
+
+REBUILD_BATCH_SIZE = 500
+
+
+def breadcrumbs(category):
+    """
+    [(nome, slug), ...] da raiz até `category`, em cache até a próxima
+    mudança em qualquer categoria. Na falta, uma consulta pelos pks do path.
+    """
+    key = catalog_cache.breadcrumbs_key(category.pk, catalog_cache.category_tree_version())
+    trail = cache.get(key)
+    if trail is None:
+        ids = path_ids(category.path)
+        ancestors = Category.objects.only('name', 'slug').in_bulk(ids)
+        trail = [(ancestors[pk].name, ancestors[pk].slug) for pk in ids if pk in ancestors]
+        cache.set(key, trail, catalog_cache.cache_timeout())
+    return trail
+
+
+async def abreadcrumbs(category):
+    """Versão assíncrona de breadcrumbs"""
+    key = catalog_cache.breadcrumbs_key(category.pk, await catalog_cache.acategory_tree_version())
+    trail = await cache.aget(key)
+    if trail is None:
+        ids = path_ids(category.path)
+        ancestors = await Category.objects.only('name', 'slug').ain_bulk(ids)
+        trail = [(ancestors[pk].name, ancestors[pk].slug) for pk in ids if pk in ancestors]
+        await cache.aset(key, trail, catalog_cache.cache_timeout())
+    return trail
+
+
+def invalidate_subtree_pages(category_ids):
+    """
+    Invalida a página das categorias informadas e de todos os seus
+    ancestrais, que também listam os produtos delas.
+    """
+    category_ids = {pk for pk in category_ids if pk is not None}
+    if not category_ids:
+        return
+    ancestor_ids = set()
+    for path in Category.objects.filter(pk__in=category_ids).order_by().values_list('path', flat=True):
+        ancestor_ids.update(path_ids(path))
+    slugs = (
+        Category.objects.filter(pk__in=ancestor_ids | category_ids)
+        .order_by()
+        .values_list('slug', flat=True)
+    )
+    catalog_cache.invalidate_category_pages(slugs)
+
+
+def rebuild_tree(batch_size=REBUILD_BATCH_SIZE):
+    """
+    Recalcula path e depth de todas as categorias com uma leitura de
+    (pk, parent_id) e bulk_update só das linhas que mudaram. Retorna quantas
+    foram atualizadas. Levanta ValueError se houver ciclo e ValidationError
+    se a árvore for mais funda que MAX_DEPTH.
+    """
+    rows = list(Category.objects.values_list('pk', 'parent_id', 'path', 'depth'))
+    children = {}
+    for pk, parent_id, _, _ in rows:
+        children.setdefault(parent_id, []).append(pk)
+
+    computed = {}
+    stack = [(pk, '', -1) for pk in children.get(None, [])]
+    while stack:
+        pk, parent_path, parent_depth = stack.pop()
+        check_depth(parent_depth + 1)
+        path = parent_path + path_segment(pk)
+        computed[pk] = (path, parent_depth + 1)
+        stack.extend((child, path, parent_depth + 1) for child in children.get(pk, []))
+    if len(computed) != len(rows):
+        orphans = sorted(pk for pk, *_ in rows if pk not in computed)
+        raise ValueError(f"Categorias em ciclo: {orphans}")
+
+    changed = [
+        Category(pk=pk, path=computed[pk][0], depth=computed[pk][1])
+        for pk, _, path, depth in rows
+        if (path, depth) != computed[pk]
+    ]
+    Category.objects.bulk_update(changed, ['path', 'depth'], batch_size=batch_size)
+    if changed:
+        catalog_cache.bump_category_tree_version()
+        catalog_cache.bump_catalog_version()
+    return len(changed)
@@ -1,12 +1,92 @@
-from django.shortcuts import render, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import BadRequest
+from django.http import HttpResponse
+from django.shortcuts import aget_object_or_404
+from django.template.loader import render_to_string
 
+from petstore.routers import replica_reads
+from reviews.aggregates import aratings_for_products
+
+from . import cache as catalog_cache
+from . import images
 from .models import Product
+from .pagination import InvalidCursor, akeyset_paginate
+
+PRODUCTS_PER_PAGE = 25
+LIST_ORDERING = ('-created_at', '-id')
+
+
+async def arender(request, template_name, context):
+    """
+    Renderiza fora do event loop: sem image_manifests no contexto, as tags
+    de imagem consultam o banco (manifesto das derivadas), o que o ORM
+    síncrono não permite numa corrotina. É o único salto para thread da view.
+    """
+    content = await sync_to_async(render_to_string)(template_name, context, request)
+    return HttpResponse(content)
+
+
+@replica_reads
+async def list_products(request):
+    cursor = request.GET.get('cursor')
+    page_key = catalog_cache.list_page_key(await catalog_cache.acatalog_version(), cursor)
+    content = await cache.aget(page_key)
+    await catalog_cache.arecord_hit(content is not None)
+    if content is not None:
+        return HttpResponse(content)
 
+    # Apenas as colunas que products/list.html renderiza
+    products = (
+        Product.objects.filter(is_active=True)
+        .select_related('category')
+        .only(
+            'name', 'price', 'stock', 'image', 'created_at', 'updated_at',
+            'category__name', 'category__updated_at',
+        )
+    )
+    try:
+        page = await akeyset_paginate(
+            products,
+            LIST_ORDERING,
+            cursor=cursor,
+            page_size=PRODUCTS_PER_PAGE,
+        )
+    except InvalidCursor:
+        raise BadRequest("Cursor de paginação inválido")
+    ratings = await aratings_for_products(product.name for product in page.items)
+    for product in page.items:
+        product.rating = ratings.get(product.name)
+    # Manifestos das imagens da página numa leitura só, não um por linha
+    manifests = await images.amanifests(product.image.name for product in page.items)
+    timeout = catalog_cache.cache_timeout()
+    response = await arender(
+        request,
+        'products/list.html',
+        {'products': page.items, 'page': page, 'cache_timeout': timeout, 'image_manifests': manifests},
+    )
+    await cache.aset(page_key, response.content, timeout)
+    return response
 
-def list_products(request):
-    products = Product.objects.filter(is_active=True)
-    return render(request, 'products/list.html', {'products': products})
+@replica_reads
+async def detail_product(request, product_id):
+    version = await cache.aget(catalog_cache.product_version_key(product_id))
+    if version is not None:
+        content = await cache.aget(catalog_cache.detail_page_key(product_id, version))
+        if content is not None:
+            await catalog_cache.arecord_hit(True)
+            return HttpResponse(content)
+    await catalog_cache.arecord_hit(False)
 
-def detail_product(request, product_id):
-    product = get_object_or_404(Product, id=product_id)
-    return render(request, 'products/detail.html', {'product': product})
+    product = await aget_object_or_404(Product.objects.select_related('category'), id=product_id)
+    version = catalog_cache.product_version(product)
+    response = await arender(request, 'products/detail.html', {'product': product})
+    timeout = catalog_cache.cache_timeout()
+    await cache.aset_many(
+        {
+            catalog_cache.product_version_key(product_id): version,
+            catalog_cache.detail_page_key(product_id, version): response.content,
+        },
+        timeout,
+    )
+    return response
@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import DailyProductSales, DailySales
+
+
+@admin.register(DailySales)
+class DailySalesAdmin(admin.ModelAdmin):
+    list_display = ['day', 'status', 'payment_method', 'order_count', 'revenue']
+    list_filter = ['status', 'payment_method']
+    date_hierarchy = 'day'
+
+
+@admin.register(DailyProductSales)
+class DailyProductSalesAdmin(admin.ModelAdmin):
+    list_display = ['day', 'product', 'category', 'status', 'quantity', 'revenue']
+    list_filter = ['status']
+    list_select_related = ['product', 'category']
+    date_hierarchy = 'day'
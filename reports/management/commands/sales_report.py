@@ -0,0 +1,49 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports import sales
+
+REPORTS = {
+    'day': (sales.revenue_by_day, 'day'),
+    'payment': (sales.revenue_by_payment_method, 'payment_method'),
+    'status': (sales.revenue_by_status, 'status'),
+    'category': (sales.revenue_by_category, 'category__name'),
+    'product': (sales.revenue_by_product, 'product__name'),
+}
+
+
+class Command(BaseCommand):
+    """
+    Atualiza os rollups de vendas e imprime relatórios a partir deles.
+    """
+
+    help = "Relatório de vendas por dia, pagamento, status, categoria ou produto"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--by', choices=sorted(REPORTS), default='day')
+        parser.add_argument('--start', type=date.fromisoformat, help="AAAA-MM-DD")
+        parser.add_argument('--end', type=date.fromisoformat, help="AAAA-MM-DD")
+        parser.add_argument(
+            '--no-refresh',
+            action='store_true',
+            help="Não atualiza os rollups antes de consultar",
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help="Recalcula todos os dias, não só os alterados",
+        )
+
+    def handle(self, *args, **options):
+        if options['start'] and options['end'] and options['start'] > options['end']:
+            raise CommandError("--start deve ser anterior a --end")
+
+        if not options['no_refresh']:
+            days = sales.refresh(full=options['full'])
+            self.stdout.write(f"{len(days)} dia(s) recalculado(s)")
+
+        report, label = REPORTS[options['by']]
+        for row in report(start=options['start'], end=options['end']):
+            count = row.get('order_count', row.get('quantity'))
+            self.stdout.write(f"{str(row[label]):<30} {count:>8} R$ {row['revenue']:>14,.2f}")
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0006_product_products_pr_is_acti_eec6ac_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_run', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SalesDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Dia')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('enviado', 'Enviado'), ('entregue', 'Entregue'), ('cancelado', ' Cancelado')], max_length=20, verbose_name='Status')),
+                ('payment_method', models.CharField(choices=[('cartão_crédito', 'Cartão de Crédito'), ('cartão_debito', 'Cartão de Débito'), ('boleto', 'Boleto Bancário'), ('pix', 'PIX'), ('dinheiro', 'Dinheiro')], max_length=20, verbose_name='Método de Pagamento')),
+                ('order_count', models.PositiveIntegerField(default=0, verbose_name='Pedidos')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Faturamento')),
+            ],
+            options={
+                'verbose_name': 'Venda diária',
+                'verbose_name_plural': 'Vendas diárias',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'payment_method'), name='daily_sales_unique_day_status_method')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Dia')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('enviado', 'Enviado'), ('entregue', 'Entregue'), ('cancelado', ' Cancelado')], max_length=20, verbose_name='Status')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Quantidade')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Faturamento')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='products.category', verbose_name='Categoria')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='products.product', verbose_name='Produto')),
+            ],
+            options={
+                'verbose_name': 'Venda diária por produto',
+                'verbose_name_plural': 'Vendas diárias por produto',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['category', 'day'], name='reports_dai_categor_b98258_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'product', 'status'), name='daily_product_sales_unique_day_product_status')],
+            },
+        ),
+    ]
@@ -0,0 +1,106 @@
+from django.db import models
+
+from orders.models import OrderStatus, PaymentMethod
+from products.models import Category, Product
+
+
+class DailySales(models.Model):
+    """Pedidos e faturamento por dia, status e método de pagamento"""
+    day = models.DateField(verbose_name="Dia")
+    status = models.CharField(
+        max_length=20,
+        choices=OrderStatus.choices,
+        verbose_name="Status"
+    )
+    payment_method = models.CharField(
+        max_length=20,
+        choices=PaymentMethod.choices,
+        verbose_name="Método de Pagamento"
+    )
+    order_count = models.PositiveIntegerField(default=0, verbose_name="Pedidos")
+    revenue = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Faturamento"
+    )
+
+    class Meta:
+        verbose_name = "Venda diária"
+        verbose_name_plural = "Vendas diárias"
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'status', 'payment_method'],
+                name='daily_sales_unique_day_status_method',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status}/{self.payment_method}: R$ {self.revenue}"
+
+
+class DailyProductSales(models.Model):
+    """Quantidade e faturamento por dia, produto e status do pedido"""
+    day = models.DateField(verbose_name="Dia")
+    status = models.CharField(
+        max_length=20,
+        choices=OrderStatus.choices,
+        verbose_name="Status"
+    )
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='daily_sales',
+        verbose_name="Produto"
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='daily_sales',
+        verbose_name="Categoria"
+    )
+    quantity = models.PositiveIntegerField(default=0, verbose_name="Quantidade")
+    revenue = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Faturamento"
+    )
+
+    class Meta:
+        verbose_name = "Venda diária por produto"
+        verbose_name_plural = "Vendas diárias por produto"
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'product', 'status'],
+                name='daily_product_sales_unique_day_product_status',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['category', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} produto {self.product_id}: {self.quantity} un."
+
+
+class SalesDirtyDay(models.Model):
+    """
+    Dias que precisam ser recalculados mas que não aparecem pelo
+    updated_at dos pedidos (pedido excluído ou com a data alterada).
+    """
+    day = models.DateField(unique=True)
+
+    def __str__(self):
+        return str(self.day)
+
+
+class RollupState(models.Model):
+    """Marca d'água da última atualização de cada conjunto de rollups"""
+    name = models.CharField(max_length=50, unique=True)
+    last_run = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.last_run})"
@@ -0,0 +1,160 @@
+"""
+Relatórios de vendas a partir de rollups diários.
+
+refresh() recalcula apenas os dias cujos pedidos mudaram desde a última
+execução (pelo updated_at de Order/OrderItem e por SalesDirtyDay); as
+funções de consulta leem só as tabelas de rollup, que têm no máximo uma
+linha por dia/status/método ou dia/produto/status.
+
+updated_at é carimbado antes do commit: uma transação mais lenta que a
+leitura do rollup só fica visível depois dela. Por isso a consulta volta
+SALES_ROLLUP_MARGIN antes da execução anterior; os dias dentro da margem
+são recalculados de novo, o que é idempotente.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from orders.models import Order, OrderItem, OrderStatus, SUBTOTAL_EXPRESSION
+
+from .models import DailyProductSales, DailySales, RollupState, SalesDirtyDay
+
+ROLLUP_NAME = 'sales'
+DAYS_PER_BATCH = 31
+
+# Pedidos cancelados não entram no faturamento por padrão
+REVENUE_STATUSES = [status for status in OrderStatus.values if status != OrderStatus.CANCELADO]
+
+
+def changed_days(since):
+    """Dias com pedidos criados, alterados ou excluídos desde `since`"""
+    days = set(SalesDirtyDay.objects.values_list('day', flat=True))
+    if since is None:
+        days.update(Order.objects.values_list('order_data', flat=True).distinct())
+        return days
+    # Transações que carimbaram updated_at antes de `since` mas só
+    # commitaram depois da leitura anterior ainda estão dentro da margem
+    since -= timedelta(seconds=settings.SALES_ROLLUP_MARGIN)
+    days.update(
+        Order.objects.filter(updated_at__gte=since)
+        .values_list('order_data', flat=True).distinct()
+    )
+    days.update(
+        OrderItem.objects.filter(updated_at__gte=since)
+        .values_list('order__order_data', flat=True).distinct()
+    )
+    return days
+
+
+def refresh(full=False):
+    """Atualiza os rollups e retorna os dias recalculados"""
+    state, _ = RollupState.objects.get_or_create(name=ROLLUP_NAME)
+    # Marca d'água tomada antes da leitura; changed_days() ainda recua
+    # SALES_ROLLUP_MARGIN a partir dela para pegar commits atrasados
+    started = timezone.now()
+    days = sorted(changed_days(None if full else state.last_run))
+
+    for start in range(0, len(days), DAYS_PER_BATCH):
+        rebuild_days(days[start:start + DAYS_PER_BATCH])
+
+    SalesDirtyDay.objects.filter(day__in=days).delete()
+    state.last_run = started
+    state.save(update_fields=['last_run'])
+    return days
+
+
+@transaction.atomic
+def rebuild_days(days):
+    DailySales.objects.filter(day__in=days).delete()
+    DailyProductSales.objects.filter(day__in=days).delete()
+
+    orders = (
+        Order.objects.filter(order_data__in=days)
+        .order_by()
+        .values('order_data', 'status', 'payment_method')
+        .annotate(order_count=Count('id'), revenue=Sum('total'))
+    )
+    DailySales.objects.bulk_create(
+        DailySales(
+            day=row['order_data'],
+            status=row['status'],
+            payment_method=row['payment_method'],
+            order_count=row['order_count'],
+            revenue=row['revenue'] or 0,
+        )
+        for row in orders
+    )
+
+    items = (
+        OrderItem.objects.filter(order__order_data__in=days)
+        .order_by()
+        .values('order__order_data', 'order__status', 'product_id', 'product__category_id')
+        .annotate(units=Sum('quantity'), item_revenue=Sum(SUBTOTAL_EXPRESSION))
+    )
+    DailyProductSales.objects.bulk_create(
+        DailyProductSales(
+            day=row['order__order_data'],
+            status=row['order__status'],
+            product_id=row['product_id'],
+            category_id=row['product__category_id'],
+            quantity=row['units'],
+            revenue=row['item_revenue'] or 0,
+        )
+        for row in items
+    )
+
+
+def _period(queryset, start=None, end=None):
+    if start:
+        queryset = queryset.filter(day__gte=start)
+    if end:
+        queryset = queryset.filter(day__lte=end)
+    return queryset
+
+
+def revenue_by_day(start=None, end=None, statuses=REVENUE_STATUSES):
+    return list(
+        _period(DailySales.objects.filter(status__in=statuses), start, end)
+        .values('day')
+        .annotate(order_count=Sum('order_count'), revenue=Sum('revenue'))
+        .order_by('day')
+    )
+
+
+def revenue_by_payment_method(start=None, end=None, statuses=REVENUE_STATUSES):
+    return list(
+        _period(DailySales.objects.filter(status__in=statuses), start, end)
+        .values('payment_method')
+        .annotate(order_count=Sum('order_count'), revenue=Sum('revenue'))
+        .order_by('-revenue')
+    )
+
+
+def revenue_by_status(start=None, end=None):
+    return list(
+        _period(DailySales.objects.all(), start, end)
+        .values('status')
+        .annotate(order_count=Sum('order_count'), revenue=Sum('revenue'))
+        .order_by('-revenue')
+    )
+
+
+def revenue_by_category(start=None, end=None, statuses=REVENUE_STATUSES):
+    return list(
+        _period(DailyProductSales.objects.filter(status__in=statuses), start, end)
+        .values('category_id', 'category__name')
+        .annotate(quantity=Sum('quantity'), revenue=Sum('revenue'))
+        .order_by('-revenue')
+    )
+
+
+def revenue_by_product(start=None, end=None, statuses=REVENUE_STATUSES):
+    return list(
+        _period(DailyProductSales.objects.filter(status__in=statuses), start, end)
+        .values('product_id', 'product__name')
+        .annotate(quantity=Sum('quantity'), revenue=Sum('revenue'))
+        .order_by('-revenue')
+    )
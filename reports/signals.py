@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from orders.models import Order
+
+from .models import SalesDirtyDay
+
+
+def _order_day(instance):
+    # order_data tem default=timezone.now, então pode ser datetime até recarregar
+    return Order._meta.get_field('order_data').to_python(instance.__dict__.get('order_data'))
+
+
+@receiver(post_init, sender=Order)
+def remember_order_day(sender, instance, **kwargs):
+    instance._loaded_order_data = _order_day(instance)
+
+
+@receiver(post_save, sender=Order)
+def mark_previous_day_dirty(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_loaded_order_data', None)
+    current = _order_day(instance)
+    if not created and previous and previous != current:
+        SalesDirtyDay.objects.get_or_create(day=previous)
+    instance._loaded_order_data = current
+
+
+@receiver(post_delete, sender=Order)
+def mark_deleted_order_day_dirty(sender, instance, **kwargs):
+    SalesDirtyDay.objects.get_or_create(day=_order_day(instance))
@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from orders.models import Order, OrderItem, OrderStatus, PaymentMethod
+from products.models import Category, Product
+from reports import sales
+from reports.models import DailySales, RollupState
+
+User = get_user_model()
+
+
+class SalesRollupTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='reports@example.com',
+            full_name='Reports',
+            password='password123',
+        )
+        cls.food = Category.objects.create(name='Rações')
+        cls.toys = Category.objects.create(name='Brinquedos')
+        cls.kibble = Product.objects.create(
+            name='Ração', description='', price=Decimal('50.00'), stock=10, category=cls.food,
+        )
+        cls.ball = Product.objects.create(
+            name='Bola', description='', price=Decimal('10.00'), stock=10, category=cls.toys,
+        )
+
+    def create_order(self, day, items, status=OrderStatus.ENTREGUE, payment_method=PaymentMethod.PIX):
+        order = Order.objects.create(
+            user=self.user,
+            order_data=day,
+            status=status,
+            total=Decimal('0.01'),
+            shipping_address='Rua Relatório, 1',
+            payment_method=payment_method,
+        )
+        order.add_items(items)
+        return order
+
+    def backdate(self, **delta):
+        """Move as gravações existentes para antes da margem da marca d'água"""
+        stamped = timezone.now() - timedelta(**delta)
+        Order.objects.update(updated_at=stamped)
+        OrderItem.objects.update(updated_at=stamped)
+
+    def test_revenue_by_day_and_payment_method(self):
+        self.create_order(date(2025, 1, 1), [(self.kibble, 2)])
+        self.create_order(date(2025, 1, 1), [(self.ball, 1)], payment_method=PaymentMethod.BOLETO)
+        self.create_order(date(2025, 1, 2), [(self.ball, 3)])
+        self.create_order(date(2025, 1, 2), [(self.kibble, 1)], status=OrderStatus.CANCELADO)
+        sales.refresh()
+
+        by_day = sales.revenue_by_day()
+        self.assertEqual(
+            [(row['day'], row['order_count'], row['revenue']) for row in by_day],
+            [(date(2025, 1, 1), 2, Decimal('110.00')), (date(2025, 1, 2), 1, Decimal('30.00'))],
+        )
+        by_method = {row['payment_method']: row['revenue'] for row in sales.revenue_by_payment_method()}
+        self.assertEqual(by_method, {PaymentMethod.PIX: Decimal('130.00'), PaymentMethod.BOLETO: Decimal('10.00')})
+        by_status = {row['status']: row['order_count'] for row in sales.revenue_by_status()}
+        self.assertEqual(by_status[OrderStatus.CANCELADO], 1)
+
+    def test_revenue_by_category_and_product(self):
+        self.create_order(date(2025, 2, 1), [(self.kibble, 1), (self.ball, 2)])
+        sales.refresh()
+
+        by_category = {row['category__name']: row['revenue'] for row in sales.revenue_by_category()}
+        self.assertEqual(by_category, {'Rações': Decimal('50.00'), 'Brinquedos': Decimal('20.00')})
+        by_product = {row['product__name']: row['quantity'] for row in sales.revenue_by_product()}
+        self.assertEqual(by_product, {'Ração': 1, 'Bola': 2})
+
+    def test_refresh_only_recomputes_changed_days(self):
+        self.create_order(date(2025, 3, 1), [(self.kibble, 1)])
+        order = self.create_order(date(2025, 3, 2), [(self.ball, 1)])
+        self.backdate(minutes=30)
+        self.assertEqual(sales.refresh(), [date(2025, 3, 1), date(2025, 3, 2)])
+        self.assertEqual(sales.refresh(), [])
+
+        order.update_quantities({self.ball.id: 4})
+        self.assertEqual(sales.refresh(), [date(2025, 3, 2)])
+        row = DailySales.objects.get(day=date(2025, 3, 2))
+        self.assertEqual(row.revenue, Decimal('40.00'))
+
+    def test_late_commit_inside_margin_is_picked_up(self):
+        self.create_order(date(2025, 3, 5), [(self.kibble, 1)])
+        self.backdate(minutes=30)
+        sales.refresh()
+
+        # Carimbado antes da execução anterior, mas commitado depois dela
+        late = self.create_order(date(2025, 3, 6), [(self.ball, 1)])
+        stamped = RollupState.objects.get(name=sales.ROLLUP_NAME).last_run - timedelta(minutes=1)
+        Order.objects.filter(pk=late.pk).update(updated_at=stamped)
+        OrderItem.objects.filter(order=late).update(updated_at=stamped)
+
+        self.assertEqual(sales.refresh(), [date(2025, 3, 6)])
+        self.assertEqual(DailySales.objects.get(day=date(2025, 3, 6)).revenue, Decimal('10.00'))
+
+    def test_deleted_and_moved_orders_are_picked_up(self):
+        first = self.create_order(date(2025, 4, 1), [(self.kibble, 1)])
+        second = self.create_order(date(2025, 4, 2), [(self.ball, 1)])
+        sales.refresh()
+
+        first.delete()
+        second = Order.objects.get(pk=second.pk)
+        second.order_data = date(2025, 4, 3)
+        second.save()
+
+        self.assertEqual(sales.refresh(), [date(2025, 4, 1), date(2025, 4, 2), date(2025, 4, 3)])
+        self.assertEqual(list(DailySales.objects.values_list('day', flat=True)), [date(2025, 4, 3)])
+
+    def test_reports_read_only_rollups(self):
+        self.create_order(date(2025, 5, 1), [(self.kibble, 1)])
+        sales.refresh()
+        with self.assertNumQueries(1):
+            sales.revenue_by_day(start=date(2025, 5, 1), end=date(2025, 5, 31))
+
+    def test_management_command(self):
+        self.create_order(date(2025, 6, 1), [(self.kibble, 1)])
+        out = StringIO()
+        call_command('sales_report', '--by', 'category', stdout=out)
+        self.assertIn('Rações', out.getvalue())
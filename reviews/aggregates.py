@@ -0,0 +1,119 @@
+"""
+Manutenção incremental de ReviewAggregate.
+
+Só reviews aprovadas entram nos totais. Cada mudança de uma review é
+tratada como "retira a contribuição antiga, soma a nova", aplicada com
+UPDATEs usando F() para não perder alterações concorrentes.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Now
+
+from products import cache as catalog_cache
+
+from .models import Review, ReviewAggregate
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def contribution(review):
+    """(category_id, product_name, rating, would_recommend) ou None se não conta"""
+    if review is None or review.status != 'approved':
+        return None
+    return (review.category_id, review.product_name, review.rating, review.would_recommend)
+
+
+def apply_change(old, new):
+    """Ajusta os agregados da contribuição `old` para `new` (qualquer um pode ser None)"""
+    if old == new:
+        return
+    with transaction.atomic():
+        if old is not None:
+            _apply(old, -1)
+        if new is not None:
+            _apply(new, +1)
+    # A listagem de produtos mostra as notas
+    catalog_cache.bump_catalog_version()
+
+
+def _apply(contrib, sign):
+    category_id, product_name, rating, would_recommend = contrib
+    values = {
+        'review_count': F('review_count') + sign,
+        'rating_sum': F('rating_sum') + sign * rating,
+        f'stars_{rating}': F(f'stars_{rating}') + sign,
+        # update() não passa por auto_now; a linha da listagem usa updated_at na chave
+        'updated_at': Now(),
+    }
+    if would_recommend:
+        values['recommend_count'] = F('recommend_count') + sign
+
+    keys = []
+    if category_id is not None:
+        keys.append({'scope': ReviewAggregate.SCOPE_CATEGORY, 'category_id': category_id})
+    if product_name:
+        keys.append({'scope': ReviewAggregate.SCOPE_PRODUCT, 'product_name': product_name})
+    for key in keys:
+        if sign > 0:
+            ReviewAggregate.objects.get_or_create(**key)
+        ReviewAggregate.objects.filter(**key).update(**values)
+
+
+def ratings_for_products(names):
+    """{product_name: ReviewAggregate} para os nomes informados, em uma consulta"""
+    return {
+        aggregate.product_name: aggregate
+        for aggregate in ReviewAggregate.objects.filter(
+            scope=ReviewAggregate.SCOPE_PRODUCT,
+            product_name__in=set(names),
+        )
+    }
+
+
+async def aratings_for_products(names):
+    """Versão assíncrona de ratings_for_products"""
+    return {
+        aggregate.product_name: aggregate
+        async for aggregate in ReviewAggregate.objects.filter(
+            scope=ReviewAggregate.SCOPE_PRODUCT,
+            product_name__in=set(names),
+        )
+    }
+
+
+def rebuild(batch_size=REBUILD_BATCH_SIZE):
+    """
+    Recalcula todos os agregados a partir da tabela review.
+
+    Cada escopo é um GROUP BY percorrido com iterator() e gravado com
+    bulk_create em lotes, então nem o resultado inteiro fica em memória.
+    """
+    totals = {
+        'review_count': Count('pk'),
+        'rating_sum': Sum('rating'),
+        'recommend_count': Count('pk', filter=Q(would_recommend=True)),
+        **{
+            f'stars_{stars}': Count('pk', filter=Q(rating=stars))
+            for stars in range(1, 6)
+        },
+    }
+    approved = Review.objects.filter(status='approved').order_by()
+    passes = [
+        (ReviewAggregate.SCOPE_CATEGORY, 'category_id', approved.exclude(category__isnull=True)),
+        (ReviewAggregate.SCOPE_PRODUCT, 'product_name', approved.exclude(product_name='')),
+    ]
+    created = 0
+    with transaction.atomic():
+        ReviewAggregate.objects.all().delete()
+        for scope, key, queryset in passes:
+            rows = queryset.values(key).annotate(**totals).order_by(key)
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(ReviewAggregate(scope=scope, **row))
+                if len(batch) >= batch_size:
+                    created += len(ReviewAggregate.objects.bulk_create(batch))
+                    batch = []
+            if batch:
+                created += len(ReviewAggregate.objects.bulk_create(batch))
+    catalog_cache.bump_catalog_version()
+    return created
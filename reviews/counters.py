@@ -0,0 +1,223 @@
+"""
+Contadores com escrita adiada (write-behind) para os campos de Review.
+
+Cada incremento vai só para o cache (incr atômico). O flush, rodado
+periodicamente pelo comando flush_review_counters, aplica os deltas
+acumulados com UPDATEs em lote usando F(), então nenhuma visualização
+gera um UPDATE próprio e incrementos concorrentes não se perdem.
+
+Para saber quais linhas têm deltas pendentes sem varrer o cache, o
+primeiro incremento de cada linha grava uma entrada num diário numerado
+(seq). O flush lê o diário a partir do último número processado.
+"""
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+# Depois disso a linha pode ser registrada de novo no diário, caso a
+# entrada original tenha se perdido (despejo do cache, processo morto).
+DIRTY_TTL = 60 * 10
+LOCK_TTL = 60 * 5
+FLUSH_BATCH_SIZE = 500
+
+
+class BufferedCounter:
+    def __init__(self, model_label, fields):
+        self.model_label = model_label
+        self.fields = tuple(fields)
+        self.prefix = f'counter:{model_label.lower()}'
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    # Chaves
+
+    def _delta_key(self, pk, field):
+        return f'{self.prefix}:{pk}:{field}'
+
+    def _dirty_key(self, pk):
+        return f'{self.prefix}:{pk}:dirty'
+
+    def _journal_key(self, seq):
+        return f'{self.prefix}:journal:{seq}'
+
+    @property
+    def _seq_key(self):
+        return f'{self.prefix}:seq'
+
+    @property
+    def _flushed_key(self):
+        return f'{self.prefix}:flushed'
+
+    @property
+    def _stuck_key(self):
+        return f'{self.prefix}:stuck'
+
+    @property
+    def _lock_key(self):
+        return f'{self.prefix}:flush-lock'
+
+    # Escrita
+
+    def increment(self, pk, field, amount=1):
+        if field not in self.fields:
+            raise ValueError(f"{field!r} não é um contador de {self.model_label}")
+        key = self._delta_key(pk, field)
+        if not cache.add(key, amount, None):
+            try:
+                cache.incr(key, amount)
+            except ValueError:
+                cache.add(key, amount, None)
+        if cache.add(self._dirty_key(pk), 1, DIRTY_TTL):
+            cache.add(self._seq_key, 0, None)
+            seq = cache.incr(self._seq_key)
+            cache.set(self._journal_key(seq), pk, None)
+
+    # Leitura
+
+    def pending(self, pk):
+        return self.pending_many([pk]).get(pk, {})
+
+    def _pending_keys(self, pks):
+        return {
+            self._delta_key(pk, field): (pk, field)
+            for pk in pks
+            for field in self.fields
+        }
+
+    def _collect_pending(self, keys, values):
+        result = {}
+        for key, value in values.items():
+            if value:
+                pk, field = keys[key]
+                result.setdefault(pk, {})[field] = value
+        return result
+
+    def pending_many(self, pks):
+        """Deltas ainda não gravados, como {pk: {campo: delta}}"""
+        keys = self._pending_keys(pks)
+        return self._collect_pending(keys, cache.get_many(list(keys)))
+
+    async def apending_many(self, pks):
+        """Versão assíncrona de pending_many"""
+        keys = self._pending_keys(pks)
+        return self._collect_pending(keys, await cache.aget_many(list(keys)))
+
+    def attach_pending(self, instances):
+        """Guarda os deltas pendentes nas instâncias com um único get_many"""
+        instances = list(instances)
+        pending = self.pending_many([obj.pk for obj in instances])
+        return self._attach(instances, pending)
+
+    async def aattach_pending(self, instances):
+        """Versão assíncrona de attach_pending, para views assíncronas"""
+        instances = list(instances)
+        pending = await self.apending_many([obj.pk for obj in instances])
+        return self._attach(instances, pending)
+
+    def _attach(self, instances, pending):
+        for obj in instances:
+            obj._pending_counts = pending.get(obj.pk, {})
+        return instances
+
+    # Flush
+
+    def flush(self):
+        """
+        Aplica os deltas registrados no diário. Retorna quantas linhas
+        foram atualizadas (0 se outro flush já estiver rodando).
+        """
+        if not cache.add(self._lock_key, 1, LOCK_TTL):
+            return 0
+        try:
+            flushed = cache.get(self._flushed_key, 0)
+            current = cache.get(self._seq_key, 0)
+            stuck = cache.get(self._stuck_key)
+            seqs = range(flushed + 1, current + 1)
+            entries = cache.get_many([self._journal_key(seq) for seq in seqs])
+
+            pks = []
+            cursor = flushed
+            blocked = False
+            for seq in seqs:
+                key = self._journal_key(seq)
+                if key in entries:
+                    pks.append(entries[key])
+                elif seq != stuck and not blocked:
+                    # Provavelmente um incremento entre o incr(seq) e o set();
+                    # espera o próximo flush antes de pular esta posição.
+                    cache.set(self._stuck_key, seq, None)
+                    blocked = True
+                if not blocked:
+                    cursor = seq
+
+            updated = self._apply(pks)
+            cache.delete_many([self._journal_key(seq) for seq in range(flushed + 1, cursor + 1)])
+            cache.set(self._flushed_key, cursor, None)
+            return updated
+        finally:
+            cache.delete(self._lock_key)
+
+    def sweep(self, chunk_size=FLUSH_BATCH_SIZE):
+        """
+        Verifica os deltas de todas as linhas da tabela, sem depender do
+        diário. Para reparo; o caminho normal é flush().
+        """
+        updated = 0
+        chunk = []
+        for pk in self.model.objects.values_list('pk', flat=True).iterator(chunk_size=chunk_size):
+            chunk.append(pk)
+            if len(chunk) >= chunk_size:
+                updated += self._apply(chunk)
+                chunk = []
+        if chunk:
+            updated += self._apply(chunk)
+        return updated
+
+    def _apply(self, pks):
+        pks = list(dict.fromkeys(pks))
+        if not pks:
+            return 0
+        cache.delete_many([self._dirty_key(pk) for pk in pks])
+        pending = self.pending_many(pks)
+        if not pending:
+            return 0
+
+        # Retira os deltas do cache antes de gravar; incrementos que chegarem
+        # no meio continuam no cache para o próximo flush.
+        for pk, deltas in pending.items():
+            for field, delta in deltas.items():
+                cache.decr(self._delta_key(pk, field), delta)
+        try:
+            self._write(pending)
+        except Exception:
+            for pk, deltas in pending.items():
+                for field, delta in deltas.items():
+                    self.increment(pk, field, delta)
+            raise
+        return len(pending)
+
+    def _write(self, pending):
+        model = self.model
+        items = list(pending.items())
+        with transaction.atomic():
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                batch = items[start:start + FLUSH_BATCH_SIZE]
+                updates = {}
+                for field in self.fields:
+                    whens = [
+                        When(pk=pk, then=Value(deltas[field]))
+                        for pk, deltas in batch
+                        if field in deltas
+                    ]
+                    if whens:
+                        updates[field] = F(field) + Case(
+                            *whens, default=Value(0), output_field=IntegerField()
+                        )
+                model.objects.filter(pk__in=[pk for pk, _ in batch]).update(**updates)
+
+
+# help_count não passa por aqui: é contagem de votos (reviews.votes.cast_vote)
+review_counters = BufferedCounter('reviews.Review', ('views_count',))
@@ -0,0 +1,39 @@
+"""
+Review feeds: approved reviews of a category, newest first.
+
+Each page is a keyset query over review_feed_idx (status, category,
+-created_at, -id) with author and response joined in, plus one prefetch
+for the images. The number of queries per page is fixed regardless of
+the page size.
+"""
+from products.pagination import akeyset_paginate, keyset_paginate
+
+from .counters import review_counters
+from .models import Review
+
+FEED_ORDERING = ('-created_at', '-id')
+FEED_PAGE_SIZE = 20
+
+
+def category_feed_queryset(category):
+    return (
+        Review.objects.filter(status='approved', category=category)
+        .select_related('author', 'response')
+        .prefetch_related('images')
+    )
+
+
+def category_feed(category, cursor=None, page_size=FEED_PAGE_SIZE):
+    """KeysetPage of approved reviews; raises InvalidCursor for bad cursors"""
+    page = keyset_paginate(category_feed_queryset(category), FEED_ORDERING, cursor, page_size)
+    # View increments still buffered in the cache, in one get_many
+    review_counters.attach_pending(page.items)
+    return page
+
+
+async def acategory_feed(category, cursor=None, page_size=FEED_PAGE_SIZE):
+    """Async version of category_feed"""
+    page = await akeyset_paginate(category_feed_queryset(category), FEED_ORDERING, cursor, page_size)
+    # Cache I/O must not block the event loop either
+    await review_counters.aattach_pending(page.items)
+    return page
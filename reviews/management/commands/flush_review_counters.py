@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.counters import review_counters
+
+
+class Command(BaseCommand):
+    """
+    Grava no banco os incrementos de views_count acumulados no cache.
+    """
+
+    help = "Aplica os contadores pendentes de Review com UPDATEs em lote"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help="Repete o flush a cada N segundos (0 executa uma vez)",
+        )
+        parser.add_argument(
+            '--sweep',
+            action='store_true',
+            help="Verifica todas as reviews em vez de apenas as do diário",
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            if options['sweep']:
+                updated = review_counters.sweep()
+            else:
+                updated = review_counters.flush()
+            self.stdout.write(f"{updated} review(s) atualizada(s)")
+            if not interval:
+                break
+            time.sleep(interval)
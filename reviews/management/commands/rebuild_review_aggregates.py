@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from reviews import aggregates
+
+
+class Command(BaseCommand):
+    """
+    Recalcula ReviewAggregate do zero. Útil depois de alterações em massa
+    (queryset.update) que não disparam os sinais de Review.
+    """
+
+    help = "Reconstrói os agregados de avaliações por categoria e produto"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=aggregates.REBUILD_BATCH_SIZE,
+            help="Linhas lidas e gravadas por lote",
+        )
+
+    def handle(self, *args, **options):
+        created = aggregates.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{created} agregado(s) reconstruído(s)"))
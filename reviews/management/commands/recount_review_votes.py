@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from reviews.votes import RECOUNT_BATCH_SIZE, recount
+
+
+class Command(BaseCommand):
+    """
+    Recalcula help_count/not_help_count de Review a partir de ReviewVote.
+
+    cast_vote() é o único caminho que altera essas contagens; o recálculo
+    só corrige divergências (edições manuais, dados antigos).
+    """
+
+    help = "Corrige as contagens de votos das reviews a partir da tabela de votos"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=RECOUNT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        fixed = recount(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{fixed} review(s) corrigida(s)"))
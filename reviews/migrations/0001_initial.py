@@ -0,0 +1,116 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:57
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0006_product_products_pr_is_acti_eec6ac_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(help_text='Brief title for your review', max_length=200, verbose_name='Review Title')),
+                ('content', models.TextField(help_text='Detail review content', verbose_name='Review Content')),
+                ('rating', models.IntegerField(choices=[(1, '1 Star - Poor'), (2, '2 Stars - Fair'), (3, '3 Stars - Good'), (4, '4 Stars - Very Good'), (5, '5 Stars - Excellent')], help_text='Rate from 1 to 5 stars', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)], verbose_name='rating')),
+                ('product_name', models.CharField(blank=True, help_text='Name of the reviewed product or services', max_length=200, verbose_name='Product/Service Name')),
+                ('pros', models.TextField(blank=True, help_text='What you liked about it', verbose_name='Pros')),
+                ('cons', models.TextField(blank=True, help_text='What could be improved', verbose_name='Cons')),
+                ('would_recommend', models.BooleanField(default=True, help_text='Would you recommend this to orders', verbose_name='Would Recommend')),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending', max_length=10, verbose_name='Status')),
+                ('is_feature', models.BooleanField(default=False, help_text='Mark as feature review', verbose_name='Feature Review')),
+                ('help_count', models.PositiveIntegerField(default=0, verbose_name='Helpful Votes')),
+                ('views_count', models.PositiveIntegerField(default=0, verbose_name='Views Count')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reviewed_at', models.DateTimeField(blank=True, help_text='When the product/service was actually used', null=True, verbose_name='Review Date')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to=settings.AUTH_USER_MODEL, verbose_name='Author')),
+                ('category', models.ForeignKey(blank=True, help_text='Category of the reviewed item', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviews', to='products.category', verbose_name='Category')),
+            ],
+            options={
+                'verbose_name': 'Review',
+                'verbose_name_plural': 'Reviews',
+                'db_table': 'review',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(upload_to='reviews/images/', verbose_name='Image')),
+                ('caption', models.CharField(blank=True, max_length=200, verbose_name='Caption')),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='reviews.review', verbose_name='Review')),
+            ],
+            options={
+                'verbose_name': 'Review Image',
+                'verbose_name_plural': 'Review Images',
+                'db_table': 'review_image',
+                'ordering': ['uploaded_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField(verbose_name='Response Content')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('responder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_responses', to=settings.AUTH_USER_MODEL, verbose_name='Responder')),
+                ('review', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='response', to='reviews.review', verbose_name='Review')),
+            ],
+            options={
+                'verbose_name': 'Review Response',
+                'verbose_name_plural': 'Revivew Responses',
+                'db_table': 'review_response',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewVote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vote_type', models.CharField(choices=[('helpful', 'Helpful'), ('not_helpful', 'Not Helpful')], max_length=11, verbose_name='Vote Type')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='reviews.review')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_votes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Review Vote',
+                'verbose_name_plural': 'Review Votes',
+                'db_table': 'review_vote',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-created_at'], name='review_created_79d38d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['rating'], name='review_rating_d6a32f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['status'], name='review_status_15ed7d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['category'], name='review_categor_4bccfd_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reviewvote',
+            unique_together={('review', 'user')},
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_products_pr_is_acti_eec6ac_idx'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('category', 'Category'), ('product', 'Product')], max_length=10, verbose_name='Scope')),
+                ('product_name', models.CharField(blank=True, max_length=200, verbose_name='Product/Service Name')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+                ('recommend_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='review_aggregates', to='products.category', verbose_name='Category')),
+            ],
+            options={
+                'verbose_name': 'Review Aggregate',
+                'verbose_name_plural': 'Review Aggregates',
+                'db_table': 'review_aggregate',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('scope', 'category')), fields=('category',), name='review_aggregate_unique_category'), models.UniqueConstraint(condition=models.Q(('scope', 'product')), fields=('product_name',), name='review_aggregate_unique_product')],
+            },
+        ),
+    ]
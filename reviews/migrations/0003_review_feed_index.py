@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_category_tree'),
+        ('reviews', '0002_reviewaggregate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['status', 'category', '-created_at', '-id'], name='review_feed_idx'),
+        ),
+    ]
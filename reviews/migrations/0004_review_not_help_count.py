@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_review_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='not_help_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Not Helpful Votes'),
+        ),
+    ]
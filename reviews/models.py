@@ -1,5 +1,5 @@
+from django.conf import settings
 from django.db import models
-from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.urls import reverse
 from django.utils import timezone
@@ -7,6 +7,8 @@ import uuid
 
 from products.models import Category
 
+from .counters import review_counters
+
 class Review(models.Model):
     """
     Review model for products/services
@@ -44,7 +46,7 @@ class Review(models.Model):
     
     # Relacionamentos
     author = models.ForeignKey(
-        User,
+        settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='reviews',
         verbose_name="Author"
@@ -101,6 +103,10 @@ class Review(models.Model):
         default=0,
         verbose_name="Helpful Votes"
     )
+    not_help_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Not Helpful Votes"
+    )
     views_count = models.PositiveIntegerField(
         default=0,
         verbose_name="Views Count"
@@ -126,10 +132,16 @@ class Review(models.Model):
             models.Index(fields=['rating']),
             models.Index(fields=['status']),
             models.Index(fields=['category']),
+            # Feed por categoria (reviews.feeds): filtro + ordenação + desempate do cursor
+            models.Index(
+                fields=['status', 'category', '-created_at', '-id'],
+                name='review_feed_idx',
+            ),
         ]
         
     def __str__(self):
-        return f"{self.title} - {self.rating}* by {self.author.username}"
+        # Sem seguir chaves estrangeiras: listar reviews não dispara consultas extras
+        return f"{self.title} - {self.rating}*"
     
     def get_absolute_url(self):
         return reverse('review-detail', kwargs={'pk': self.pk})
@@ -143,15 +155,26 @@ class Review(models.Model):
         """Retuns rating as stars string"""
         return '⭐' * self.rating + '☆' * (5 - self.rating)
     
-    def increment_helpful(self):
-        """Increment helpful count"""
-        self.help_count += 1
-        self.save(update_fields=['help_count'])
+    def increment_helpful(self, user):
+        """Register a helpful vote from user (see reviews.votes.cast_vote)"""
+        from .votes import HELPFUL, cast_vote
+
+        return cast_vote(self, user, HELPFUL)
         
     def increment_views(self):
-        """Increment views count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """Increment views count (buffered, see reviews.counters)"""
+        review_counters.increment(self.pk, 'views_count')
+    
+    def _pending_count(self, field):
+        pending = getattr(self, '_pending_counts', None)
+        if pending is None:
+            pending = review_counters.pending(self.pk)
+        return pending.get(field, 0)
+    
+    @property
+    def current_views_count(self):
+        """Stored views plus increments not flushed yet"""
+        return self.views_count + self._pending_count('views_count')
         
 class ReviewImage(models.Model):
     """
@@ -176,12 +199,12 @@ class ReviewImage(models.Model):
     
     class Meta:
         db_table = 'review_image'
-        verbose_name = "Review Image",
+        verbose_name = "Review Image"
         verbose_name_plural = "Review Images"
         ordering = ['uploaded_at']
         
     def __str__(self):
-        return f"image for {self.review.title}"
+        return f"image for review {self.review_id}"
     
     
 class ReviewVote(models.Model):
@@ -198,7 +221,7 @@ class ReviewVote(models.Model):
         related_name='votes'
     )
     user = models.ForeignKey(
-        User,
+        settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="review_votes"
     )
@@ -216,7 +239,7 @@ class ReviewVote(models.Model):
         unique_together = ['review', 'user'] # one vote per user per review
         
     def __str__(self):
-        return F"{self.user.username} - {self.vote_type} on {self.review.title}"
+        return f"user {self.user_id} - {self.vote_type} on review {self.review_id}"
     
 
 class ReviewResponse(models.Model):
@@ -230,7 +253,7 @@ class ReviewResponse(models.Model):
         verbose_name='Review'
     )
     responder = models.ForeignKey(
-        User,
+        settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='review_responses',
         verbose_name='Responder'
@@ -248,5 +271,83 @@ class ReviewResponse(models.Model):
         ordering = ['-created_at']
         
     def __str__(self):
-        return f"Response to {self.review.title}"
-    
\ No newline at end of file
+        return f"Response to review {self.review_id}"
+    
+
+class ReviewAggregate(models.Model):
+    """
+    Materialized rating totals of approved reviews, per category or per
+    product name. Kept up to date by reviews.aggregates
+    """
+    SCOPE_CATEGORY = 'category'
+    SCOPE_PRODUCT = 'product'
+    SCOPE_CHOICES = [
+        (SCOPE_CATEGORY, 'Category'),
+        (SCOPE_PRODUCT, 'Product'),
+    ]
+
+    scope = models.CharField(
+        max_length=10,
+        choices=SCOPE_CHOICES,
+        verbose_name="Scope"
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='review_aggregates',
+        verbose_name="Category"
+    )
+    product_name = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name="Product/Service Name"
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+    recommend_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'review_aggregate'
+        verbose_name = "Review Aggregate"
+        verbose_name_plural = "Review Aggregates"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['category'],
+                condition=models.Q(scope='category'),
+                name='review_aggregate_unique_category',
+            ),
+            models.UniqueConstraint(
+                fields=['product_name'],
+                condition=models.Q(scope='product'),
+                name='review_aggregate_unique_product',
+            ),
+        ]
+
+    def __str__(self):
+        key = self.product_name if self.scope == self.SCOPE_PRODUCT else self.category_id
+        return f"{self.scope} {key}: {self.average_rating:.1f}* ({self.review_count})"
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return 0.0
+        return self.rating_sum / self.review_count
+
+    @property
+    def recommend_ratio(self):
+        if not self.review_count:
+            return 0.0
+        return self.recommend_count / self.review_count
+
+    @property
+    def histogram(self):
+        """Review count per star, {1: n, ..., 5: n}"""
+        return {stars: getattr(self, f'stars_{stars}') for stars in range(1, 6)}
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from products import images
+from products.signals import image_name
+
+from . import aggregates
+from .models import Review, ReviewImage
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_contribution(sender, instance, **kwargs):
+    previous = None
+    if not instance._state.adding:
+        previous = (
+            Review.objects.filter(pk=instance.pk)
+            .only('status', 'category_id', 'product_name', 'rating', 'would_recommend')
+            .first()
+        )
+    instance._previous_contribution = aggregates.contribution(previous)
+
+
+@receiver(post_save, sender=Review)
+def update_aggregates_on_save(sender, instance, **kwargs):
+    old = getattr(instance, '_previous_contribution', None)
+    aggregates.apply_change(old, aggregates.contribution(instance))
+    instance._previous_contribution = aggregates.contribution(instance)
+
+
+@receiver(post_delete, sender=Review)
+def update_aggregates_on_delete(sender, instance, **kwargs):
+    aggregates.apply_change(aggregates.contribution(instance), None)
+
+
+@receiver(post_init, sender=ReviewImage)
+def remember_review_image(sender, instance, **kwargs):
+    instance._loaded_image = image_name(instance)
+
+
+@receiver(post_save, sender=ReviewImage)
+def generate_review_image_derivatives(sender, instance, **kwargs):
+    name = image_name(instance)
+    if name and name != getattr(instance, '_loaded_image', None):
+        images.schedule_derivatives(name)
+    instance._loaded_image = name
@@ -0,0 +1,13 @@
+from celery import shared_task
+from django.db import OperationalError
+
+from .counters import review_counters
+
+
+@shared_task(autoretry_for=(OperationalError,), retry_backoff=True, max_retries=3)
+def flush_review_counters():
+    """
+    Aplica os contadores pendentes (agendado pelo beat). Seguro em
+    paralelo: um flush em andamento faz os demais retornarem 0.
+    """
+    return review_counters.flush()
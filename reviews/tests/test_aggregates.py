@@ -0,0 +1,129 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from products.models import Category, Product
+from reviews.aggregates import ratings_for_products
+from reviews.models import Review, ReviewAggregate
+
+User = get_user_model()
+
+
+class ReviewAggregateTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='aggregate@example.com',
+            full_name='Aggregate',
+            password='password123',
+        )
+        self.category = Category.objects.create(name="Rações")
+
+    def create_review(self, rating, status='approved', would_recommend=True, product_name='Ração X'):
+        return Review.objects.create(
+            title="Review",
+            content="Conteúdo",
+            rating=rating,
+            author=self.user,
+            category=self.category,
+            product_name=product_name,
+            status=status,
+            would_recommend=would_recommend,
+        )
+
+    def category_aggregate(self):
+        return ReviewAggregate.objects.get(scope='category', category=self.category)
+
+    def product_aggregate(self, name='Ração X'):
+        return ReviewAggregate.objects.get(scope='product', product_name=name)
+
+    def test_approved_reviews_are_counted(self):
+        self.create_review(5)
+        self.create_review(3, would_recommend=False)
+
+        aggregate = self.product_aggregate()
+        self.assertEqual(aggregate.review_count, 2)
+        self.assertEqual(aggregate.average_rating, 4.0)
+        self.assertEqual(aggregate.recommend_ratio, 0.5)
+        self.assertEqual(aggregate.histogram, {1: 0, 2: 0, 3: 1, 4: 0, 5: 1})
+        self.assertEqual(self.category_aggregate().review_count, 2)
+
+    def test_pending_review_counts_only_after_approval(self):
+        review = self.create_review(4, status='pending')
+        self.assertFalse(ReviewAggregate.objects.exists())
+
+        review.status = 'approved'
+        review.save()
+        self.assertEqual(self.product_aggregate().stars_4, 1)
+
+        review.status = 'rejected'
+        review.save()
+        self.assertEqual(self.product_aggregate().review_count, 0)
+
+    def test_rating_change_moves_histogram_bucket(self):
+        review = self.create_review(2)
+        review.rating = 5
+        review.save()
+
+        aggregate = self.category_aggregate()
+        self.assertEqual(aggregate.stars_2, 0)
+        self.assertEqual(aggregate.stars_5, 1)
+        self.assertEqual(aggregate.rating_sum, 5)
+
+    def test_delete_removes_contribution(self):
+        review = self.create_review(5)
+        self.create_review(1)
+        review.delete()
+
+        aggregate = self.product_aggregate()
+        self.assertEqual(aggregate.review_count, 1)
+        self.assertEqual(aggregate.rating_sum, 1)
+
+    def test_rebuild_matches_incremental_totals(self):
+        self.create_review(5)
+        self.create_review(2, product_name='Ração Y')
+        self.create_review(4, status='pending')
+        # update() skips signals, so the aggregates drift until a rebuild
+        Review.objects.filter(status='pending').update(status='approved')
+
+        call_command('rebuild_review_aggregates', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(self.category_aggregate().review_count, 3)
+        self.assertEqual(self.product_aggregate().review_count, 2)
+        self.assertEqual(self.product_aggregate('Ração Y').stars_2, 1)
+
+    def test_ratings_for_products_single_query(self):
+        self.create_review(5)
+        self.create_review(3, product_name='Ração Y')
+        with self.assertNumQueries(1):
+            ratings = ratings_for_products(['Ração X', 'Ração Y', 'Ração Z'])
+        self.assertEqual(set(ratings), {'Ração X', 'Ração Y'})
+
+
+class ProductListingRatingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='listing@example.com', full_name='Listing', password='password123',
+        )
+        category = Category.objects.create(name="Petiscos")
+        Product.objects.create(
+            name="Bifinho", description="", price=Decimal('8.00'), stock=3, category=category,
+        )
+
+    def review(self, rating):
+        Review.objects.create(
+            title="Review", content="Conteúdo", rating=rating, author=self.user,
+            product_name="Bifinho", status='approved',
+        )
+
+    def test_listing_row_shows_new_review_count(self):
+        self.review(5)
+        self.assertContains(self.client.get(reverse('list_products')), "5,0 ★ (1)")
+        self.review(3)
+        self.assertContains(self.client.get(reverse('list_products')), "4,0 ★ (2)")
@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from reviews.counters import review_counters
+from reviews.models import Review
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'review-counter-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class BufferedReviewCounterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='reviewer@example.com',
+            full_name='Reviewer',
+            password='password123',
+        )
+        self.reviews = [
+            Review.objects.create(
+                title=f"Review {i}",
+                content="Muito bom",
+                rating=5,
+                author=self.user,
+            )
+            for i in range(3)
+        ]
+
+    def test_increment_does_not_touch_database(self):
+        review = self.reviews[0]
+        with self.assertNumQueries(0):
+            review.increment_views()
+            review.increment_views()
+        self.assertEqual(review.current_views_count, 2)
+        review.refresh_from_db()
+        self.assertEqual(review.views_count, 0)
+
+    def test_flush_applies_deltas_in_one_update(self):
+        for review in self.reviews:
+            for _ in range(3):
+                review.increment_views()
+        self.reviews[1].increment_views()
+
+        with self.assertNumQueries(3):  # savepoint + UPDATE + release
+            self.assertEqual(review_counters.flush(), 3)
+
+        for review in self.reviews:
+            review.refresh_from_db()
+        self.assertEqual(
+            [review.views_count for review in self.reviews], [3, 4, 3],
+        )
+        self.assertEqual(self.reviews[1].current_views_count, 4)
+
+    def test_flush_keeps_increments_made_after_it(self):
+        review = self.reviews[0]
+        review.increment_views()
+        review_counters.flush()
+        review.increment_views()
+        review_counters.flush()
+        review.refresh_from_db()
+        self.assertEqual(review.views_count, 2)
+        self.assertEqual(review_counters.flush(), 0)
+
+    def test_lost_journal_entry_is_skipped_on_second_flush(self):
+        review = self.reviews[0]
+        review.increment_views()
+        cache.delete(review_counters._journal_key(1))
+
+        self.assertEqual(review_counters.flush(), 0)
+        self.assertEqual(review_counters.flush(), 0)
+
+        # The delta is still buffered and the sweep picks it up
+        self.assertEqual(review_counters.sweep(), 1)
+        review.refresh_from_db()
+        self.assertEqual(review.views_count, 1)
+
+    def test_attach_pending_reads_all_in_one_call(self):
+        self.reviews[0].increment_views()
+        reviews = review_counters.attach_pending(Review.objects.all())
+        counts = {review.pk: review.current_views_count for review in reviews}
+        self.assertEqual(counts[self.reviews[0].pk], 1)
+        self.assertEqual(counts[self.reviews[1].pk], 0)
+
+    async def test_aattach_pending_reads_all_in_one_call(self):
+        self.reviews[0].increment_views()
+        reviews = await review_counters.aattach_pending([review async for review in Review.objects.all()])
+        counts = {review.pk: review.current_views_count for review in reviews}
+        self.assertEqual(counts[self.reviews[0].pk], 1)
+        self.assertEqual(counts[self.reviews[1].pk], 0)
+
+    def test_management_command(self):
+        self.reviews[0].increment_views()
+        call_command('flush_review_counters', stdout=StringIO())
+        self.reviews[0].refresh_from_db()
+        self.assertEqual(self.reviews[0].views_count, 1)
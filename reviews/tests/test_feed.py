@@ -0,0 +1,114 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from products.models import Category
+from reviews.counters import review_counters
+from reviews.feeds import acategory_feed, category_feed
+from reviews.models import Review, ReviewImage, ReviewResponse
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CategoryFeedTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='feed@example.com', full_name='Leitor Feed', password='password123',
+        )
+        cls.category = Category.objects.create(name='Areias')
+        cls.other = Category.objects.create(name='Aquários')
+        now = timezone.now()
+        cls.reviews = []
+        for i in range(25):
+            review = Review.objects.create(
+                title=f'Review {i}', content='Boa', rating=4, author=cls.user,
+                category=cls.category, status='approved',
+            )
+            cls.reviews.append(review)
+            # created_at distintos e crescentes
+            Review.objects.filter(pk=review.pk).update(created_at=now - timedelta(minutes=25 - i))
+            if i % 2:
+                ReviewResponse.objects.create(review=review, responder=cls.user, content='Obrigado!')
+            if i % 3 == 0:
+                ReviewImage.objects.create(
+                    review=review, image=SimpleUploadedFile(f'r{i}.gif', b'GIF89a'), caption='foto',
+                )
+        Review.objects.create(
+            title='Pendente', content='x', rating=1, author=cls.user,
+            category=cls.category, status='pending',
+        )
+        Review.objects.create(
+            title='Outra categoria', content='x', rating=5, author=cls.user,
+            category=cls.other, status='approved',
+        )
+
+    def render_page(self, page):
+        return [
+            (str(review), review.author.full_name, getattr(review, 'response', None), list(review.images.all()))
+            for review in page.items
+        ]
+
+    def test_query_count_is_fixed_per_page(self):
+        for size in (5, 20):
+            with self.subTest(size=size), self.assertNumQueries(2):
+                self.render_page(category_feed(self.category, page_size=size))
+
+    def test_newest_first_and_pages_without_repeats(self):
+        first = category_feed(self.category, page_size=20)
+        second = category_feed(self.category, cursor=first.next_cursor, page_size=20)
+
+        titles = [r.title for r in first.items + second.items]
+        self.assertEqual(titles, [f'Review {i}' for i in reversed(range(25))])
+        self.assertFalse(second.has_next)
+
+    def test_view(self):
+        response = self.client.get(reverse('category_reviews', kwargs={'slug': self.category.slug}))
+        self.assertContains(response, 'Review 24')
+        self.assertContains(response, 'Obrigado!')
+        self.assertNotContains(response, 'Pendente')
+        self.assertNotContains(response, 'Outra categoria')
+
+    def test_view_query_count_does_not_grow_with_images(self):
+        def feed_with_images(name, count):
+            category = Category.objects.create(name=name)
+            for i in range(count):
+                review = Review.objects.create(
+                    title=f'{name} {i}', content='Boa', rating=5, author=self.user,
+                    category=category, status='approved',
+                )
+                ReviewImage.objects.create(review=review, image=SimpleUploadedFile(f'{name}{i}.gif', b'GIF89a'))
+            return reverse('category_reviews', kwargs={'slug': category.slug})
+
+        counts = []
+        for url in (feed_with_images('Uma foto', 1), feed_with_images('Muitas fotos', 12)):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            counts.append(len(queries))
+        self.addCleanup(cache.clear)
+        self.assertEqual(counts[0], counts[1])
+
+    async def test_async_feed_reads_pending_counters_without_blocking(self):
+        self.addCleanup(cache.clear)
+        review_counters.increment(self.reviews[24].pk, 'views_count')
+        with mock.patch.object(review_counters, 'attach_pending', side_effect=AssertionError("sync cache I/O")):
+            page = await acategory_feed(self.category, page_size=5)
+        self.assertEqual(page.items[0].current_views_count, 1)
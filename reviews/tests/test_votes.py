@@ -0,0 +1,86 @@
+from io import StringIO
+from unittest import skipIf, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from reviews.models import Review, ReviewVote
+from reviews.votes import cast_vote
+
+User = get_user_model()
+
+
+class CastVoteTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email='author@example.com', full_name='Author', password='password123',
+        )
+        self.voter = User.objects.create_user(
+            email='voter@example.com', full_name='Voter', password='password123',
+        )
+        self.review = Review.objects.create(
+            title='Ótima ração', content='Meu cão adorou', rating=5, author=self.author,
+        )
+
+    def counts(self):
+        self.review.refresh_from_db()
+        return self.review.help_count, self.review.not_help_count
+
+    def test_vote_is_idempotent(self):
+        self.assertTrue(cast_vote(self.review, self.voter, 'helpful'))
+        self.assertFalse(cast_vote(self.review, self.voter, 'helpful'))
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertEqual(ReviewVote.objects.count(), 1)
+
+    def test_changing_vote_moves_the_tally(self):
+        cast_vote(self.review, self.voter, 'helpful')
+        cast_vote(self.review, self.voter, 'not_helpful')
+        self.assertEqual(self.counts(), (0, 1))
+        self.assertEqual(ReviewVote.objects.get().vote_type, 'not_helpful')
+
+    def test_vote_on_missing_review_changes_nothing(self):
+        missing = self.review.pk
+        self.review.delete()
+        self.assertFalse(cast_vote(missing, self.voter, 'helpful'))
+        self.assertFalse(ReviewVote.objects.exists())
+
+    @skipIf(connection.vendor == 'postgresql', "no PostgreSQL o voto é uma única instrução")
+    def test_vote_locks_the_review_before_reading(self):
+        # savepoint, UPDATE que trava a review, voto anterior, upsert,
+        # contagens, release (no PostgreSQL é uma única instrução)
+        with self.assertNumQueries(6):
+            cast_vote(self.review.pk, self.voter, 'helpful')
+
+    @skipUnless(connection.vendor == 'postgresql', "upsert com CTE só no PostgreSQL")
+    def test_vote_is_a_single_statement_on_postgresql(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(cast_vote(self.review.pk, self.voter, 'helpful'))
+        with self.assertNumQueries(1):
+            self.assertFalse(cast_vote(self.review.pk, self.voter, 'helpful'))
+        with self.assertNumQueries(1):
+            self.assertTrue(cast_vote(self.review.pk, self.voter, 'not_helpful'))
+        self.assertEqual(self.counts(), (0, 1))
+
+    def test_increment_helpful_is_a_vote(self):
+        self.assertTrue(self.review.increment_helpful(self.voter))
+        self.assertFalse(self.review.increment_helpful(self.voter))
+        self.assertEqual(self.counts(), (1, 0))
+
+    def test_invalid_vote_type(self):
+        with self.assertRaises(ValueError):
+            cast_vote(self.review, self.voter, 'maybe')
+
+    def test_recount_repairs_drift(self):
+        cast_vote(self.review, self.voter, 'helpful')
+        untouched = Review.objects.create(title='Ok', content='Ok', rating=3, author=self.author)
+        Review.objects.filter(pk=self.review.pk).update(help_count=40, not_help_count=3)
+
+        out = StringIO()
+        call_command('recount_review_votes', '--batch-size', '1', stdout=out)
+
+        self.assertIn('1 review(s)', out.getvalue())
+        self.assertEqual(self.counts(), (1, 0))
+        untouched.refresh_from_db()
+        self.assertEqual((untouched.help_count, untouched.not_help_count), (0, 0))
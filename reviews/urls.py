@@ -0,0 +1,7 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('<slug:slug>/', views.category_reviews, name='category_reviews'),
+]
@@ -1,3 +1,30 @@
-from django.shortcuts import render
+from django.core.exceptions import BadRequest
+from django.shortcuts import aget_object_or_404
 
-# Create your views here.
+from petstore.routers import replica_reads
+from products import images
+from products.models import Category
+from products.pagination import InvalidCursor
+from products.views import arender
+
+from .feeds import acategory_feed
+
+
+@replica_reads
+async def category_reviews(request, slug):
+    """Approved reviews of a category, newest first, paginated by cursor"""
+    category = await aget_object_or_404(Category.objects.only('name', 'slug'), slug=slug)
+    try:
+        page = await acategory_feed(category, cursor=request.GET.get('cursor'))
+    except InvalidCursor:
+        raise BadRequest("Cursor de paginação inválido")
+    # Manifests of every image on the page in one lookup, not one per tag
+    manifests = await images.amanifests(
+        image.image.name for review in page.items for image in review.images.all()
+    )
+    return await arender(request, 'reviews/category_feed.html', {
+        'category': category,
+        'reviews': page.items,
+        'page': page,
+        'image_manifests': manifests,
+    })
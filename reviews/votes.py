@@ -0,0 +1,171 @@
+"""
+Votos de utilidade em reviews. cast_vote() é o único caminho que altera
+help_count/not_help_count.
+
+No PostgreSQL o voto é uma única instrução: um INSERT ... ON CONFLICT DO
+UPDATE dentro de uma CTE, cujo RETURNING diz se a linha foi criada ou
+trocada de tipo, alimenta o UPDATE das contagens (F() + CASE). O INSERT
+sai de um SELECT na review: se ela não existe, nada é gravado e o voto
+devolve False, como no caminho dos demais bancos. Dois
+primeiros votos simultâneos do mesmo usuário se serializam no índice
+único: o segundo vira UPDATE e, se o tipo for o mesmo, o WHERE do ON
+CONFLICT não devolve linha e as contagens não mudam. A review nunca é
+lida, então milhares de votos na mesma review são incrementos atômicos.
+
+Nos demais bancos (SQLite em desenvolvimento e testes) a review é travada
+com um UPDATE antes de ler o voto anterior, o que serializa os votos nela.
+
+recount() recalcula as contagens a partir da tabela de votos, para reparar
+divergências.
+"""
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from .models import Review, ReviewVote
+
+HELPFUL = 'helpful'
+NOT_HELPFUL = 'not_helpful'
+TALLY_FIELDS = {
+    HELPFUL: 'help_count',
+    NOT_HELPFUL: 'not_help_count',
+}
+RECOUNT_BATCH_SIZE = 500
+
+
+def _column(model, name):
+    return connection.ops.quote_name(model._meta.get_field(name).column)
+
+
+def _vote_sql():
+    vote_table = connection.ops.quote_name(ReviewVote._meta.db_table)
+    review_table = connection.ops.quote_name(Review._meta.db_table)
+    review, user = _column(ReviewVote, 'review'), _column(ReviewVote, 'user')
+    vote_type, created_at = _column(ReviewVote, 'vote_type'), _column(ReviewVote, 'created_at')
+    help_count, not_help_count = _column(Review, 'help_count'), _column(Review, 'not_help_count')
+    review_id = f"{review_table}.{_column(Review, 'id')}"
+    return f"""
+        WITH vote AS (
+            INSERT INTO {vote_table} ({review}, {user}, {vote_type}, {created_at})
+            SELECT {review_id}, %s, %s, %s FROM {review_table} WHERE {review_id} = %s
+            ON CONFLICT ({review}, {user}) DO UPDATE SET {vote_type} = EXCLUDED.{vote_type}
+            WHERE {vote_table}.{vote_type} <> EXCLUDED.{vote_type}
+            RETURNING (xmax = 0) AS inserted
+        )
+        UPDATE {review_table}
+           SET {help_count} = {help_count} + CASE WHEN vote.inserted THEN %s ELSE %s END,
+               {not_help_count} = {not_help_count} + CASE WHEN vote.inserted THEN %s ELSE %s END
+          FROM vote
+         WHERE {review_id} = %s
+    """
+
+
+def _deltas(vote_type, inserted):
+    """Variação de (help_count, not_help_count) para um voto novo ou trocado"""
+    gained = 1 if vote_type == HELPFUL else 0
+    if inserted:
+        return gained, 1 - gained
+    return 2 * gained - 1, 1 - 2 * gained
+
+
+def cast_vote(review, user, vote_type):
+    """
+    Registra ou troca o voto de `user` em `review`. Idempotente: repetir o
+    mesmo voto não altera nada. Retorna True se algo mudou.
+    """
+    if vote_type not in TALLY_FIELDS:
+        raise ValueError(f"Tipo de voto inválido: {vote_type}")
+    review_id = getattr(review, 'pk', review)
+    user_id = getattr(user, 'pk', user)
+    if connection.vendor == 'postgresql':
+        return _cast_vote_upsert(review_id, user_id, vote_type)
+    return _cast_vote_locked(review_id, user_id, vote_type)
+
+
+def _cast_vote_upsert(review_id, user_id, vote_type):
+    help_ins, not_help_ins = _deltas(vote_type, inserted=True)
+    help_upd, not_help_upd = _deltas(vote_type, inserted=False)
+    with connection.cursor() as cursor:
+        cursor.execute(_vote_sql(), [
+            user_id, vote_type, timezone.now(), review_id,
+            help_ins, help_upd, not_help_ins, not_help_upd,
+            review_id,
+        ])
+        return cursor.rowcount > 0
+
+
+def _cast_vote_locked(review_id, user_id, vote_type):
+    with transaction.atomic():
+        # Trava a review antes de ler o voto: votos concorrentes nela esperam
+        if not Review.objects.filter(pk=review_id).update(help_count=F('help_count')):
+            return False
+        previous = (
+            ReviewVote.objects.filter(review_id=review_id, user_id=user_id)
+            .values_list('vote_type', flat=True)
+            .first()
+        )
+        if previous == vote_type:
+            return False
+        ReviewVote.objects.bulk_create(
+            [ReviewVote(review_id=review_id, user_id=user_id, vote_type=vote_type)],
+            update_conflicts=True,
+            unique_fields=['review', 'user'],
+            update_fields=['vote_type'],
+        )
+        help_delta, not_help_delta = _deltas(vote_type, inserted=previous is None)
+        Review.objects.filter(pk=review_id).update(
+            help_count=F('help_count') + help_delta,
+            not_help_count=F('not_help_count') + not_help_delta,
+        )
+    return True
+
+
+def recount(batch_size=RECOUNT_BATCH_SIZE):
+    """
+    Recalcula help_count/not_help_count de todas as reviews a partir dos
+    votos, em lotes: lê as contagens atuais e as esperadas e grava, com um
+    UPDATE por lote, só as linhas divergentes. Retorna quantas corrigiu.
+    """
+    fixed = 0
+    batch = []
+    rows = Review.objects.order_by('pk').values_list('pk', 'help_count', 'not_help_count')
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            fixed += _recount_batch(batch)
+            batch = []
+    if batch:
+        fixed += _recount_batch(batch)
+    return fixed
+
+
+def _recount_batch(rows):
+    expected = {
+        review_id: (helpful, not_helpful)
+        for review_id, helpful, not_helpful in (
+            ReviewVote.objects.filter(review_id__in=[pk for pk, _, _ in rows])
+            .order_by()
+            .values('review_id')
+            .annotate(
+                helpful=Count('pk', filter=Q(vote_type=HELPFUL)),
+                not_helpful=Count('pk', filter=Q(vote_type=NOT_HELPFUL)),
+            )
+            .values_list('review_id', 'helpful', 'not_helpful')
+        )
+    }
+    drifted = {
+        pk: expected.get(pk, (0, 0))
+        for pk, helpful, not_helpful in rows
+        if (helpful, not_helpful) != expected.get(pk, (0, 0))
+    }
+    if not drifted:
+        return 0
+
+    def tally(index):
+        return Case(
+            *[When(pk=pk, then=Value(counts[index])) for pk, counts in drifted.items()],
+            output_field=IntegerField(),
+        )
+
+    Review.objects.filter(pk__in=list(drifted)).update(help_count=tally(0), not_help_count=tally(1))
+    return len(drifted)
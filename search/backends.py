@@ -0,0 +1,259 @@
+"""
+Backends de consulta do índice de busca.
+
+- PostgreSQL: coluna gerada `document` (tsvector, configuração
+  portuguese_unaccent) com índice GIN, ranqueada com ts_rank.
+- SQLite com FTS5: tabela virtual search_entry_fts mantida por triggers,
+  ranqueada com bm25.
+- Sem nenhum dos dois: índice invertido em memória, montado a partir de
+  SearchEntry no primeiro uso e atualizado pelos sinais deste processo.
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from .models import SearchEntry
+
+FTS_TABLE = 'search_entry_fts'
+TEXT_SEARCH_CONFIG = 'portuguese_unaccent'
+TITLE_WEIGHT = 3.0
+MAX_TERMS = 10
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    object_id: str
+    title: str
+    rank: float
+
+
+@dataclass
+class SearchResults:
+    hits: list = field(default_factory=list)
+    total: int = 0
+    page: int = 1
+    page_size: int = 20
+
+    @property
+    def num_pages(self):
+        return max(1, math.ceil(self.total / self.page_size))
+
+    @property
+    def has_next(self):
+        return self.page < self.num_pages
+
+    @property
+    def has_previous(self):
+        return self.page > 1
+
+
+def tokenize(text):
+    """Minúsculas, sem acentos, só letras e dígitos"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'\w+', text.lower())
+
+
+class PostgresBackend:
+    def query_expression(self, query):
+        terms = tokenize(query)[:MAX_TERMS]
+        if not terms:
+            return None
+        # Mesma regra do FTS5: termos sem acento e entre aspas (sem sintaxe
+        # do usuário), todos obrigatórios, o último como prefixo
+        quoted = [f"'{term}'" for term in terms]
+        quoted[-1] += ':*'
+        return ' & '.join(quoted)
+
+    def search(self, query, kinds=None, page=1, page_size=20):
+        query = self.query_expression(query)
+        if query is None:
+            return SearchResults(page=page, page_size=page_size)
+        tsquery = f"to_tsquery('{TEXT_SEARCH_CONFIG}', %s)"
+        queryset = SearchEntry.objects.alias(
+            matches=RawSQL(f"document @@ {tsquery}", [query], output_field=BooleanField()),
+        ).filter(matches=True)
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        total = queryset.count()
+        offset = (page - 1) * page_size
+        rows = (
+            queryset.annotate(rank=RawSQL(f"ts_rank(document, {tsquery})", [query], output_field=FloatField()))
+            .order_by('-rank', 'id')
+            .values_list('kind', 'object_id', 'title', 'rank')[offset:offset + page_size]
+        )
+        return SearchResults([SearchHit(*row) for row in rows], total, page, page_size)
+
+
+class SQLiteFTSBackend:
+    def match_expression(self, query):
+        terms = tokenize(query)[:MAX_TERMS]
+        if not terms:
+            return None
+        # Cada termo entre aspas (sem sintaxe FTS do usuário), o último como prefixo
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    def search(self, query, kinds=None, page=1, page_size=20):
+        match = self.match_expression(query)
+        if match is None:
+            return SearchResults(page=page, page_size=page_size)
+        where = f"{FTS_TABLE} MATCH %s"
+        params = [match]
+        if kinds:
+            where += f" AND e.kind IN ({', '.join(['%s'] * len(kinds))})"
+            params += list(kinds)
+        join = f"FROM {FTS_TABLE} JOIN search_entry e ON e.id = {FTS_TABLE}.rowid WHERE {where}"
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) {join}", params)
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT e.kind, e.object_id, e.title, -bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0) AS rank "
+                f"{join} ORDER BY rank DESC, e.id LIMIT %s OFFSET %s",
+                params + [page_size, (page - 1) * page_size],
+            )
+            hits = [SearchHit(*row) for row in cursor.fetchall()]
+        return SearchResults(hits, total, page, page_size)
+
+
+class InvertedIndexBackend:
+    """Índice invertido em memória (termo -> {entrada: peso}), com ranking TF-IDF"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._postings = defaultdict(dict)
+        self._documents = {}
+
+    def _add(self, entry):
+        weights = Counter()
+        for term in tokenize(entry.title):
+            weights[term] += TITLE_WEIGHT
+        for term in tokenize(entry.body):
+            weights[term] += 1.0
+        length = sum(weights.values()) or 1.0
+        key = (entry.kind, entry.object_id)
+        self._remove(key)
+        self._documents[key] = (entry.title, list(weights))
+        for term, weight in weights.items():
+            self._postings[term][key] = weight / length
+
+    def _remove(self, key):
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for term in document[1]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            for entry in SearchEntry.objects.iterator(chunk_size=2000):
+                self._add(entry)
+            self._built = True
+
+    def search(self, query, kinds=None, page=1, page_size=20):
+        self._ensure_built()
+        terms = tokenize(query)[:MAX_TERMS]
+        if not terms:
+            return SearchResults(page=page, page_size=page_size)
+        total_documents = len(self._documents) or 1
+        scores = None
+        for index, term in enumerate(terms):
+            if index == len(terms) - 1:
+                # Último termo como prefixo, como no FTS
+                postings = {}
+                for candidate, entries in self._postings.items():
+                    if candidate.startswith(term):
+                        for key, weight in entries.items():
+                            postings[key] = max(postings.get(key, 0), weight)
+            else:
+                postings = self._postings.get(term, {})
+            idf = math.log(1 + total_documents / (1 + len(postings)))
+            term_scores = {key: weight * idf for key, weight in postings.items()}
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: scores[key] + term_scores[key] for key in scores.keys() & term_scores.keys()}
+        if kinds:
+            scores = {key: score for key, score in scores.items() if key[0] in kinds}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        offset = (page - 1) * page_size
+        hits = [
+            SearchHit(kind, object_id, self._documents[(kind, object_id)][0], score)
+            for (kind, object_id), score in ranked[offset:offset + page_size]
+        ]
+        return SearchResults(hits, len(ranked), page, page_size)
+
+    def entries_changed(self, changed, removed):
+        if not self._built:
+            return
+        with self._lock:
+            for key in removed:
+                self._remove(key)
+            if changed:
+                keys = set(changed)
+                kinds = {kind for kind, _ in keys}
+                object_ids = {object_id for _, object_id in keys}
+                for entry in SearchEntry.objects.filter(kind__in=kinds, object_id__in=object_ids):
+                    if (entry.kind, entry.object_id) in keys:
+                        self._add(entry)
+
+    def rebuilt(self):
+        with self._lock:
+            self._built = False
+            self._postings.clear()
+            self._documents.clear()
+
+
+_memory_backend = InvertedIndexBackend()
+_fts_available = {}
+
+
+def sqlite_fts_available():
+    name = str(connection.settings_dict['NAME'])
+    if name not in _fts_available:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+            )
+            _fts_available[name] = cursor.fetchone() is not None
+    return _fts_available[name]
+
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresBackend()
+    if connection.vendor == 'sqlite' and sqlite_fts_available():
+        return SQLiteFTSBackend()
+    return _memory_backend
+
+
+def entries_changed(changed, removed):
+    """Os backends de banco se atualizam sozinhos; só o índice em memória precisa"""
+    _memory_backend.entries_changed(changed, removed)
+
+
+def rebuilt():
+    _memory_backend.rebuilt()
+
+
+def search(query, kinds=None, page=1, page_size=20):
+    page = max(1, int(page))
+    return get_backend().search(query, kinds=kinds, page=page, page_size=page_size)
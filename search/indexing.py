@@ -0,0 +1,117 @@
+"""
+Montagem e gravação dos documentos do índice de busca.
+"""
+from django.db import transaction
+
+from products.models import Product
+from reviews.models import Review
+
+from . import backends
+from .models import SearchEntry
+
+REINDEX_CHUNK_SIZE = 1000
+
+
+def product_entry(product):
+    return SearchEntry(
+        kind=SearchEntry.KIND_PRODUCT,
+        object_id=str(product.pk),
+        title=product.name,
+        body=f"{product.category.name}\n{product.description}",
+    )
+
+
+def review_entry(review):
+    parts = [review.content, review.pros, review.cons, review.product_name]
+    if review.category_id:
+        parts.append(review.category.name)
+    return SearchEntry(
+        kind=SearchEntry.KIND_REVIEW,
+        object_id=str(review.pk),
+        title=review.title,
+        body='\n'.join(part for part in parts if part),
+    )
+
+
+def is_indexable(obj):
+    if isinstance(obj, Product):
+        return obj.is_active
+    if isinstance(obj, Review):
+        return obj.status == 'approved'
+    return False
+
+
+def entry_for(obj):
+    if isinstance(obj, Product):
+        return product_entry(obj)
+    return review_entry(obj)
+
+
+def kind_for(obj):
+    return SearchEntry.KIND_PRODUCT if isinstance(obj, Product) else SearchEntry.KIND_REVIEW
+
+
+def index_objects(objects):
+    """Grava (upsert) os documentos dos objetos indexáveis e remove os demais"""
+    entries, removed = [], []
+    for obj in objects:
+        if is_indexable(obj):
+            entries.append(entry_for(obj))
+        else:
+            removed.append((kind_for(obj), str(obj.pk)))
+    with transaction.atomic():
+        if entries:
+            SearchEntry.objects.bulk_create(
+                entries,
+                update_conflicts=True,
+                unique_fields=['kind', 'object_id'],
+                update_fields=['title', 'body', 'updated_at'],
+            )
+        for kind in {kind for kind, _ in removed}:
+            SearchEntry.objects.filter(
+                kind=kind,
+                object_id__in=[object_id for removed_kind, object_id in removed if removed_kind == kind],
+            ).delete()
+    backends.entries_changed([(entry.kind, entry.object_id) for entry in entries], removed)
+    return len(entries)
+
+
+def index_queryset(queryset, chunk_size=REINDEX_CHUNK_SIZE):
+    """index_objects() em blocos, sem carregar o queryset inteiro"""
+    total = 0
+    batch = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            total += index_objects(batch)
+            batch = []
+    if batch:
+        total += index_objects(batch)
+    return total
+
+
+def remove_object(kind, object_id):
+    SearchEntry.objects.filter(kind=kind, object_id=str(object_id)).delete()
+    backends.entries_changed([], [(kind, str(object_id))])
+
+
+def reindex(chunk_size=REINDEX_CHUNK_SIZE):
+    """Reconstrói o índice inteiro em blocos"""
+    total = 0
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        querysets = [
+            Product.objects.filter(is_active=True).select_related('category'),
+            Review.objects.filter(status='approved').select_related('category'),
+        ]
+        for queryset in querysets:
+            batch = []
+            for obj in queryset.iterator(chunk_size=chunk_size):
+                batch.append(entry_for(obj))
+                if len(batch) >= chunk_size:
+                    total += len(SearchEntry.objects.bulk_create(batch))
+                    batch = []
+            if batch:
+                total += len(SearchEntry.objects.bulk_create(batch))
+    backends.rebuilt()
+    return total
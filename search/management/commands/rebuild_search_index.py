@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from search import indexing
+
+
+class Command(BaseCommand):
+    """
+    Reconstrói o índice de busca a partir de produtos ativos e reviews
+    aprovadas. Necessário depois de importações em lote (bulk_create e
+    update() não disparam os sinais que mantêm o índice).
+    """
+
+    help = "Reindexa produtos e reviews para a busca"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=indexing.REINDEX_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        total = indexing.reindex(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"{total} documento(s) indexado(s)"))
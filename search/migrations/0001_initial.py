@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('product', 'Produto'), ('review', 'Review')], max_length=10, verbose_name='Tipo')),
+                ('object_id', models.CharField(max_length=64, verbose_name='Objeto')),
+                ('title', models.CharField(max_length=255, verbose_name='Título')),
+                ('body', models.TextField(blank=True, verbose_name='Conteúdo')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Entrada de busca',
+                'verbose_name_plural': 'Entradas de busca',
+                'db_table': 'search_entry',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_entry_unique_kind_object')],
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE search_entry ADD COLUMN document tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_entry_document_gin ON search_entry USING GIN (document)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS search_entry_document_gin",
+    "ALTER TABLE search_entry DROP COLUMN IF EXISTS document",
+]
+
+# Tabela FTS5 de conteúdo externo: guarda só o índice, o texto continua em
+# search_entry. Os triggers mantêm os dois em sincronia.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE search_entry_fts USING fts5(
+        title, body,
+        content='search_entry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER search_entry_ai AFTER INSERT ON search_entry BEGIN
+        INSERT INTO search_entry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_entry_ad AFTER DELETE ON search_entry BEGIN
+        INSERT INTO search_entry_fts(search_entry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_entry_au AFTER UPDATE ON search_entry BEGIN
+        INSERT INTO search_entry_fts(search_entry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_entry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS search_entry_au",
+    "DROP TRIGGER IF EXISTS search_entry_ad",
+    "DROP TRIGGER IF EXISTS search_entry_ai",
+    "DROP TABLE IF EXISTS search_entry_fts",
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        options = {row[0] for row in cursor.fetchall()}
+    return 'ENABLE_FTS5' in options
+
+
+def forward(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        statements = POSTGRES_FORWARD
+    elif connection.vendor == 'sqlite' and sqlite_has_fts5(connection):
+        statements = SQLITE_FORWARD
+    else:
+        # search.backends usa o índice invertido em memória
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def backward(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        statements = POSTGRES_BACKWARD
+    elif connection.vendor == 'sqlite':
+        statements = SQLITE_BACKWARD
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(forward, backward),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# Configuração portuguese_unaccent: a portuguese com unaccent antes do
+# stemmer, para que "racao" e "ração" virem o mesmo lexema (como no FTS5
+# com remove_diacritics e no índice em memória). A coluna gerada é
+# recriada com ela; to_tsvector(regconfig, text) continua imutável.
+# Só no PostgreSQL; o SQLite já remove acentos no tokenizador.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese)",
+    """
+    ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem
+    """,
+    "DROP INDEX IF EXISTS search_entry_document_gin",
+    "ALTER TABLE search_entry DROP COLUMN IF EXISTS document",
+    """
+    ALTER TABLE search_entry ADD COLUMN document tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese_unaccent', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('portuguese_unaccent', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_entry_document_gin ON search_entry USING GIN (document)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS search_entry_document_gin",
+    "ALTER TABLE search_entry DROP COLUMN IF EXISTS document",
+    """
+    ALTER TABLE search_entry ADD COLUMN document tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_entry_document_gin ON search_entry USING GIN (document)",
+    "DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent",
+]
+
+
+def forward(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in POSTGRES_FORWARD:
+            schema_editor.execute(statement)
+
+
+def backward(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in POSTGRES_BACKWARD:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_search_structures'),
+    ]
+
+    operations = [
+        migrations.RunPython(forward, backward),
+    ]
@@ -0,0 +1,37 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    Documento do índice de busca: um por produto ou review aprovada.
+
+    O texto fica em title/body; a estrutura de busca depende do banco
+    (coluna tsvector + GIN no PostgreSQL, tabela FTS5 no SQLite), criada
+    pela migração 0002 e consultada por search.backends.
+    """
+    KIND_PRODUCT = 'product'
+    KIND_REVIEW = 'review'
+    KIND_CHOICES = [
+        (KIND_PRODUCT, 'Produto'),
+        (KIND_REVIEW, 'Review'),
+    ]
+
+    kind = models.CharField("Tipo", max_length=10, choices=KIND_CHOICES)
+    object_id = models.CharField("Objeto", max_length=64)
+    title = models.CharField("Título", max_length=255)
+    body = models.TextField("Conteúdo", blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_entry'
+        verbose_name = "Entrada de busca"
+        verbose_name_plural = "Entradas de busca"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                name='search_entry_unique_kind_object',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title}"
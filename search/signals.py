@@ -0,0 +1,48 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from products.models import Category, Product, products_changed
+from reviews.models import Review
+
+from . import indexing
+from .models import SearchEntry
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Review)
+def index_on_save(sender, instance, **kwargs):
+    indexing.index_objects([instance])
+
+
+@receiver(products_changed)
+def index_bulk_changes(sender, product_ids, **kwargs):
+    # Importação e ações do admin gravam com bulk_create/update(), sem post_save
+    products = Product.objects.filter(pk__in=product_ids).select_related('category').order_by('pk')
+    indexing.index_queryset(products)
+
+
+@receiver(post_delete, sender=Product)
+def remove_product(sender, instance, **kwargs):
+    indexing.remove_object(SearchEntry.KIND_PRODUCT, instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review(sender, instance, **kwargs):
+    indexing.remove_object(SearchEntry.KIND_REVIEW, instance.pk)
+
+
+@receiver(post_init, sender=Category)
+def remember_category_name(sender, instance, **kwargs):
+    instance._indexed_name = instance.__dict__.get('name')
+
+
+@receiver(post_save, sender=Category)
+def reindex_category(sender, instance, created, **kwargs):
+    # O nome da categoria faz parte do texto dos produtos e reviews dela;
+    # o slug não entra no índice, então só uma troca de nome reindexa
+    previous = getattr(instance, '_indexed_name', None)
+    instance._indexed_name = instance.name
+    if created or previous == instance.name:
+        return
+    indexing.index_queryset(Product.objects.filter(category=instance).select_related('category').order_by('pk'))
+    indexing.index_queryset(Review.objects.filter(category=instance).select_related('category').order_by('pk'))
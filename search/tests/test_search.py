@@ -0,0 +1,176 @@
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from products.admin import ProductAdmin
+from products.importing import ProductImporter, read_records
+from products.models import Category, Product
+from reviews.models import Review
+from search import backends, indexing
+from search.models import SearchEntry
+
+User = get_user_model()
+
+
+class SearchTestMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='busca@example.com',
+            full_name='Busca',
+            password='password123',
+        )
+        self.food = Category.objects.create(name='Rações')
+        self.toys = Category.objects.create(name='Brinquedos')
+        self.kibble = Product.objects.create(
+            name='Ração Premium para Cães',
+            description='Sabor frango, grãos integrais',
+            price=Decimal('90.00'), stock=5, category=self.food,
+        )
+        self.ball = Product.objects.create(
+            name='Bola de borracha',
+            description='Resistente, ideal para cães grandes',
+            price=Decimal('15.00'), stock=5, category=self.toys,
+        )
+        self.review = Review.objects.create(
+            title='Meu cachorro adorou',
+            content='A ração chegou rápido',
+            pros='Sabor',
+            rating=5,
+            author=self.user,
+            category=self.food,
+            status='approved',
+        )
+
+    def search(self, query, **kwargs):
+        return backends.search(query, **kwargs)
+
+    def test_ranks_title_matches_first(self):
+        results = self.search('cães')
+        self.assertEqual(results.total, 2)
+        self.assertEqual(results.hits[0].object_id, str(self.kibble.pk))
+
+    def test_accents_and_prefix(self):
+        results = self.search('racao prem')
+        self.assertEqual([hit.object_id for hit in results.hits], [str(self.kibble.pk)])
+
+    def test_category_name_is_searchable(self):
+        results = self.search('brinquedos', kinds=['product'])
+        self.assertEqual([hit.title for hit in results.hits], ['Bola de borracha'])
+
+    def test_reviews_are_indexed_when_approved(self):
+        self.assertEqual(self.search('adorou').total, 1)
+        self.review.status = 'rejected'
+        self.review.save()
+        self.assertEqual(self.search('adorou').total, 0)
+
+    def test_updates_and_deletes_are_incremental(self):
+        self.ball.name = 'Corda de algodão'
+        self.ball.save()
+        self.assertEqual(self.search('borracha').total, 0)
+        self.assertEqual(self.search('algodao').total, 1)
+
+        self.ball.delete()
+        self.assertEqual(self.search('algodao').total, 0)
+
+    def test_category_rename_reindexes_products(self):
+        self.toys.name = 'Diversão'
+        self.toys.save()
+        self.assertEqual(self.search('diversao').total, 1)
+
+    def test_noop_category_save_does_not_reindex(self):
+        toys = Category.objects.get(pk=self.toys.pk)
+        with mock.patch.object(indexing, 'index_queryset') as index_queryset:
+            toys.save()
+        index_queryset.assert_not_called()
+
+    def test_imported_products_are_indexed(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'catalogo.csv')
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write("name,description,price,stock,category\nArranhador de sisal,,50.00,3,Gatos\n")
+        ProductImporter().run(read_records(path))
+        self.assertEqual(self.search('sisal').total, 1)
+
+    def test_admin_actions_update_the_index(self):
+        admin = ProductAdmin(Product, AdminSite())
+        admin.message_user = mock.Mock()
+        request = RequestFactory().post('/')
+        queryset = Product.objects.filter(pk=self.ball.pk)
+
+        admin.desativar_produtos(request, queryset)
+        self.assertEqual(self.search('borracha').total, 0)
+        admin.ativar_produtos(request, queryset)
+        self.assertEqual(self.search('borracha').total, 1)
+
+    def test_pagination(self):
+        for i in range(5):
+            Product.objects.create(
+                name=f'Petisco {i}', description='', price=Decimal('1.00'), stock=1, category=self.food,
+            )
+        first = self.search('petisco', page_size=2)
+        last = self.search('petisco', page=3, page_size=2)
+        self.assertEqual(first.total, 5)
+        self.assertEqual(first.num_pages, 3)
+        self.assertTrue(first.has_next)
+        self.assertEqual(len(last.hits), 1)
+        self.assertFalse(last.has_next)
+
+    def test_reindex_command(self):
+        SearchEntry.objects.all().delete()
+        backends.rebuilt()
+        self.assertEqual(self.search('borracha').total, 0)
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('borracha').total, 1)
+
+
+class DatabaseSearchTest(SearchTestMixin, TestCase):
+    """FTS5 no SQLite (ou tsvector/GIN no PostgreSQL)"""
+
+    def test_search_view(self):
+        response = self.client.get(reverse('search'), {'q': 'borracha'})
+        self.assertContains(response, 'Bola de borracha')
+
+
+@skipUnless(connection.vendor == 'postgresql', "tsvector/unaccent só existem no PostgreSQL")
+class PostgresSearchTest(SearchTestMixin, TestCase):
+    """Chama o backend do PostgreSQL diretamente: sem acento e prefixo como no FTS5"""
+
+    def search(self, query, **kwargs):
+        return backends.PostgresBackend().search(query, **kwargs)
+
+    def test_accents_and_prefix(self):
+        super().test_accents_and_prefix()
+        results = self.search('RAÇÃO premi')
+        self.assertEqual([hit.object_id for hit in results.hits], [str(self.kibble.pk)])
+
+
+class PostgresQueryExpressionTest(SimpleTestCase):
+    def test_terms_are_unaccented_quoted_and_last_is_prefix(self):
+        backend = backends.PostgresBackend()
+        self.assertEqual(backend.query_expression("Ração  prem"), "'racao' & 'prem':*")
+        self.assertEqual(backend.query_expression("cães' | !"), "'caes':*")
+        self.assertIsNone(backend.query_expression("!?"))
+
+
+class InvertedIndexSearchTest(SearchTestMixin, TestCase):
+    """Fallback em memória, usado quando o banco não tem FTS"""
+
+    def setUp(self):
+        backends.rebuilt()
+        super().setUp()
+
+    def search(self, query, **kwargs):
+        return backends._memory_backend.search(query, **kwargs)
+
+    def tearDown(self):
+        backends.rebuilt()
@@ -0,0 +1,19 @@
+from django.shortcuts import render
+
+from . import backends
+from .models import SearchEntry
+
+RESULTS_PER_PAGE = 20
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    kinds = [kind for kind in request.GET.getlist('kind') if kind in dict(SearchEntry.KIND_CHOICES)]
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+    results = None
+    if query:
+        results = backends.search(query, kinds=kinds, page=page, page_size=RESULTS_PER_PAGE)
+    return render(request, 'search/results.html', {'query': query, 'results': results})